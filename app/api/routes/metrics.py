@@ -0,0 +1,29 @@
+"""
+운영 지표 API 라우터
+"""
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from app.services.live_sessions import live_sessions
+from app.services.llm_scheduler import llm_scheduler
+from app.services.notion_outbox import notion_outbox
+from app.services.progress_bus import progress_bus
+from app.services.result_cache import result_cache
+from app.services.transcript_compactor import transcript_compactor
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics() -> dict[str, Any]:
+    """프로세스 내부 지표 조회 (캐시 적중률 등)"""
+    return {
+        "result_cache": result_cache.stats(),
+        "progress_subscribers": progress_bus.subscriber_count(),
+        "live_sessions": live_sessions.snapshot(),
+        "llm": llm_scheduler.stats(),
+        "transcript_compaction": transcript_compactor.stats(),
+        "notion_outbox": notion_outbox.stats(),
+    }
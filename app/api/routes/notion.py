@@ -2,17 +2,23 @@
 Notion API 라우터
 """
 
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.database import get_db
 from app.core.security import session_manager
+from app.models.notion_write import NotionWrite
 from app.schemas.notion import (
     NotionConfigRequest,
     NotionConfigResponse,
     NotionSaveRequest,
     NotionSaveResponse,
     NotionStatusResponse,
+    NotionWriteResponse,
 )
-from app.services.notion_client import NotionService
+from app.services.notion_client import notion_clients
+from app.services.notion_outbox import enqueue_notion_write, notion_outbox, notion_token_hash
 
 router = APIRouter()
 
@@ -31,9 +37,10 @@ async def save_notion_config(
     """Notion 설정을 세션에 저장 (httpOnly 쿠키)"""
     try:
         # 토큰 유효성 검증: Notion API 호출 테스트
-        service = NotionService(token=body.token)
-        service.client.users.me()
+        service = notion_clients.get(body.token)
+        await service.verify_token()
     except Exception:
+        notion_clients.discard(body.token)
         raise HTTPException(status_code=400, detail="유효하지 않은 Notion 토큰입니다")
 
     # URL에서 page_id 추출
@@ -58,23 +65,65 @@ async def disconnect_notion(request: Request) -> NotionConfigResponse:
 
 @router.post("/save", response_model=NotionSaveResponse)
 async def save_to_notion(
-    request: Request, body: NotionSaveRequest
+    request: Request,
+    body: NotionSaveRequest,
+    db: AsyncSession = Depends(get_db),
 ) -> NotionSaveResponse:
-    """요약 내용을 Notion 페이지로 저장"""
+    """
+    요약 내용을 Notion 페이지로 저장
+
+    쓰기는 대기열에 기록되고 워커가 한도에 맞춰 처리한다. 기본적으로 바로 pending과
+    쓰기 ID를 응답하며, 클라이언트는 GET /writes/{id}로 완료를 확인한다 (완료되면 녹음의
+    notion_url도 채워짐). notion_save_wait_seconds를 설정하면 그 시간 안에 끝난 쓰기는
+    URL과 함께 done으로 응답한다.
+    """
     token = session_manager.get_notion_token(request)
     page_id = session_manager.get_notion_page_id(request)
 
     if not token or not page_id:
         raise HTTPException(status_code=401, detail="Notion이 연결되지 않았습니다")
 
-    try:
-        service = NotionService(token=token)
-        result = service.create_lecture_page(
-            title=body.title,
-            summary=body.summary,
-            parent_page_id=page_id,
-        )
-        page_url = result.get("url", "")
-        return NotionSaveResponse(url=page_url)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Notion 저장 실패: {e}")
+    write = await enqueue_notion_write(
+        db,
+        token=token,
+        parent_page_id=page_id,
+        title=body.title,
+        summary=body.summary,
+        recording_id=body.recording_id,
+    )
+    await db.commit()
+    notion_outbox.notify()
+
+    await notion_outbox.wait(write.id, settings.notion_save_wait_seconds)
+    await db.refresh(write)
+    if write.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Notion 저장 실패: {write.last_error}")
+    return NotionSaveResponse(
+        url=(write.page_url or "") if write.status == "done" else "",
+        status="done" if write.status == "done" else "pending",
+        id=write.id,
+    )
+
+
+@router.get("/writes/{write_id}", response_model=NotionWriteResponse)
+async def get_notion_write(
+    request: Request,
+    write_id: str,
+    db: AsyncSession = Depends(get_db),
+) -> NotionWriteResponse:
+    """Notion 쓰기 진행 상황 조회 (같은 Notion 토큰으로 연결된 세션만)"""
+    token = session_manager.get_notion_token(request)
+    if not token:
+        raise HTTPException(status_code=401, detail="Notion이 연결되지 않았습니다")
+
+    write = await db.get(NotionWrite, write_id)
+    if not write or write.token_hash != notion_token_hash(token):
+        raise HTTPException(status_code=404, detail="Notion 쓰기를 찾을 수 없습니다")
+
+    return NotionWriteResponse(
+        id=write.id,
+        status=write.status,
+        url=(write.page_url or "") if write.status == "done" else "",
+        attempts=write.attempts,
+        error=write.last_error,
+    )
@@ -2,135 +2,76 @@
 Recordings API 라우터
 """
 
+import asyncio
+import base64
+import binascii
+import json
 import uuid
-import subprocess
+from collections.abc import AsyncGenerator
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.models.job import ProcessingJob
 from app.models.recording import Recording
 from app.schemas.recording import (
     RecordingCreateResponse,
+    RecordingListItem,
     RecordingResponse,
     RecordingStatusResponse,
+    TranscriptUpdateRequest,
 )
-from app.services.llm_summarizer import LectureSummarizer
-from app.services.rtzr_client import RTZRClient
+from app.services.job_worker import enqueue_recording_job, job_worker
+from app.services.progress_bus import is_terminal, progress_bus
+from app.services.upload_storage import UploadTooLargeError, save_upload_file
 
 router = APIRouter()
 
+# SSE keep-alive 주기 (초) - 프록시가 유휴 연결을 끊지 않도록
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# 목록 페이지 크기
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 200
+# 목록에 싣는 요약 앞부분 길이 (글자)
+SUMMARY_PREVIEW_LENGTH = 300
+
+
+def _sse(event: dict[str, Any]) -> str:
+    """이벤트를 SSE 메시지 형식으로 변환"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def _encode_cursor(created_at: datetime, recording_id: str) -> str:
+    """목록 커서 생성 (마지막 항목의 created_at, id)"""
+    raw = f"{created_at.isoformat()}|{recording_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-async def process_recording(recording_id: str, audio_path: str) -> None:
-    """
-    백그라운드에서 녹음 파일 처리 (STT → AI 요약)
 
-    Args:
-        recording_id: 녹음 ID
-        audio_path: 오디오 파일 경로
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
     """
-    from app.core.database import AsyncSessionLocal
+    목록 커서 해석
 
-    async with AsyncSessionLocal() as db:
-        try:
-            recording = await db.get(Recording, recording_id)
-            if not recording:
-                return
-
-            # 1단계: 오디오 파일 형식 확인 및 변환
-            recording.status = "stt"
-            recording.progress = 10
-            await db.commit()
-
-            audio_path_obj = Path(audio_path)
-            
-            # 파일 확장자 확인
-            file_ext = audio_path_obj.suffix.lower()
-            
-            # 이미 Ogg 형식이면 변환 스킵
-            if file_ext in ['.ogg', '.opus']:
-                opus_path = audio_path_obj
-                print(f"✅ Ogg 파일 감지, 변환 스킵: {opus_path}")
-            else:
-                # WebM → Ogg Opus 변환 (코덱 복사)
-                opus_path = audio_path_obj.with_suffix(".opus.ogg")
-                
-                try:
-                    subprocess.run(
-                        [
-                            "ffmpeg",
-                            "-i", str(audio_path),  # 입력 (WebM/Opus)
-                            "-c:a", "copy",  # 오디오 코덱 복사 (재인코딩 안 함)
-                            "-y",  # 덮어쓰기
-                            str(opus_path),  # 출력 (Ogg/Opus)
-                        ],
-                        check=True,
-                        capture_output=True,
-                        stderr=subprocess.DEVNULL,  # ffmpeg 로그 숨김
-                    )
-                    print(f"✅ WebM → Ogg 변환 완료: {opus_path}")
-                except subprocess.CalledProcessError as e:
-                    print(f"❌ ffmpeg 변환 실패: {e.stderr.decode()}")
-                    raise e
-
-            # 2단계: STT
-            recording.progress = 20
-            await db.commit()
-
-            stt_client = RTZRClient(
-                client_id=settings.return_zero_client_id,
-                client_secret=settings.return_zero_client_secret,
-            )
-            results = await stt_client.transcribe_file(
-                audio_file_path=str(opus_path),  # 변환된 Opus 파일 사용
-                chunk_size=8192,
-                sample_rate=48000,  # Opus는 보통 48kHz
-                encoding="OGG_OPUS",
-            )
-
-            # STT 결과 텍스트 추출
-            stt_text = " ".join(
-                r.get("alternatives", [{}])[0].get("text", "")
-                for r in results
-                if r.get("final")
-            )
-            recording.stt_text = stt_text
-            recording.progress = 50
-            await db.commit()
-
-            # 변환된 파일 정리 (원본 파일과 다른 경우만)
-            if opus_path != audio_path_obj and opus_path.exists():
-                opus_path.unlink()
-                print(f"🗑️ 변환 파일 삭제: {opus_path}")
-
-            # 3단계: AI 요약
-            recording.status = "ai"
-            recording.progress = 60
-            await db.commit()
-
-            summarizer = LectureSummarizer()
-            summary = await summarizer.summarize_async(stt_text)
-
-            recording.summary = summary
-            recording.status = "complete"
-            recording.progress = 100
-            await db.commit()
-
-        except Exception as e:
-            recording = await db.get(Recording, recording_id)
-            if recording:
-                recording.status = "idle"
-                recording.progress = 0
-                await db.commit()
-            raise e
+    Raises:
+        HTTPException: 잘못된 커서 (400)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, recording_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), recording_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다")
 
 
 @router.post("", response_model=RecordingCreateResponse)
 async def create_recording(
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     audio: UploadFile = File(...),
     title: str = Form(default=""),
@@ -155,8 +96,18 @@ async def create_recording(
     audio_path = audio_dir / f"{recording_id}{file_ext}"
     print(f"📥 파일 업로드: {audio.content_type} → {file_ext}")
 
-    content = await audio.read()
-    audio_path.write_bytes(content)
+    # 청크 단위 스트리밍 저장 (파일 전체를 메모리에 올리지 않음)
+    try:
+        stored = await save_upload_file(
+            audio,
+            audio_path,
+            chunk_size=settings.upload_chunk_size,
+            max_size=settings.max_upload_size,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        await audio.close()
 
     # DB 레코드 생성
     recording_title = title or audio.filename or "녹음"
@@ -164,14 +115,17 @@ async def create_recording(
         id=recording_id,
         title=recording_title,
         audio_file_path=str(audio_path),
-        status="idle",
+        audio_sha256=stored.sha256,
+        audio_size=stored.size,
+        status="stt",  # 대기열 등록 = 처리 시작 (idle은 실패를 의미)
         progress=0,
     )
     db.add(recording)
-    await db.commit()
 
-    # 백그라운드 처리 시작
-    background_tasks.add_task(process_recording, recording_id, str(audio_path))
+    # 처리 작업 큐 등록 (녹음과 같은 트랜잭션)
+    await enqueue_recording_job(db, recording)
+    await db.commit()
+    job_worker.notify()
 
     return RecordingCreateResponse(
         id=recording_id,
@@ -180,16 +134,45 @@ async def create_recording(
     )
 
 
-@router.get("", response_model=list[RecordingResponse])
+@router.get("", response_model=list[RecordingListItem])
 async def list_recordings(
+    response: Response,
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    limit: int = Query(LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    status: Optional[str] = Query(None, description="처리 상태 필터 (idle, stt, ai, complete 등)"),
     db: AsyncSession = Depends(get_db),
-) -> list[RecordingResponse]:
-    """녹음 목록 조회"""
-    result = await db.execute(
-        select(Recording).order_by(Recording.created_at.desc())
+) -> list[RecordingListItem]:
+    """
+    녹음 목록 조회 (최신순, 키셋 페이지네이션)
+
+    목록에 필요한 컬럼만 읽고 요약은 앞부분만 싣는다 (전사 본문은 상세 조회에서).
+    다음 페이지가 있으면 X-Next-Cursor 헤더로 커서를 돌려준다.
+    """
+    query = select(
+        Recording.id,
+        Recording.title,
+        Recording.duration,
+        func.substr(Recording.summary, 1, SUMMARY_PREVIEW_LENGTH).label("summary"),
+        Recording.notion_url,
+        Recording.status,
+        Recording.progress,
+        Recording.created_at,
+        Recording.updated_at,
     )
-    recordings = result.scalars().all()
-    return [RecordingResponse.model_validate(r) for r in recordings]
+    if status:
+        query = query.where(Recording.status == status)
+    if cursor:
+        created_at, recording_id = _decode_cursor(cursor)
+        query = query.where(
+            tuple_(Recording.created_at, Recording.id) < (created_at, recording_id)
+        )
+    query = query.order_by(Recording.created_at.desc(), Recording.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [RecordingListItem.model_validate(row) for row in rows]
 
 
 @router.get("/{recording_id}", response_model=RecordingResponse)
@@ -216,6 +199,80 @@ async def get_recording_status(
     return RecordingStatusResponse(status=recording.status, progress=recording.progress)
 
 
+@router.put("/{recording_id}/transcript", response_model=RecordingStatusResponse)
+async def update_transcript(
+    recording_id: str,
+    request: TranscriptUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+) -> RecordingStatusResponse:
+    """
+    전사 텍스트 수정 후 요약 다시 만들기
+
+    STT는 건너뛰고 AI 단계만 다시 실행한다. 긴 강의는 바뀐 청크만 다시 요약한다.
+    """
+    recording = await db.get(Recording, recording_id)
+    if not recording:
+        raise HTTPException(status_code=404, detail="녹음을 찾을 수 없습니다")
+
+    active = await db.scalar(
+        select(ProcessingJob.id).where(
+            ProcessingJob.recording_id == recording_id,
+            ProcessingJob.status.in_(("pending", "running")),
+        )
+    )
+    if active:
+        raise HTTPException(status_code=409, detail="처리 중인 녹음은 수정할 수 없습니다")
+
+    recording.stt_text = request.stt_text
+    recording.status = "ai"
+    recording.progress = 50
+    await enqueue_recording_job(db, recording, stage="stt")
+    await db.commit()
+    progress_bus.publish(recording_id, {"type": "status", "status": "ai", "progress": 50})
+    job_worker.notify()
+
+    return RecordingStatusResponse(status=recording.status, progress=recording.progress)
+
+
+@router.get("/{recording_id}/events")
+async def stream_recording_events(recording_id: str) -> StreamingResponse:
+    """
+    녹음 처리 상태 스트림 (Server-Sent Events, 폴링 대체)
+
+    처리 워커가 발행하는 상태/진행률 변화를 즉시 전달한다.
+    AI 단계에서는 생성 중인 요약이 summary_delta 이벤트({"offset", "text"})로 이어서 전달되고,
+    완료되면 전체 요약이 Recording.summary에 저장된다.
+    마지막 상태를 이벤트 버스가 기억하고 있으면 DB를 전혀 읽지 않는다.
+    """
+    initial = progress_bus.last_status(recording_id)
+    if initial is None:
+        async with AsyncSessionLocal() as db:
+            recording = await db.get(Recording, recording_id)
+        if not recording:
+            raise HTTPException(status_code=404, detail="녹음을 찾을 수 없습니다")
+        initial = {"type": "status", "status": recording.status, "progress": recording.progress}
+
+    async def event_stream() -> AsyncGenerator[str, None]:
+        async with progress_bus.subscribe(recording_id) as queue:
+            # 구독 전에 발행된 이벤트가 있으면 그게 최신 상태
+            event = progress_bus.last_status(recording_id) or initial
+            yield _sse(event)
+
+            while not is_terminal(event):
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/{recording_id}")
 async def delete_recording(
     recording_id: str,
@@ -232,6 +289,8 @@ async def delete_recording(
         if audio_path.exists():
             audio_path.unlink()
 
+    # 처리 작업도 함께 삭제 (실행 중이면 하트비트가 리스 상실로 보고 작업을 취소)
+    await db.execute(delete(ProcessingJob).where(ProcessingJob.recording_id == recording_id))
     await db.delete(recording)
     await db.commit()
     return {"message": "삭제되었습니다"}
@@ -3,39 +3,108 @@
 
 Protocol:
   Client → Server:
-    - binary: 오디오 청크 (Int16 PCM)
+    - binary: 오디오 청크 (encoding에 따라 Int16 PCM / Ogg Opus / WebM Opus 조각)
     - JSON {"type": "config", "sample_rate": 16000}: 초기 설정 (선택, 첫 메시지)
+        - "encoding": "LINEAR16" (기본) | "OGG_OPUS" | "WEBM_OPUS"
+          Opus는 PCM 대비 대역폭이 약 1/10. OGG_OPUS는 그대로 전달하고,
+          WEBM_OPUS (MediaRecorder 기본)는 ffmpeg로 Ogg에 점진적 remux하여 전달.
+          Opus의 sample_rate 기본값은 48000.
+        - "queue_policy": "block" | "coalesce" | "drop_oldest" (선택, 업스트림 지연 시 정책)
+          drop_oldest는 LINEAR16에서만 적용되며, Opus 컨테이너 스트림은 block으로 바뀜
+        - "vad": bool (선택, LINEAR16 무음 제거 여부, 기본값은 설정 따름)
+        - "live_summary": bool (선택, 강의 중 점진 요약)
+        - "partial_hz": float (선택, 초당 최대 partial 전송 수, 기본값은 설정 따름, 0이면 제한 없음)
+        - "partial_delta": bool (선택, partial을 stt_delta로 변경분만 전송)
+        - "notion_sync": bool (선택, 연결된 Notion에 강의 중 실시간 기록), "title": 페이지 제목
     - JSON {"type": "eos"}: 스트림 종료 신호
 
   Server → Client:
     - JSON {"type": "stt_result", "seq": N, "final": bool, "text": "..."}
+        partial은 partial_hz로 제한되며 (대기 중에는 최신 것만 유지), final은 즉시 전송
+    - JSON {"type": "stt_delta", "seq": N, "keep": N, "append": "..."}: partial_delta 사용 시
+        같은 seq의 직전 partial 텍스트[:keep] + append = 새 partial 텍스트
+    - JSON {"type": "gap", "dropped_bytes": N, "dropped_chunks": N}: drop_oldest로 버려진 오디오
+    - JSON {"type": "summary_section", "index": N, "start_at": ms, "end_at": ms, "content": "..."}
+    - JSON {"type": "summary_final", "summary": "..."}: 점진 요약 사용 시 eos_ack 직전에 전송
+    - JSON {"type": "notion_page", "url": "..."}: 실시간 Notion 페이지가 만들어지면 전송
     - JSON {"type": "error", "message": "..."}
-    - JSON {"type": "eos_ack"}: 모든 결과 전송 완료
+    - JSON {"type": "warning", "message": "..."}: 세션은 계속되는 경고 (예: Notion 미연결)
+    - JSON {"type": "eos_ack", "stats": {...}}: 모든 결과 전송 완료 (세션 지표 포함)
 """
 
 import asyncio
 import json
-from typing import Optional
+import uuid
+from typing import Any, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.core.config import settings
+from app.core.security import session_manager
+from app.services.audio_relay_queue import (
+    QUEUE_POLICIES,
+    AudioGap,
+    AudioRelayQueue,
+    policy_for_encoding,
+)
+from app.services.audio_stream import webm_to_ogg_stream
+from app.services.live_notion_sync import LiveNotionSync
+from app.services.live_sessions import live_sessions
+from app.services.live_summarizer import IncrementalSummarizer, SummarySection
+from app.services.llm_summarizer import lecture_summarizer
+from app.services.notion_client import notion_clients
+from app.services.partial_coalescer import PartialCoalescer
 from app.services.rtzr_client import RTZRClient
+from app.services.vad import EnergyVAD, create_vad
 
 router = APIRouter()
 
+# 클라이언트가 보낼 수 있는 인코딩
+CLIENT_ENCODINGS = ("LINEAR16", "OGG_OPUS", "WEBM_OPUS")
+
 
 @router.websocket("/ws/stt")
 async def streaming_stt(websocket: WebSocket) -> None:
     """실시간 스트리밍 STT WebSocket 엔드포인트"""
     await websocket.accept()
 
-    # 기본 설정
+    # 기본 설정 (config 메시지로 변경, 첫 오디오 수신 시 확정)
     sample_rate = 16000
     encoding = "LINEAR16"
+    use_vad = settings.stt_vad_enabled
+    vad: Optional[EnergyVAD] = None
+    use_live_summary = False
+    live_summarizer: Optional[IncrementalSummarizer] = None
+    partial_hz = settings.stt_partial_max_hz
+    partial_delta = False
+    results: Optional[PartialCoalescer] = None
+    notion_config: Optional[tuple[str, str]] = None  # (token, page_id), 실시간 Notion 기록 시
+    notion_title = "실시간 강의 노트"
+    notion_sync: Optional[LiveNotionSync] = None
+    relay_task: Optional[asyncio.Task] = None
+
+    # 오디오 청크를 전달할 제한 크기 큐 (close() = EOS)
+    audio_queue = AudioRelayQueue(
+        max_chunks=settings.stt_relay_queue_chunks,
+        policy=settings.stt_relay_queue_policy,
+        frame_bytes=settings.stt_relay_frame_bytes,
+    )
+
+    session_id = uuid.uuid4().hex
 
-    # 오디오 청크를 전달할 큐 (None = EOS)
-    audio_queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+    def session_stats() -> dict[str, Any]:
+        stats: dict[str, Any] = {"queue": audio_queue.stats()}
+        if vad is not None:
+            stats["vad"] = vad.stats()
+        if live_summarizer is not None:
+            stats["live_summary"] = live_summarizer.stats()
+        if results is not None:
+            stats["results"] = results.stats()
+        if notion_sync is not None:
+            stats["notion"] = notion_sync.stats()
+        return stats
+
+    live_sessions.register(session_id, session_stats)
 
     rtzr_client = RTZRClient(
         client_id=settings.return_zero_client_id,
@@ -48,32 +117,98 @@ async def streaming_stt(websocket: WebSocket) -> None:
             chunk = await audio_queue.get()
             if chunk is None:
                 return
+            if isinstance(chunk, AudioGap):
+                # 버려진 구간을 클라이언트에 알림 (전사 결과에 빈틈이 생길 수 있음)
+                try:
+                    await websocket.send_json({
+                        "type": "gap",
+                        "dropped_bytes": chunk.dropped_bytes,
+                        "dropped_chunks": chunk.dropped_chunks,
+                    })
+                except Exception:
+                    pass
+                continue
+            if vad is not None:
+                # 무음 프레임은 업스트림으로 보내지 않음
+                chunk = vad.process(chunk)
+                if not chunk:
+                    continue
             yield chunk
 
+    async def send_section(section: SummarySection) -> None:
+        """새 구간 노트를 클라이언트에 전송"""
+        try:
+            await websocket.send_json({
+                "type": "summary_section",
+                "index": section.index,
+                "start_at": section.start_at,
+                "end_at": section.end_at,
+                "content": section.content,
+            })
+        except Exception:
+            pass
+        if notion_sync is not None:
+            notion_sync.add_section(section)
+
+    async def send_notion_page(url: str) -> None:
+        """실시간 Notion 페이지 주소를 클라이언트에 전송"""
+        try:
+            await websocket.send_json({"type": "notion_page", "url": url})
+        except Exception:
+            pass
+
     async def relay_results():
         """Return Zero 결과를 브라우저로 중계"""
+        audio_stream = audio_generator()
+        upstream_encoding = encoding
+        if encoding == "WEBM_OPUS":
+            # Return Zero는 WebM을 받지 않으므로 Ogg로 컨테이너만 변환
+            audio_stream = webm_to_ogg_stream(audio_stream)
+            upstream_encoding = "OGG_OPUS"
+
         try:
             async for result in rtzr_client.stream_transcribe(
-                audio_stream=audio_generator(),
+                audio_stream=audio_stream,
                 sample_rate=sample_rate,
-                encoding=encoding,
+                encoding=upstream_encoding,
                 use_itn=True,
                 use_disfluency_filter=True,
             ):
                 alternatives = result.get("alternatives", [])
                 text = alternatives[0].get("text", "") if alternatives else ""
+                start_at = result.get("start_at", 0)
+                if vad is not None:
+                    # 무음을 뺀 만큼 당겨진 시각을 원본 기준으로 보정
+                    start_at = vad.to_source_ms(start_at)
 
-                await websocket.send_json({
+                await results.push({
                     "type": "stt_result",
                     "seq": result.get("seq", 0),
                     "final": result.get("final", False),
                     "text": text,
-                    "start_at": result.get("start_at", 0),
+                    "start_at": start_at,
                     "duration": result.get("duration", 0),
                 })
 
+                if live_summarizer is not None and result.get("final"):
+                    live_summarizer.add_final(text, start_at, result.get("duration", 0))
+                if notion_sync is not None and result.get("final"):
+                    notion_sync.add_final(text)
+
+            # 마지막 final 이후의 대기 partial은 버림 (eos_ack 뒤에 도착하지 않도록)
+            await results.close()
+
+            # 남은 구간 요약 후 최종 보고서 전송 (대부분 강의 중에 이미 요약됨)
+            summary = ""
+            if live_summarizer is not None:
+                summary = await live_summarizer.finish()
+                await websocket.send_json({"type": "summary_final", "summary": summary})
+            if notion_sync is not None:
+                # 남은 전사와 최종 보고서까지 Notion에 기록
+                await notion_sync.finish(summary)
+
             # 모든 결과 전송 완료
-            await websocket.send_json({"type": "eos_ack"})
+            await websocket.send_json({"type": "eos_ack", "stats": session_stats()})
         except WebSocketDisconnect:
             pass
         except Exception as e:
@@ -84,16 +219,58 @@ async def streaming_stt(websocket: WebSocket) -> None:
                 })
             except Exception:
                 pass
+        finally:
+            # 업스트림이 끝났으면 수신 루프가 큐에서 막히지 않도록 닫음
+            await audio_queue.close()
+            await results.close()
+            if live_summarizer is not None:
+                await live_summarizer.cancel()
+            if notion_sync is not None:
+                await notion_sync.cancel()
 
-    # Return Zero 결과 중계 태스크 시작
-    relay_task = asyncio.create_task(relay_results())
+    def start_relay() -> None:
+        """설정을 확정하고 Return Zero 결과 중계 태스크 시작 (한 번만)"""
+        nonlocal relay_task, vad, live_summarizer, results, notion_sync
+        if relay_task is not None:
+            return
+        results = PartialCoalescer(
+            websocket.send_text,
+            max_hz=partial_hz,
+            delta=partial_delta,
+        )
+        if use_vad and encoding == "LINEAR16":
+            vad = create_vad(sample_rate)
+        if use_live_summary:
+            live_summarizer = IncrementalSummarizer(
+                lecture_summarizer,
+                on_section=send_section,
+                min_tokens=settings.live_summary_min_tokens,
+                interval_seconds=settings.live_summary_interval_seconds,
+                min_interval_tokens=settings.live_summary_min_interval_tokens,
+                fold_fanout=settings.live_summary_fold_fanout,
+                retry_base_delay=settings.live_summary_retry_base_delay,
+                retry_max_delay=settings.live_summary_retry_max_delay,
+            )
+            live_summarizer.start()
+        if notion_config is not None:
+            token, page_id = notion_config
+            notion_sync = LiveNotionSync(
+                notion_clients.get(token),
+                parent_page_id=page_id,
+                title=notion_title,
+                flush_interval=settings.notion_sync_interval,
+                on_page=send_notion_page,
+            )
+            notion_sync.start()
+        relay_task = asyncio.create_task(relay_results())
 
     try:
         while True:
             message = await websocket.receive()
 
             if "bytes" in message:
-                # 바이너리 오디오 청크
+                # 바이너리 오디오 청크 (큐가 가득 차면 정책에 따라 대기/병합/삭제)
+                start_relay()
                 await audio_queue.put(message["bytes"])
             elif "text" in message:
                 data = json.loads(message["text"])
@@ -101,17 +278,53 @@ async def streaming_stt(websocket: WebSocket) -> None:
 
                 if msg_type == "config":
                     # 초기 설정 (오디오 전송 전에 보내야 함)
-                    sample_rate = data.get("sample_rate", 16000)
                     encoding = data.get("encoding", "LINEAR16")
+                    if encoding not in CLIENT_ENCODINGS:
+                        await websocket.send_json({
+                            "type": "error",
+                            "message": f"지원하지 않는 인코딩입니다: {encoding}",
+                        })
+                        break
+                    default_rate = 16000 if encoding == "LINEAR16" else 48000
+                    sample_rate = data.get("sample_rate", default_rate)
+                    requested_policy = data.get("queue_policy")
+                    if requested_policy not in QUEUE_POLICIES:
+                        requested_policy = settings.stt_relay_queue_policy
+                    audio_queue.policy = policy_for_encoding(requested_policy, encoding)
+                    if audio_queue.policy != requested_policy and "queue_policy" in data:
+                        await websocket.send_json({
+                            "type": "warning",
+                            "message": f"{encoding}에서는 {requested_policy} 정책을 쓸 수 없어 block으로 처리합니다",
+                        })
+                    if "vad" in data:
+                        use_vad = bool(data["vad"])
+                    use_live_summary = bool(data.get("live_summary", False))
+                    if "partial_hz" in data:
+                        partial_hz = float(data["partial_hz"])
+                    partial_delta = bool(data.get("partial_delta", False))
+                    if data.get("notion_sync"):
+                        token, page_id = session_manager.get_notion_config(websocket)
+                        if token and page_id:
+                            notion_config = (token, page_id)
+                            notion_title = data.get("title") or notion_title
+                        else:
+                            # 전사는 계속하고 Notion 기록만 하지 않음
+                            await websocket.send_json({
+                                "type": "warning",
+                                "message": "Notion이 연결되지 않아 실시간 기록을 하지 않습니다",
+                            })
                 elif msg_type == "eos":
                     # 스트림 종료
-                    await audio_queue.put(None)
+                    start_relay()
+                    await audio_queue.close()
                     break
 
     except WebSocketDisconnect:
-        await audio_queue.put(None)
+        await audio_queue.close()
     except Exception:
-        await audio_queue.put(None)
+        await audio_queue.close()
     finally:
         # relay_task 완료 대기 (Return Zero 잔여 결과 수신)
-        await relay_task
+        if relay_task is not None:
+            await relay_task
+        live_sessions.unregister(session_id)
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -8,23 +9,129 @@ class Settings(BaseSettings):
     # Return Zero API
     return_zero_client_id: str
     return_zero_client_secret: str
+    rtzr_token_refresh_margin: float = 600.0  # 만료 몇 초 전부터 토큰을 미리 재발급할지
 
     # OpenRouter API
     openrouter_api_key: str
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    llm_model: str = "arcee-ai/trinity-large-preview:free"  # 바꾸면 요약 캐시도 새로 쌓임
+    llm_temperature: float = 0.3  # 일관성 있는 요약을 위해 낮은 temperature
+    llm_timeout: float = 120.0  # LLM 응답 대기 시간 (초)
+    llm_max_connections: int = 10  # OpenRouter keep-alive 연결 수
+
+    # LLM 호출 스케줄러 (프로세스 전체 한도)
+    llm_requests_per_minute: float = 20.0  # 분당 요청 한도 (0이면 제한 없음)
+    llm_tokens_per_minute: float = 0.0  # 분당 토큰 한도 (0이면 제한 없음)
+    llm_max_in_flight: int = 4  # 동시에 진행 중인 호출 수
+    llm_max_attempts: int = 6  # 호출당 최대 시도 횟수 (429/5xx/연결 오류)
+    llm_retry_base_delay: float = 2.0  # 재시도 백오프 기본 지연 (초)
+    llm_retry_max_delay: float = 60.0  # 재시도 백오프 최대 지연 (초)
+    llm_output_tokens_estimate: int = 1500  # TPM 계산용 예상 응답 토큰 수
 
     # Notion API
     notion_api_key: str
     notion_page_url: Optional[str] = None  # 기본 페이지 URL (선택)
+    notion_max_clients: int = 256  # 재사용할 토큰별 클라이언트 수
+    notion_max_connections: int = 20  # Notion API 공유 연결 풀 크기
+    notion_max_attempts: int = 5  # 429/일시적 오류 시 최대 시도 횟수
+    notion_retry_base_delay: float = 1.0  # Retry-After가 없을 때 백오프 기본 지연 (초)
+    notion_retry_max_delay: float = 30.0  # 백오프 최대 지연 (초)
+    notion_sync_interval: float = 10.0  # 실시간 기록 시 전사를 모아서 쓰는 주기 (초)
+    notion_requests_per_second: float = 3.0  # 토큰별 요청 한도 (Notion 평균 한도는 초당 3회)
+    notion_outbox_concurrency: int = 4  # 동시에 처리하는 Notion 쓰기 수
+    notion_outbox_max_attempts: int = 8  # 쓰기당 최대 시도 횟수
+    notion_outbox_retry_base_delay: float = 5.0  # 재시도 기본 대기 (초, 지수 증가)
+    notion_outbox_retry_max_delay: float = 300.0  # 재시도 최대 대기 (초)
+    notion_outbox_lease_seconds: int = 60  # 쓰기 리스 유효 시간 (초)
+    notion_save_wait_seconds: float = 0.0  # /save가 완료를 기다리는 최대 시간 (0이면 즉시 pending 응답, 클라이언트가 /writes/{id}로 확인)
 
     # FastAPI 세션 관리
     session_secret_key: str = "your-secret-key-change-in-production"  # 프로덕션에서는 반드시 변경
 
+    # 실행 환경 (development, production)
+    environment: str = "development"
+
     # 데이터베이스
     database_url: str = "sqlite+aiosqlite:///./voicememo.db"
+    database_echo: Optional[bool] = None  # SQL 쿼리 로그 (None이면 development에서만)
+    database_pool_size: int = 10  # 서버 DB(PostgreSQL 등) 연결 풀 크기
+    database_max_overflow: int = 20  # 풀 크기를 넘어 추가로 여는 연결 수
+    database_pool_timeout: float = 30.0  # 풀에서 연결을 기다리는 최대 시간 (초)
+    database_pool_recycle: int = 1800  # 이 시간(초)이 지난 연결은 새로 맺음
+
+    # SQLite 성능 설정 (연결마다 PRAGMA로 적용)
+    sqlite_tuning_enabled: bool = True
+    sqlite_journal_mode: str = "WAL"  # 읽기와 쓰기가 서로 막지 않음
+    sqlite_synchronous: str = "NORMAL"  # WAL에서는 NORMAL도 손상 없이 안전 (전원 차단 시 마지막 커밋만 유실 가능)
+    sqlite_busy_timeout_ms: int = 5000  # 잠금 대기 시간 (즉시 "database is locked" 대신)
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # 메모리 맵 읽기 크기 (256MB)
+    sqlite_cache_size_kb: int = 64 * 1024  # 연결당 페이지 캐시 (64MB)
 
     # 파일 저장 경로
     output_dir: str = "outputs"
 
+    # 업로드 설정
+    upload_chunk_size: int = 1024 * 1024  # 디스크 복사 청크 크기 (1MB)
+    max_upload_size: int = 1024 * 1024 * 1024  # 최대 업로드 크기 (1GB, 0이면 무제한)
+
+    # 작업 큐 워커
+    job_worker_concurrency: int = 8  # 동시에 처리하는 작업 수
+    job_ffmpeg_concurrency: int = 2  # 단독 ffmpeg 작업 동시 실행 수 (remux 파이프는 STT 단계에 포함)
+    job_stt_concurrency: int = 4  # STT 단계 동시 실행 수
+    job_llm_concurrency: int = 2  # LLM 단계 동시 실행 수
+    job_max_attempts: int = 5  # 최대 시도 횟수
+    job_retry_base_delay: float = 10.0  # 재시도 기본 대기 (초, 지수 증가)
+    job_retry_max_delay: float = 600.0  # 재시도 최대 대기 (초)
+    job_lease_seconds: int = 60  # 작업 리스 유효 시간 (초)
+    job_poll_interval: float = 1.0  # 큐 폴링 간격 (초)
+
+    # 분할 병렬 전사 (긴 업로드 파일)
+    stt_segment_enabled: bool = True
+    stt_segment_min_duration: float = 900.0  # 이 길이(초) 이상일 때만 분할
+    stt_segment_seconds: float = 300.0  # 목표 구간 길이 (초)
+    stt_segment_concurrency: int = 4  # 작업당 동시 STT 연결 수
+    stt_silence_threshold_db: float = -35.0  # 무음 판단 음량 (dB)
+    stt_silence_min_duration: float = 0.5  # 무음 최소 길이 (초)
+
+    # 실시간 STT 릴레이 (/ws/stt)
+    stt_relay_queue_chunks: int = Field(100, ge=1)  # 세션당 대기 청크 수 한도 (100ms 청크 기준 10초)
+    stt_relay_queue_policy: str = "block"  # block, coalesce, drop_oldest (drop_oldest는 LINEAR16에만 적용)
+    stt_relay_frame_bytes: int = 32000  # coalesce 프레임 최대 크기 (16kHz PCM 1초)
+    stt_partial_max_hz: float = 10.0  # 세션당 초당 최대 partial 전송 수 (0이면 제한 없음)
+
+    # 음성 구간 검출 (LINEAR16 입력의 무음을 STT로 보내지 않음)
+    stt_vad_enabled: bool = True
+    stt_vad_frame_ms: int = 20  # 판정 프레임 길이 (ms)
+    stt_vad_threshold_db: float = -45.0  # 음성 판단 에너지 (dBFS)
+    stt_vad_zcr_threshold: float = 0.25  # 약한 마찰음 판단 영교차율
+    stt_vad_hangover_ms: int = 300  # 음성 뒤에 이어 보낼 길이 (ms)
+    stt_vad_preroll_ms: int = 200  # 음성 앞에 붙여 보낼 길이 (ms)
+    stt_vad_keepalive_ms: int = 5000  # 무음이 길 때 연결 유지용 무음 프레임 주기 (ms)
+
+    # 실시간 점진 요약 (config 메시지의 "live_summary": true로 사용)
+    live_summary_min_tokens: int = 1200  # 이만큼 쌓이면 바로 구간 요약
+    live_summary_interval_seconds: float = 180.0  # 마지막 요약 후 이 시간이 지나면 구간 요약
+    live_summary_min_interval_tokens: int = 30  # 시간 기준 요약의 최소 토큰 수
+    live_summary_fold_fanout: int = 6  # 구간 노트 몇 개를 챕터 하나로 접을지
+    live_summary_retry_base_delay: float = 5.0  # 구간 요약 실패 후 재시도 대기 (초, 지수 증가)
+    live_summary_retry_max_delay: float = 120.0  # 재시도 최대 대기 (초)
+
+    # 긴 강의 분할 요약 (map-reduce)
+    summary_chunk_tokens: int = 6000  # 이보다 긴 전사는 청크로 나눠 요약
+    summary_chunk_concurrency: int = 4  # 요약 한 건의 동시 청크 요약 수
+    summary_reduce_max_tokens: int = 12000  # reduce 프롬프트에 넣을 노트의 최대 토큰 수
+
+    # 요약 전 전사 압축 (간투사/반복 제거)
+    summary_compaction_enabled: bool = True
+    summary_filler_words: list[str] = [
+        "음", "음음", "으음", "어", "어어", "아", "에", "에이", "그니까", "뭐랄까", "있잖아", "있잖아요",
+    ]  # 단독 어절일 때만 제거 (환경변수는 JSON 배열)
+    summary_duplicate_similarity: float = 0.9  # 이 이상 비슷한 연속 발화는 하나만 남김
+
+    # STT/요약 결과 캐시
+    result_cache_enabled: bool = True
+    result_cache_max_bytes: int = 256 * 1024 * 1024  # 캐시 전체 크기 한도 (256MB)
+
     class Config:
         env_file = ".env"
         case_sensitive = False
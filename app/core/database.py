@@ -3,9 +3,13 @@
 """
 
 from collections.abc import AsyncGenerator
+from typing import Any, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event, inspect, literal
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.schema import CreateColumn
 
 from app.core.config import settings
 
@@ -17,12 +21,68 @@ class Base(DeclarativeBase):
     pass
 
 
+def sqlite_pragmas() -> dict[str, Any]:
+    """
+    설정에 따른 SQLite PRAGMA
+
+    Returns:
+        {PRAGMA 이름: 값} (튜닝을 끄면 빈 dict)
+    """
+    if not settings.sqlite_tuning_enabled:
+        return {}
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": -settings.sqlite_cache_size_kb,  # 음수는 KB 단위
+        "temp_store": "MEMORY",
+    }
+
+
+def create_engine(url: str, pragmas: Optional[dict[str, Any]] = None) -> AsyncEngine:
+    """
+    비동기 엔진 생성
+
+    SQLite는 연결마다 PRAGMA를 적용하고, 서버 DB는 설정의 연결 풀 크기를 사용한다.
+
+    Args:
+        url: 데이터베이스 URL
+        pragmas: SQLite PRAGMA (없으면 sqlite_pragmas())
+
+    Returns:
+        AsyncEngine
+    """
+    echo = settings.database_echo
+    if echo is None:
+        echo = settings.environment == "development"
+
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_async_engine(
+            url,
+            echo=echo,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+            pool_pre_ping=True,
+        )
+
+    async_engine = create_async_engine(url, echo=echo)
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    if pragmas:
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return async_engine
+
+
 # 비동기 엔진 생성
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,  # SQL 쿼리 로그 출력 (개발 환경)
-    future=True,
-)
+engine = create_engine(settings.database_url)
 
 # 비동기 세션 팩토리
 AsyncSessionLocal = async_sessionmaker(
@@ -49,6 +109,46 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def _add_missing_columns(connection) -> None:
+    """
+    모델에 있지만 기존 테이블에 없는 컬럼 추가 (create_all은 기존 테이블을 바꾸지 않음)
+
+    NOT NULL 컬럼은 모델의 기본값을 DEFAULT로 붙여 기존 행을 채운다.
+    """
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+    preparer = connection.dialect.identifier_preparer
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = str(CreateColumn(column).compile(dialect=connection.dialect))
+            if not column.nullable and column.server_default is None:
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is None:
+                    print(f"⚠️ 기본값 없는 NOT NULL 컬럼은 자동으로 추가할 수 없습니다: {table.name}.{column.name}")
+                    continue
+                value = literal(default, column.type).compile(
+                    dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+                )
+                ddl += f" DEFAULT {value}"
+
+            connection.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+            print(f"🛠️ 컬럼 추가: {table.name}.{column.name}")
+
+
+def _create_missing_indexes(connection) -> None:
+    """모델에 정의된 인덱스 중 DB에 없는 것 생성 (create_all은 기존 테이블의 인덱스를 만들지 않음)"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 # 데이터베이스 초기화
 async def init_db() -> None:
     """
@@ -58,6 +158,10 @@ async def init_db() -> None:
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # 이미 있던 테이블에 나중에 추가된 컬럼/인덱스 생성
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+
 
 
 # 데이터베이스 종료
@@ -9,16 +9,37 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from app.api.routes import notion, recordings, streaming
+from app.api.routes import metrics, notion, recordings, streaming
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.services.job_worker import job_worker
+from app.services.llm_summarizer import lecture_summarizer
+from app.services.notion_client import notion_clients
+from app.services.notion_outbox import notion_outbox
+from app.services.rtzr_client import rtzr_token_provider
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """앱 시작/종료 시 DB 초기화/정리"""
+    """앱 시작/종료 시 DB 초기화/정리, 작업 워커 시작/중지, RTZR 토큰 미리 발급"""
     await init_db()
+
+    # 첫 실시간 세션이 인증을 기다리지 않도록 토큰을 미리 발급
+    try:
+        await rtzr_token_provider.get_token(
+            settings.return_zero_client_id, settings.return_zero_client_secret
+        )
+    except Exception as e:
+        print(f"⚠️ RTZR 토큰 사전 발급 실패 (요청 시 재시도): {e}")
+
+    job_worker.start()
+    notion_outbox.start()
     yield
+    await job_worker.stop()
+    await notion_outbox.stop()
+    await rtzr_token_provider.close()
+    await lecture_summarizer.close()
+    await notion_clients.close()
     await close_db()
 
 # FastAPI 앱 생성
@@ -39,6 +60,7 @@ app.add_middleware(
     allow_credentials=True,  # httpOnly 쿠키 허용
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 녹음 목록 다음 페이지 커서
 )
 
 # 세션 미들웨어 (httpOnly 쿠키 세션 관리)
@@ -72,6 +94,7 @@ async def health_check():
 app.include_router(recordings.router, prefix="/api/recordings", tags=["recordings"])
 app.include_router(notion.router, prefix="/api/notion", tags=["notion"])
 app.include_router(streaming.router, tags=["streaming"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 데이터베이스 모델
 """
 
+from app.models.cache import CacheEntry
+from app.models.job import ProcessingJob
+from app.models.notion_write import NotionWrite
 from app.models.recording import Recording
 
-__all__ = ["Recording"]
+__all__ = ["CacheEntry", "NotionWrite", "ProcessingJob", "Recording"]
@@ -0,0 +1,37 @@
+"""
+ResultCache 데이터베이스 모델
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, DateTime, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class CacheEntry(Base):
+    """STT/요약 결과 캐시 항목 (내용 해시 기반 키)"""
+
+    __tablename__ = "result_cache"
+
+    # 캐시 키 (입력 해시 + 파라미터의 SHA-256)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # 캐시 종류 (stt, summary)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # 결과 (JSON 직렬화)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # 바이트 단위
+
+    # 타임스탬프 (accessed_at 기준 LRU 제거)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    accessed_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<CacheEntry(key={self.key}, kind={self.kind}, size={self.size})>"
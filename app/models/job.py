@@ -0,0 +1,61 @@
+"""
+ProcessingJob 데이터베이스 모델
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ProcessingJob(Base):
+    """녹음 처리 작업 큐 모델 (업로드 → STT → AI 요약)"""
+
+    __tablename__ = "processing_jobs"
+    __table_args__ = (
+        Index("ix_processing_jobs_claim", "status", "available_at"),
+    )
+
+    # Primary Key
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+
+    # 처리 대상
+    recording_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    audio_file_path: Mapped[str] = mapped_column(String(500), nullable=False)
+
+    # 작업 상태 (pending, running, done, failed)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+
+    # 마지막으로 완료된 단계 (None, remux, stt, ai) - 재시작 시 다음 단계부터 재개
+    stage: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+
+    # 재시도 정보
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # 실행 가능 시각 (재시도 백오프)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    # 리스 (워커가 작업을 점유 중인 기간)
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # 타임스탬프
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProcessingJob(id={self.id}, recording_id={self.recording_id}, "
+            f"status={self.status}, stage={self.stage})>"
+        )
@@ -0,0 +1,67 @@
+"""
+NotionWrite 데이터베이스 모델
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class NotionWrite(Base):
+    """Notion 페이지 쓰기 대기열 (outbox) 모델"""
+
+    __tablename__ = "notion_outbox"
+    __table_args__ = (
+        Index("ix_notion_outbox_claim", "status", "available_at"),
+    )
+
+    # Primary Key
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+
+    # 대상 녹음 (완료 시 notion_url 기록, 실시간 세션은 녹음이 없을 수 있음)
+    recording_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+
+    # 쓰기 내용 (재시작 후에도 이어서 쓸 수 있도록 토큰까지 저장, 완료/최종 실패 시 지움)
+    token: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # 토큰 SHA-256 (진행 상황 조회 시 세션 토큰과 비교, 토큰을 지운 뒤에도 남음)
+    token_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    parent_page_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # 쓰기 상태 (pending, running, done, failed)
+    status: Mapped[str] = mapped_column(String(20), default="pending", nullable=False)
+
+    # 진행 상황 (페이지 생성 후 블록을 나눠 붙이므로 중간부터 재개)
+    page_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+    page_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    blocks_written: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # 재시도 정보
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=8, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # 실행 가능 시각 (재시도 백오프)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    # 리스 (워커가 쓰기를 점유 중인 기간)
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # 타임스탬프
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<NotionWrite(id={self.id}, recording_id={self.recording_id}, status={self.status})>"
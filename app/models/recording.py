@@ -5,7 +5,7 @@ Recording 데이터베이스 모델
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Integer, DateTime, Text
+from sqlalchemy import String, Integer, DateTime, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -15,6 +15,12 @@ class Recording(Base):
     """녹음 기록 모델"""
 
     __tablename__ = "recordings"
+    __table_args__ = (
+        # 목록 키셋 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_recordings_created_at_id", "created_at", "id"),
+        # 상태별 목록 (status 필터 + 같은 정렬)
+        Index("ix_recordings_status_created_at", "status", "created_at", "id"),
+    )
 
     # Primary Key
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
@@ -25,12 +31,16 @@ class Recording(Base):
 
     # 파일 경로
     audio_file_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    audio_sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    audio_size: Mapped[int] = mapped_column(Integer, default=0)  # 바이트 단위
 
     # STT 결과
     stt_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # AI 요약 결과
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # 청크별 구간 노트 (JSON {청크 해시: 노트}, 전사 수정 시 바뀐 청크만 다시 요약)
+    summary_chunks: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Notion URL
     notion_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
@@ -2,6 +2,8 @@
 Notion API Pydantic 스키마
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -39,6 +41,18 @@ class NotionSaveRequest(BaseModel):
 
 
 class NotionSaveResponse(BaseModel):
-    """Notion 저장 응답"""
+    """Notion 저장 응답 (쓰기가 끝나기 전이면 status=pending, url은 빈 문자열)"""
+
+    url: str = ""
+    status: str = "done"
+    id: Optional[str] = Field(None, description="Notion 쓰기 ID (진행 상황 조회용)")
+
+
+class NotionWriteResponse(BaseModel):
+    """Notion 쓰기 진행 상황 응답"""
 
-    url: str
+    id: str
+    status: str
+    url: str = ""
+    attempts: int
+    error: Optional[str] = None
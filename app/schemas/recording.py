@@ -23,6 +23,14 @@ class RecordingStatusResponse(BaseModel):
     progress: int
 
 
+class TranscriptUpdateRequest(BaseModel):
+    """전사 텍스트 수정 요청 (요약을 다시 만듦)"""
+
+    stt_text: str = Field(alias="sttText")
+
+    model_config = {"populate_by_name": True}
+
+
 class RecordingResponse(BaseModel):
     """녹음 상세 응답"""
 
@@ -38,3 +46,19 @@ class RecordingResponse(BaseModel):
     updated_at: datetime = Field(alias="updatedAt")
 
     model_config = {"populate_by_name": True, "from_attributes": True}
+
+
+class RecordingListItem(BaseModel):
+    """녹음 목록 항목 (전사 본문 제외, 요약은 앞부분만)"""
+
+    id: str
+    title: str
+    duration: int = 0
+    summary: Optional[str] = Field(None, description="요약 앞부분 (목록 미리보기용)")
+    notion_url: Optional[str] = Field(None, alias="notionUrl")
+    status: str = "idle"
+    progress: int = 0
+    created_at: datetime = Field(alias="createdAt")
+    updated_at: datetime = Field(alias="updatedAt")
+
+    model_config = {"populate_by_name": True, "from_attributes": True}
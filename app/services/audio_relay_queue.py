@@ -0,0 +1,196 @@
+"""
+실시간 STT 릴레이용 제한 크기 오디오 큐
+
+브라우저 → 서버 → Return Zero 릴레이에서 업스트림이 느려져도 세션당 메모리가
+일정 한도를 넘지 않도록 한다. 큐가 가득 찼을 때의 정책:
+- block: 브라우저 수신 루프를 멈춤 (WebSocket/TCP 백프레셔)
+- coalesce: 마지막 청크에 이어붙여 큰 프레임으로 합침, 프레임도 가득 차면 block
+- drop_oldest: 가장 오래된 청크를 버리고 그 자리에 AudioGap 표시를 남김
+  (청크 경계가 곧 샘플 경계인 LINEAR16만 가능, Ogg/WebM 컨테이너는 조각을 버리면 스트림이 깨짐)
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+QUEUE_POLICIES = ("block", "coalesce", "drop_oldest")
+
+# 청크를 버려도 스트림이 깨지지 않는 인코딩
+DROP_SAFE_ENCODINGS = ("LINEAR16",)
+
+
+def policy_for_encoding(policy: str, encoding: str) -> str:
+    """
+    인코딩에서 쓸 수 있는 큐 정책 (컨테이너 스트림의 drop_oldest는 block으로 바꿈)
+
+    Args:
+        policy: 요청된 정책
+        encoding: 클라이언트 오디오 인코딩
+
+    Returns:
+        실제로 적용할 정책
+    """
+    if policy == "drop_oldest" and encoding not in DROP_SAFE_ENCODINGS:
+        return "block"
+    return policy
+
+
+@dataclass
+class AudioGap:
+    """버려진 오디오 구간 표시"""
+
+    dropped_bytes: int = 0
+    dropped_chunks: int = 0
+
+
+class AudioRelayQueue:
+    """정책 기반 제한 크기 오디오 큐 (단일 생산자/단일 소비자)"""
+
+    def __init__(self, max_chunks: int, policy: str = "block", frame_bytes: int = 32000):
+        """
+        Args:
+            max_chunks: 큐에 보관할 최대 청크 수 (1 이상)
+            policy: 가득 찼을 때의 정책 (block, coalesce, drop_oldest)
+            frame_bytes: coalesce 정책에서 합친 프레임의 최대 크기 (바이트)
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"알 수 없는 큐 정책: {policy}")
+        if max_chunks < 1:
+            raise ValueError(f"max_chunks는 1 이상이어야 합니다: {max_chunks}")
+
+        self.max_chunks = max_chunks
+        self.policy = policy
+        self.frame_bytes = frame_bytes
+
+        self._items: deque[Union[bytes, AudioGap]] = deque()
+        self._chunks = 0
+        self._bytes = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+
+        # 통계
+        self.max_depth = 0
+        self.max_bytes = 0
+        self.total_chunks = 0
+        self.coalesced_chunks = 0
+        self.dropped_chunks = 0
+        self.dropped_bytes = 0
+        self.blocked_puts = 0
+
+    def _full(self) -> bool:
+        return self._chunks >= self.max_chunks
+
+    async def put(self, chunk: bytes) -> None:
+        """
+        오디오 청크 추가 (정책에 따라 대기/병합/삭제)
+
+        Args:
+            chunk: 오디오 바이트
+        """
+        async with self._changed:
+            if self._closed:
+                return
+            self.total_chunks += 1
+
+            if self._full() and self.policy == "coalesce":
+                tail = self._items[-1] if self._items else None
+                if isinstance(tail, bytes) and len(tail) + len(chunk) <= self.frame_bytes:
+                    self._items[-1] = tail + chunk
+                    self._bytes += len(chunk)
+                    self.coalesced_chunks += 1
+                    self._record_depth()
+                    self._changed.notify_all()
+                    return
+
+            if self._full() and self.policy == "drop_oldest":
+                self._drop_oldest()
+
+            if self._full():
+                self.blocked_puts += 1
+                await self._changed.wait_for(lambda: not self._full() or self._closed)
+                if self._closed:
+                    return
+
+            self._items.append(chunk)
+            self._chunks += 1
+            self._bytes += len(chunk)
+            self._record_depth()
+            self._changed.notify_all()
+
+    def _drop_oldest(self) -> None:
+        """가장 오래된 청크를 버리고 큐 맨 앞에 AudioGap 표시를 남김"""
+        gap = self._items.popleft() if isinstance(self._items[0], AudioGap) else AudioGap()
+        dropped = self._items.popleft()
+        self._chunks -= 1
+        self._bytes -= len(dropped)
+        gap.dropped_bytes += len(dropped)
+        gap.dropped_chunks += 1
+        self._items.appendleft(gap)
+        self.dropped_chunks += 1
+        self.dropped_bytes += len(dropped)
+
+    def _record_depth(self) -> None:
+        self.max_depth = max(self.max_depth, self._chunks)
+        self.max_bytes = max(self.max_bytes, self._bytes)
+
+    async def close(self) -> None:
+        """스트림 종료 (이후 put()은 무시, 남은 청크를 모두 꺼낸 뒤 get()이 None 반환)"""
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    async def get(self) -> Optional[Union[bytes, AudioGap]]:
+        """
+        다음 항목 꺼내기
+
+        coalesce 정책이면 대기 중인 청크를 frame_bytes까지 합쳐서 돌려준다.
+
+        Returns:
+            오디오 바이트, AudioGap 표시, 또는 None (스트림 종료)
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._items or self._closed)
+            if not self._items:
+                return None
+
+            item = self._items.popleft()
+            if isinstance(item, AudioGap):
+                self._changed.notify_all()
+                return item
+
+            self._chunks -= 1
+            self._bytes -= len(item)
+            if self.policy == "coalesce":
+                parts = [item]
+                size = len(item)
+                while (
+                    self._items
+                    and isinstance(self._items[0], bytes)
+                    and size + len(self._items[0]) <= self.frame_bytes
+                ):
+                    part = self._items.popleft()
+                    parts.append(part)
+                    size += len(part)
+                    self._chunks -= 1
+                    self._bytes -= len(part)
+                    self.coalesced_chunks += 1
+                item = b"".join(parts)
+
+            self._changed.notify_all()
+            return item
+
+    def stats(self) -> dict[str, Any]:
+        """큐 상태 및 누적 통계"""
+        return {
+            "policy": self.policy,
+            "depth": self._chunks,
+            "bytes": self._bytes,
+            "max_depth": self.max_depth,
+            "max_bytes": self.max_bytes,
+            "total_chunks": self.total_chunks,
+            "coalesced_chunks": self.coalesced_chunks,
+            "dropped_chunks": self.dropped_chunks,
+            "dropped_bytes": self.dropped_bytes,
+            "blocked_puts": self.blocked_puts,
+        }
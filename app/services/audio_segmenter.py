@@ -0,0 +1,160 @@
+"""
+긴 오디오를 무음 구간 기준으로 분할
+
+ffmpeg silencedetect로 한 번 디코딩하여 전체 길이와 무음 구간을 구하고,
+목표 길이에 가장 가까운 무음 구간의 중앙에서 자른다. 단어 중간이 잘리지 않게
+하면서 구간마다 별도의 STT 연결로 병렬 전사할 수 있게 한다.
+"""
+
+import asyncio
+import re
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from app.services.audio_stream import FFmpegError, ffmpeg_stream
+
+_SILENCE_START = re.compile(rb"silence_start: (-?[\d.]+)")
+_SILENCE_END = re.compile(rb"silence_end: (-?[\d.]+)")
+_OUT_TIME = re.compile(rb"out_time_us=(\d+)")
+
+
+@dataclass
+class AudioAnalysis:
+    """오디오 분석 결과 (초 단위)"""
+
+    duration: float
+    silences: list[tuple[float, float]] = field(default_factory=list)
+
+
+@dataclass
+class AudioSegment:
+    """분할된 오디오 구간 (초 단위)"""
+
+    start: float
+    end: float
+
+    @property
+    def offset_ms(self) -> int:
+        """전체 오디오 기준 시작 시각 (밀리초)"""
+        return int(self.start * 1000)
+
+
+async def analyze_audio(
+    audio_path: Path,
+    noise_db: float = -35.0,
+    min_silence: float = 0.5,
+) -> AudioAnalysis:
+    """
+    오디오 전체 길이와 무음 구간 분석
+
+    Args:
+        audio_path: 오디오 파일 경로
+        noise_db: 무음으로 판단할 음량 기준 (dB)
+        min_silence: 무음으로 인정할 최소 길이 (초)
+
+    Returns:
+        분석 결과
+
+    Raises:
+        FFmpegError: ffmpeg 실패 시
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", str(audio_path),
+        "-vn",
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+        "-f", "null",
+        "-progress", "pipe:1",  # 진행 정보 (out_time_us → 전체 길이)
+        "-",
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        message = stderr[-4096:].decode(errors="replace").strip()
+        raise FFmpegError(f"ffmpeg exited with {process.returncode}: {message}")
+
+    out_times = _OUT_TIME.findall(stdout)
+    duration = int(out_times[-1]) / 1_000_000 if out_times else 0.0
+
+    starts = [max(float(v), 0.0) for v in _SILENCE_START.findall(stderr)]
+    ends = [float(v) for v in _SILENCE_END.findall(stderr)]
+    # 파일 끝까지 무음이면 silence_end가 없음
+    if len(ends) < len(starts):
+        ends.append(duration)
+
+    return AudioAnalysis(duration=duration, silences=list(zip(starts, ends)))
+
+
+def plan_segments(
+    analysis: AudioAnalysis,
+    target_seconds: float,
+    min_seconds: Optional[float] = None,
+    max_seconds: Optional[float] = None,
+) -> list[AudioSegment]:
+    """
+    무음 구간을 기준으로 분할 지점 계획
+
+    현재 위치에서 [min_seconds, max_seconds] 범위 안의 무음 중앙 중
+    target_seconds에 가장 가까운 곳에서 자른다. 범위 안에 무음이 없으면
+    max_seconds 지점에서 자른다.
+
+    Args:
+        analysis: 오디오 분석 결과
+        target_seconds: 목표 구간 길이 (초)
+        min_seconds: 최소 구간 길이 (기본: 목표의 절반)
+        max_seconds: 최대 구간 길이 (기본: 목표의 1.5배)
+
+    Returns:
+        순서대로 정렬된 구간 리스트
+    """
+    min_seconds = target_seconds * 0.5 if min_seconds is None else min_seconds
+    max_seconds = target_seconds * 1.5 if max_seconds is None else max_seconds
+    duration = analysis.duration
+    cut_points = sorted((start + end) / 2 for start, end in analysis.silences)
+
+    segments = []
+    cursor = 0.0
+    while duration - cursor > max_seconds:
+        lo, hi = cursor + min_seconds, cursor + max_seconds
+        target = cursor + target_seconds
+        candidates = [p for p in cut_points if lo <= p <= hi]
+        cut = min(candidates, key=lambda p: abs(p - target)) if candidates else hi
+        segments.append(AudioSegment(start=cursor, end=cut))
+        cursor = cut
+
+    segments.append(AudioSegment(start=cursor, end=duration))
+    return segments
+
+
+def segment_stream(
+    audio_path: Path,
+    segment: AudioSegment,
+    chunk_size: int = 8192,
+) -> AsyncGenerator[bytes, None]:
+    """
+    오디오 구간을 Ogg Opus 스트림으로 제공 (코덱 복사)
+
+    Args:
+        audio_path: 원본 오디오 파일 경로
+        segment: 구간
+        chunk_size: 청크 크기 (바이트)
+
+    Returns:
+        Ogg Opus 바이트 스트림
+    """
+    return ffmpeg_stream(
+        [
+            "-ss", f"{segment.start:.3f}",  # 입력 탐색 (빠름)
+            "-i", str(audio_path),
+            "-t", f"{segment.end - segment.start:.3f}",
+            "-vn",
+            "-c:a", "copy",
+            "-f", "ogg",
+            "pipe:1",
+        ],
+        chunk_size,
+    )
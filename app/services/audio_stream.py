@@ -0,0 +1,226 @@
+"""
+오디오 스트림 소스
+
+ffmpeg를 asyncio 서브프로세스로 실행하여 stdout을 바로 STT 스트림으로 넘긴다.
+중간 파일을 만들지 않고 이벤트 루프도 막지 않는다.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+# Ogg 컨테이너 확장자 (변환 없이 그대로 전송 가능)
+OGG_SUFFIXES = (".ogg", ".opus")
+
+# ffmpeg stderr 보관 크기 (실패 시 오류 메시지용)
+_STDERR_TAIL = 4096
+
+
+class FFmpegError(Exception):
+    """ffmpeg 프로세스 실패"""
+
+
+async def _drain_stderr(stream: asyncio.StreamReader) -> bytes:
+    """stderr를 계속 읽어 파이프가 막히지 않게 하고 마지막 부분만 보관"""
+    tail = b""
+    while True:
+        chunk = await stream.read(_STDERR_TAIL)
+        if not chunk:
+            return tail
+        tail = (tail + chunk)[-_STDERR_TAIL:]
+
+
+async def ffmpeg_stream(
+    args: list[str],
+    chunk_size: int = 8192,
+) -> AsyncGenerator[bytes, None]:
+    """
+    ffmpeg를 실행하고 stdout을 청크 단위로 yield
+
+    소비자가 중간에 멈추면 (제너레이터 close) 프로세스를 종료한다.
+
+    Args:
+        args: ffmpeg 인자 (출력은 pipe:1 이어야 함)
+        chunk_size: 읽기 청크 크기 (바이트)
+
+    Yields:
+        ffmpeg 출력 청크
+
+    Raises:
+        FFmpegError: ffmpeg가 0이 아닌 코드로 종료된 경우
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_task = asyncio.create_task(_drain_stderr(process.stderr))
+
+    try:
+        while True:
+            chunk = await process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+        returncode = await process.wait()
+        stderr = await stderr_task
+        if returncode != 0:
+            message = stderr.decode(errors="replace").strip()
+            print(f"❌ ffmpeg 변환 실패: {message}")
+            raise FFmpegError(f"ffmpeg exited with {returncode}: {message}")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr_task.cancel()
+
+
+async def ffmpeg_pipe(
+    input_stream: AsyncGenerator[bytes, None],
+    args: list[str],
+    chunk_size: int = 4096,
+) -> AsyncGenerator[bytes, None]:
+    """
+    입력 스트림을 ffmpeg stdin으로 보내고 stdout을 yield (점진적 변환)
+
+    Args:
+        input_stream: ffmpeg에 넣을 바이트 스트림
+        args: ffmpeg 인자 (입력은 pipe:0, 출력은 pipe:1 이어야 함)
+        chunk_size: 읽기 청크 크기 (바이트)
+
+    Yields:
+        ffmpeg 출력 청크
+
+    Raises:
+        FFmpegError: ffmpeg가 0이 아닌 코드로 종료된 경우
+    """
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_task = asyncio.create_task(_drain_stderr(process.stderr))
+
+    async def feed_stdin() -> None:
+        try:
+            async for chunk in input_stream:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+
+    feed_task = asyncio.create_task(feed_stdin())
+
+    try:
+        while True:
+            chunk = await process.stdout.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+        await feed_task
+        returncode = await process.wait()
+        stderr = await stderr_task
+        if returncode != 0:
+            message = stderr.decode(errors="replace").strip()
+            print(f"❌ ffmpeg 변환 실패: {message}")
+            raise FFmpegError(f"ffmpeg exited with {returncode}: {message}")
+    finally:
+        feed_task.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stderr_task.cancel()
+
+
+def webm_to_ogg_stream(
+    input_stream: AsyncGenerator[bytes, None],
+) -> AsyncGenerator[bytes, None]:
+    """
+    WebM/Opus 스트림을 Ogg/Opus 스트림으로 점진적 remux (재인코딩 없음)
+
+    MediaRecorder가 timeslice마다 내보내는 WebM 조각을 그대로 받아,
+    Return Zero가 받는 OGG_OPUS로 컨테이너만 바꿔 지연 없이 흘려보낸다.
+
+    Args:
+        input_stream: WebM/Opus 바이트 스트림
+
+    Returns:
+        Ogg/Opus 바이트 스트림
+    """
+    return ffmpeg_pipe(
+        input_stream,
+        [
+            "-probesize", "32768",  # 입력 분석을 짧게 (첫 출력 지연 감소)
+            "-analyzeduration", "0",
+            "-f", "matroska",  # WebM 입력
+            "-i", "pipe:0",
+            "-vn",
+            "-c:a", "copy",
+            "-f", "ogg",
+            "-page_duration", "100000",  # Ogg 페이지를 100ms마다 내보냄
+            "-flush_packets", "1",
+            "pipe:1",
+        ],
+    )
+
+
+async def file_stream(
+    audio_path: Path,
+    chunk_size: int = 8192,
+) -> AsyncGenerator[bytes, None]:
+    """
+    파일을 청크 단위로 읽어 yield (읽기는 스레드 풀에서 수행)
+
+    Args:
+        audio_path: 파일 경로
+        chunk_size: 청크 크기 (바이트)
+
+    Yields:
+        파일 청크
+    """
+    with open(audio_path, "rb") as f:
+        while True:
+            chunk = await asyncio.to_thread(f.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def ogg_opus_stream(
+    audio_path: Path,
+    chunk_size: int = 8192,
+) -> AsyncGenerator[bytes, None]:
+    """
+    오디오 파일을 Ogg Opus 스트림으로 제공
+
+    이미 Ogg면 파일을 그대로 읽고, 아니면 (WebM 등) ffmpeg로 코덱 복사 remux한
+    출력을 파이프로 바로 전달한다.
+
+    Args:
+        audio_path: 원본 오디오 파일 경로
+        chunk_size: 청크 크기 (바이트)
+
+    Returns:
+        Ogg Opus 바이트 스트림
+    """
+    if audio_path.suffix.lower() in OGG_SUFFIXES:
+        print(f"✅ Ogg 파일 감지, 변환 스킵: {audio_path}")
+        return file_stream(audio_path, chunk_size)
+
+    return ffmpeg_stream(
+        [
+            "-i", str(audio_path),  # 입력 (WebM/Opus)
+            "-vn",  # 비디오 트랙 무시
+            "-c:a", "copy",  # 오디오 코덱 복사 (재인코딩 안 함)
+            "-f", "ogg",  # 출력 컨테이너
+            "pipe:1",  # stdout
+        ],
+        chunk_size,
+    )
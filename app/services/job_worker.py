@@ -0,0 +1,322 @@
+"""
+녹음 처리 작업 큐 워커
+
+processing_jobs 테이블을 폴링하여 리스(lease)를 걸고 작업을 가져온다.
+- 리스가 만료된 running 작업은 워커가 죽은 것으로 보고 다른 워커가 다시 가져감
+- 실패 시 지수 백오프로 재시도, max_attempts 초과 시 failed 처리
+- 단계별(ffmpeg/STT/LLM) 동시 실행 수는 StageLimits로 제한
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import ProcessingJob
+from app.models.recording import Recording
+from app.services.progress_bus import progress_bus
+from app.services.recording_pipeline import StageLimits, process_recording
+
+
+async def enqueue_recording_job(
+    db: AsyncSession,
+    recording: Recording,
+    stage: Optional[str] = None,
+) -> ProcessingJob:
+    """
+    녹음 처리 작업을 큐에 등록 (커밋은 호출자가 수행)
+
+    Args:
+        db: DB 세션
+        recording: 처리할 녹음
+        stage: 이미 완료된 것으로 볼 단계 (예: "stt"면 요약만 다시 실행)
+
+    Returns:
+        등록된 작업
+    """
+    job = ProcessingJob(
+        id=str(uuid.uuid4()),
+        recording_id=recording.id,
+        audio_file_path=recording.audio_file_path or "",
+        status="pending",
+        stage=stage,
+        max_attempts=settings.job_max_attempts,
+        available_at=datetime.utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+def _claimable(now: datetime):
+    """가져갈 수 있는 작업 조건 (대기 중이거나 시도가 남은 채 리스가 만료된 작업)"""
+    return or_(
+        and_(ProcessingJob.status == "pending", ProcessingJob.available_at <= now),
+        and_(
+            ProcessingJob.status == "running",
+            ProcessingJob.lease_expires_at < now,
+            ProcessingJob.attempts < ProcessingJob.max_attempts,
+        ),
+    )
+
+
+def _abandoned(now: datetime):
+    """시도를 다 쓴 채 리스가 만료된 작업 (마지막 시도 중 워커가 죽어 _fail을 거치지 못함)"""
+    return and_(
+        ProcessingJob.status == "running",
+        ProcessingJob.lease_expires_at < now,
+        ProcessingJob.attempts >= ProcessingJob.max_attempts,
+    )
+
+
+def _retry_delay(attempts: int) -> float:
+    """재시도 대기 시간 (지수 백오프, 초)"""
+    delay = settings.job_retry_base_delay * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.job_retry_max_delay)
+
+
+class JobWorkerPool:
+    """리스 기반 작업 큐 워커 풀"""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.limits = StageLimits(
+            ffmpeg=settings.job_ffmpeg_concurrency,
+            stt=settings.job_stt_concurrency,
+            llm=settings.job_llm_concurrency,
+        )
+        self._slots = asyncio.Semaphore(settings.job_worker_concurrency)
+        self._wakeup = asyncio.Event()
+        self._running: dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """폴링 루프 시작"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._poll_loop())
+            print(f"✅ 작업 워커 시작: {self.worker_id}")
+
+    async def stop(self) -> None:
+        """폴링 루프 및 실행 중인 작업 중지 (리스를 반환하여 즉시 재개 가능하게 함)"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProcessingJob)
+                .where(
+                    ProcessingJob.status == "running",
+                    ProcessingJob.lease_owner == self.worker_id,
+                )
+                .values(status="pending", lease_owner=None, lease_expires_at=None)
+            )
+            await db.commit()
+
+    def notify(self) -> None:
+        """새 작업 등록 알림 (폴링 대기 없이 즉시 확인)"""
+        self._wakeup.set()
+
+    async def _poll_loop(self) -> None:
+        """빈 슬롯이 있으면 작업을 가져와 실행"""
+        while True:
+            await self._slots.acquire()
+            try:
+                job_id = await self._claim()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            except Exception as e:
+                print(f"❌ 작업 조회 오류: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._slots.release()
+                try:
+                    await self._fail_abandoned()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"❌ 중단된 작업 정리 오류: {e}")
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=settings.job_poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run(job_id))
+            self._running[job_id] = task
+
+    async def _claim(self) -> Optional[str]:
+        """
+        작업 하나에 리스를 걸고 가져옴
+
+        SELECT 후 같은 조건으로 조건부 UPDATE하여, 다른 워커와 경합 시
+        한 쪽만 성공하도록 한다.
+
+        Returns:
+            가져온 작업 ID 또는 None
+        """
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            job_id = (
+                await db.execute(
+                    select(ProcessingJob.id)
+                    .where(_claimable(now))
+                    .order_by(ProcessingJob.available_at)
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            if job_id is None:
+                return None
+
+            result = await db.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, _claimable(now))
+                .values(
+                    status="running",
+                    lease_owner=self.worker_id,
+                    lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds),
+                    attempts=ProcessingJob.attempts + 1,
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+            return job_id if result.rowcount == 1 else None
+
+    async def _fail_abandoned(self) -> None:
+        """시도를 다 쓰고 중단된 작업을 실패 처리하고 녹음을 idle로 되돌림"""
+        now = datetime.utcnow()
+        failed: list[str] = []
+        async with AsyncSessionLocal() as db:
+            jobs = (
+                await db.execute(select(ProcessingJob).where(_abandoned(now)))
+            ).scalars().all()
+            for job in jobs:
+                result = await db.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == job.id, _abandoned(now))
+                    .values(
+                        status="failed",
+                        lease_owner=None,
+                        lease_expires_at=None,
+                        last_error=job.last_error or "작업 중 워커가 중단됨 (리스 만료)",
+                    )
+                )
+                if result.rowcount != 1:
+                    continue
+                recording = await db.get(Recording, job.recording_id)
+                if recording:
+                    recording.status = "idle"
+                    recording.progress = 0
+                failed.append(job.recording_id)
+                print(f"❌ 재시도 한도 초과, 중단된 작업 실패 처리: {job.id}")
+            await db.commit()
+
+        for recording_id in failed:
+            progress_bus.publish(
+                recording_id, {"type": "status", "status": "idle", "progress": 0}
+            )
+
+    async def _heartbeat(self, job_id: str, job_task: asyncio.Task) -> None:
+        """리스 연장 (리스를 잃으면 작업 취소)"""
+        interval = settings.job_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(ProcessingJob)
+                    .where(
+                        ProcessingJob.id == job_id,
+                        ProcessingJob.lease_owner == self.worker_id,
+                        ProcessingJob.status == "running",
+                    )
+                    .values(
+                        lease_expires_at=datetime.utcnow()
+                        + timedelta(seconds=settings.job_lease_seconds)
+                    )
+                )
+                await db.commit()
+            if result.rowcount != 1:
+                print(f"⚠️ 작업 리스 상실, 중단: {job_id}")
+                job_task.cancel()
+                return
+
+    async def _run(self, job_id: str) -> None:
+        """작업 실행 및 결과 기록"""
+        job_task = asyncio.create_task(process_recording(job_id, self.limits))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, job_task))
+        try:
+            await job_task
+            await self._finish(job_id)
+        except asyncio.CancelledError:
+            # 종료 또는 리스 상실: 상태는 stop() 또는 다른 워커가 처리
+            job_task.cancel()
+        except Exception as e:
+            print(f"❌ 작업 실패 ({job_id}): {e}")
+            await self._fail(job_id, e)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job_id, None)
+            self._slots.release()
+
+    async def _finish(self, job_id: str) -> None:
+        """작업 완료 처리"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ProcessingJob)
+                .where(ProcessingJob.id == job_id, ProcessingJob.lease_owner == self.worker_id)
+                .values(status="done", lease_owner=None, lease_expires_at=None, last_error=None)
+            )
+            await db.commit()
+
+    async def _fail(self, job_id: str, error: Exception) -> None:
+        """실패 처리 (재시도 예약 또는 최종 실패)"""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ProcessingJob, job_id)
+            if not job or job.lease_owner != self.worker_id:
+                return
+
+            job.last_error = str(error)
+            job.lease_owner = None
+            job.lease_expires_at = None
+
+            failed = job.attempts >= job.max_attempts
+            if failed:
+                job.status = "failed"
+                recording = await db.get(Recording, job.recording_id)
+                if recording:
+                    recording.status = "idle"
+                    recording.progress = 0
+                print(f"❌ 재시도 한도 초과, 작업 실패 처리: {job_id}")
+            else:
+                delay = _retry_delay(job.attempts)
+                job.status = "pending"
+                job.available_at = datetime.utcnow() + timedelta(seconds=delay)
+                print(f"🔁 {delay:.0f}초 후 재시도 ({job.attempts}/{job.max_attempts}): {job_id}")
+
+            await db.commit()
+
+        if failed:
+            progress_bus.publish(
+                job.recording_id, {"type": "status", "status": "idle", "progress": 0}
+            )
+
+
+# 싱글톤 인스턴스
+job_worker = JobWorkerPool()
@@ -0,0 +1,296 @@
+"""
+실시간 Notion 동기화
+
+강의가 시작되면 Notion 페이지를 만들고, 강의 중에 생기는 전사/구간 노트를 블록으로
+이어 붙인다. 블록 ID를 기억해 두고 바뀐 부분만 제자리에서 수정하므로, API 호출 수는
+문서 크기가 아니라 새로 생긴 내용의 양에 비례한다.
+
+페이지 구성:
+    🔴 상태 (종료 시 수정)
+    (최종 보고서: 종료 시 상태 바로 아래에 삽입)
+    ## 📚 강의 노트
+    (구간 노트: 순서대로 이어서 삽입)
+    ## 🗒️ 전사
+    (전사 문단: 마지막 문단을 2000자까지 제자리 수정, 넘치면 새 문단 추가)
+
+모든 Notion 호출은 세션별 백그라운드 태스크 하나에서 순서대로 실행되므로
+STT 중계는 Notion 응답을 기다리지 않는다. 페이지 생성이 실패하면 지수 백오프로
+다시 시도하고, 그동안의 작업은 버리지 않고 보류했다가 페이지가 생기면 순서대로 실행한다.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from app.services.live_summarizer import SummarySection
+from app.services.notion_client import MAX_CHILDREN_PER_REQUEST, MAX_TEXT_LENGTH, NotionService
+
+# 구간/보고서 블록 키
+FINAL_SECTION = "final"
+
+# 페이지 생성 재시도 대기 (초, 실패할 때마다 2배)
+PAGE_RETRY_BASE_DELAY = 2.0
+PAGE_RETRY_MAX_DELAY = 60.0
+
+
+def _shape(block: dict[str, Any]) -> str:
+    """제자리 수정 가능 여부를 가리는 블록 모양 (하위 블록이 있으면 타입 뒤에 표시)"""
+    if block[block["type"]].get("children"):
+        return f"{block['type']}+children"
+    return block["type"]
+
+
+def _text_block(block_type: str, text: str) -> dict[str, Any]:
+    """텍스트 하나짜리 블록"""
+    return {
+        "object": "block",
+        "type": block_type,
+        block_type: {"rich_text": [{"type": "text", "text": {"content": text}}]},
+    }
+
+
+class LiveNotionSync:
+    """강의 중 Notion 페이지에 전사/노트를 점진적으로 기록"""
+
+    def __init__(
+        self,
+        service: NotionService,
+        parent_page_id: str,
+        title: str,
+        flush_interval: float = 10.0,
+        on_page: Optional[Callable[[str], Awaitable[None]]] = None,
+    ):
+        """
+        Args:
+            service: 사용자 토큰의 NotionService
+            parent_page_id: 페이지를 만들 부모 페이지 ID
+            title: 페이지 제목
+            flush_interval: 전사를 모아서 기록하는 주기 (초)
+            on_page: 페이지가 만들어지면 URL을 받는 콜백
+        """
+        self.service = service
+        self.parent_page_id = parent_page_id
+        self.title = title
+        self.flush_interval = flush_interval
+        self.on_page = on_page
+
+        self.page_id: Optional[str] = None
+        self.page_url: Optional[str] = None
+        self._page: Optional[dict[str, Any]] = None  # 만들었지만 머리 블록을 아직 못 붙인 페이지
+        self._page_failures = 0
+        self._page_retry_at = 0.0
+        self._pending: list[Callable[[], Awaitable[Any]]] = []  # 페이지 생성 전까지 보류한 작업
+
+        self._ops: asyncio.Queue[Optional[Callable[[], Awaitable[Any]]]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._last_flush = time.monotonic()
+
+        self._transcript: list[str] = []  # 아직 기록하지 않은 전사
+        self._paragraph_id: Optional[str] = None  # 제자리 수정 중인 마지막 전사 문단
+        self._paragraph_text = ""
+
+        self._status_id: Optional[str] = None
+        self._notes_tail: Optional[str] = None  # 다음 구간 노트를 넣을 위치
+        # 키 → (앞 블록 ID, [(블록 ID, 모양)])
+        self._sections: dict[str, tuple[Optional[str], list[tuple[str, str]]]] = {}
+
+        # 통계
+        self.api_calls = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """페이지 생성 및 동기화 태스크 시작"""
+        self._task = asyncio.create_task(self._run())
+
+    def add_final(self, text: str) -> None:
+        """STT final 결과 추가 (flush_interval마다 모아서 기록)"""
+        if text.strip():
+            self._transcript.append(text.strip())
+
+    def add_section(self, section: SummarySection) -> None:
+        """구간 노트 추가 (같은 index를 다시 넣으면 제자리 수정)"""
+        key = f"section-{section.index}"
+        self._ops.put_nowait(lambda: self._put_section(key, section.content))
+
+    async def finish(self, summary: str = "") -> None:
+        """
+        남은 전사와 최종 보고서를 기록하고 종료
+
+        Args:
+            summary: 최종 보고서 (없으면 상태만 갱신)
+        """
+        if self._task is None:
+            return
+        if summary:
+            self._ops.put_nowait(lambda: self._put_section(FINAL_SECTION, summary))
+        self._ops.put_nowait(lambda: self._set_status("✅ 강의 종료"))
+        self._ops.put_nowait(None)
+        await self._task
+
+    async def cancel(self) -> None:
+        """동기화 중단 (연결이 끊긴 경우)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        """Notion 작업을 순서대로 실행하고, 주기적으로 전사를 기록"""
+        while True:
+            if self.page_id is None:
+                await self._ensure_page()
+            timeout = max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+            if self.page_id is None:
+                timeout = min(timeout, max(0.0, self._page_retry_at - time.monotonic()))
+            try:
+                op = await asyncio.wait_for(self._ops.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                op = self._flush_transcript
+            if op is None:
+                if self.page_id is None:
+                    # 종료 전 마지막으로 한 번 더 시도
+                    self._page_retry_at = 0.0
+                    await self._ensure_page()
+                if self.page_id is None:
+                    print(f"❌ Notion 실시간 페이지를 만들지 못해 작업 {len(self._pending)}개를 기록하지 못했습니다")
+                    return
+                await self._safely(self._flush_transcript)
+                return
+
+            if self.page_id is None:
+                # 페이지가 생길 때까지 보류 (전사는 _transcript에 계속 모임)
+                if op != self._flush_transcript:
+                    self._pending.append(op)
+                continue
+            await self._safely(op)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                await self._safely(self._flush_transcript)
+
+    async def _safely(self, op: Callable[[], Awaitable[Any]]) -> None:
+        """Notion 작업 실행 (실패해도 강의 중계는 계속)"""
+        try:
+            await op()
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Notion 실시간 동기화 실패: {e}")
+
+    async def _ensure_page(self) -> None:
+        """페이지 생성 시도 (실패하면 백오프 예약, 성공하면 보류한 작업 실행)"""
+        if time.monotonic() < self._page_retry_at:
+            return
+        try:
+            await self._create_page()
+        except Exception as e:
+            self.errors += 1
+            if self.page_id is not None:
+                # 페이지는 만들어졌고 on_page 콜백만 실패
+                print(f"⚠️ Notion 실시간 동기화 실패: {e}")
+                return
+            self._page_failures += 1
+            delay = min(PAGE_RETRY_MAX_DELAY, PAGE_RETRY_BASE_DELAY * 2 ** (self._page_failures - 1))
+            self._page_retry_at = time.monotonic() + delay
+            print(f"⚠️ Notion 실시간 페이지 생성 실패 ({delay:.0f}초 후 재시도): {e}")
+            return
+
+        pending, self._pending = self._pending, []
+        for op in pending:
+            await self._safely(op)
+
+    async def _create_page(self) -> None:
+        if self._page is None:
+            # 머리 블록 추가만 실패한 경우 페이지를 다시 만들지 않음
+            self._page = await self.service.create_page(
+                parent_page_id=self.parent_page_id, title=self.title, blocks=[]
+            )
+            self.api_calls += 1
+        page = self._page
+        created = await self.service.append_blocks(page["id"], [
+            _text_block("paragraph", "🔴 강의 중 (실시간 동기화)"),
+            _text_block("heading_2", "📚 강의 노트"),
+            _text_block("heading_2", "🗒️ 전사"),
+        ])
+        self.api_calls += 1
+        self.page_id, self.page_url = page["id"], page.get("url", "")
+        self._status_id = created[0]["id"]
+        self._notes_tail = created[1]["id"]
+        print(f"📝 Notion 실시간 페이지 생성: {self.page_url}")
+        if self.on_page is not None:
+            await self.on_page(self.page_url)
+
+    async def _set_status(self, text: str) -> None:
+        await self.service.update_block(self._status_id, _text_block("paragraph", text))
+        self.api_calls += 1
+
+    async def _flush_transcript(self) -> None:
+        """모인 전사를 마지막 문단에 이어 쓰거나 새 문단으로 추가"""
+        self._last_flush = time.monotonic()
+        if not self._transcript or self.page_id is None:
+            return
+        text = " ".join(self._transcript)
+        self._transcript = []
+
+        try:
+            if self._paragraph_id and len(self._paragraph_text) + 1 + len(text) <= MAX_TEXT_LENGTH:
+                merged = f"{self._paragraph_text} {text}"
+                await self.service.update_block(self._paragraph_id, _text_block("paragraph", merged))
+                self.api_calls += 1
+                self._paragraph_text = merged
+                return
+
+            pieces = [text[i:i + MAX_TEXT_LENGTH] for i in range(0, len(text), MAX_TEXT_LENGTH)]
+            created = await self.service.append_blocks(
+                self.page_id, [_text_block("paragraph", p) for p in pieces]
+            )
+            self.api_calls += 1
+            self._paragraph_id, self._paragraph_text = created[-1]["id"], pieces[-1]
+        except Exception:
+            # 다음 주기에 다시 시도
+            self._transcript.insert(0, text)
+            raise
+
+    async def _put_section(self, key: str, content: str) -> None:
+        """
+        노트/보고서 블록 기록 (이미 있으면 모양이 같은 앞부분은 제자리 수정, 나머지만 교체)
+
+        하위 블록(중첩 목록)은 수정 API로 바꿀 수 없으므로 그런 블록부터는 새로 만든다.
+        """
+        blocks = self.service.summary_to_blocks(content)
+        default_anchor = self._status_id if key == FINAL_SECTION else self._notes_tail
+        anchor, old = self._sections.get(key, (default_anchor, []))
+
+        kept: list[tuple[str, str]] = []
+        after = anchor
+        for (block_id, shape), block in zip(old, blocks):
+            if shape != _shape(block) or shape.endswith("+children"):
+                break
+            await self.service.update_block(block_id, block)
+            self.api_calls += 1
+            kept.append((block_id, shape))
+            after = block_id
+
+        for block_id, _ in old[len(kept):]:
+            await self.service.delete_block(block_id)
+            self.api_calls += 1
+
+        rest = blocks[len(kept):]
+        if rest:
+            created = await self.service.append_blocks(self.page_id, rest, after=after)
+            self.api_calls += math.ceil(len(rest) / MAX_CHILDREN_PER_REQUEST)
+            kept.extend((c["id"], _shape(b)) for c, b in zip(created, rest))
+
+        self._sections[key] = (anchor, kept)
+        if key != FINAL_SECTION and kept and (not old or self._notes_tail == old[-1][0]):
+            # 새 구간(또는 마지막 구간 수정)이면 다음 구간은 그 뒤에
+            self._notes_tail = kept[-1][0]
+
+    def stats(self) -> dict[str, Any]:
+        """동기화 통계"""
+        return {
+            "page_url": self.page_url,
+            "api_calls": self.api_calls,
+            "errors": self.errors,
+            "page_failures": self._page_failures,
+            "pending": len(self._pending),
+            "sections": len(self._sections),
+        }
@@ -0,0 +1,31 @@
+"""
+실시간 STT 세션 레지스트리
+
+진행 중인 /ws/stt 세션별 지표(큐 깊이, 삭제 수 등)를 /api/metrics에서 볼 수 있게 한다.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+
+class LiveSessionRegistry:
+    """세션 ID → 지표 조회 함수"""
+
+    def __init__(self):
+        self._sessions: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def register(self, session_id: str, stats: Callable[[], dict[str, Any]]) -> None:
+        """세션 등록"""
+        self._sessions[session_id] = stats
+
+    def unregister(self, session_id: str) -> None:
+        """세션 해제"""
+        self._sessions.pop(session_id, None)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """모든 세션의 현재 지표"""
+        return {session_id: stats() for session_id, stats in list(self._sessions.items())}
+
+
+# 싱글톤 인스턴스
+live_sessions = LiveSessionRegistry()
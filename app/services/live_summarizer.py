@@ -0,0 +1,224 @@
+"""
+실시간 강의 점진 요약
+
+STT final 결과를 모아 두었다가 토큰 수나 시간 기준을 넘으면 새로 쌓인 구간만
+LLM으로 요약한다. 구간 노트가 fanout개 쌓이면 하나의 챕터 노트로 접어서
+(계층 요약) 최종 보고서 입력이 강의 길이에 비례해 커지지 않게 한다.
+강의가 끝나면 챕터/구간 노트만으로 보고서를 만들므로 거의 바로 끝난다.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from app.services.llm_scheduler import PRIORITY_LIVE, llm_priority
+from app.services.llm_summarizer import LectureSummarizer, estimate_tokens
+
+
+@dataclass
+class SummarySection:
+    """구간 노트"""
+
+    index: int
+    start_at: int  # ms
+    end_at: int  # ms
+    content: str
+
+
+class IncrementalSummarizer:
+    """STT final 결과 → 구간 노트 → 챕터 노트 → 최종 보고서"""
+
+    def __init__(
+        self,
+        summarizer: LectureSummarizer,
+        on_section: Callable[[SummarySection], Awaitable[None]],
+        min_tokens: int = 1200,
+        interval_seconds: float = 180.0,
+        min_interval_tokens: int = 30,
+        fold_fanout: int = 6,
+        retry_base_delay: float = 5.0,
+        retry_max_delay: float = 120.0,
+    ):
+        """
+        Args:
+            summarizer: LLM 요약 서비스
+            on_section: 새 구간 노트가 나올 때 호출 (클라이언트 전송 등)
+            min_tokens: 이만큼 쌓이면 바로 요약
+            interval_seconds: 마지막 요약 후 이 시간이 지나면 요약
+            min_interval_tokens: 시간 기준으로 요약할 때 필요한 최소 토큰 수
+            fold_fanout: 구간 노트 몇 개를 하나의 챕터로 접을지
+            retry_base_delay: 구간 요약 실패 후 재시도까지 기본 대기 (초, 연속 실패마다 2배)
+            retry_max_delay: 재시도 대기 상한 (초)
+        """
+        self.summarizer = summarizer
+        self.on_section = on_section
+        self.min_tokens = min_tokens
+        self.interval_seconds = interval_seconds
+        self.min_interval_tokens = min_interval_tokens
+        self.fold_fanout = fold_fanout
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self.sections: list[SummarySection] = []
+        self.chapters: list[str] = []
+        self._unfolded: list[str] = []
+
+        self._buffer: list[str] = []
+        self._buffer_tokens = 0
+        self._buffer_start: Optional[int] = None
+        self._buffer_end = 0
+        self._last_flush = time.monotonic()
+        self._failures = 0  # 연속 실패 횟수
+        self._retry_at = 0.0  # 이 시각 전에는 재시도하지 않음 (백오프)
+
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self.llm_calls = 0
+
+    def start(self) -> None:
+        """백그라운드 요약 루프 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def add_final(self, text: str, start_at: int = 0, duration: int = 0) -> None:
+        """
+        STT final 결과 추가
+
+        Args:
+            text: 확정된 전사 텍스트
+            start_at: 시작 시각 (ms)
+            duration: 길이 (ms)
+        """
+        text = text.strip()
+        if not text:
+            return
+        if self._buffer_start is None:
+            self._buffer_start = start_at
+        self._buffer_end = max(self._buffer_end, start_at + duration)
+        self._buffer.append(text)
+        self._buffer_tokens += estimate_tokens(text)
+        if self._buffer_tokens >= self.min_tokens:
+            self._wakeup.set()
+
+    def _should_flush(self) -> bool:
+        if not self._buffer:
+            return False
+        if self._closing:
+            return True
+        if time.monotonic() < self._retry_at:
+            # 직전 실패 후 백오프 중 (LLM 장애 시 매 틱마다 호출하지 않도록)
+            return False
+        if self._buffer_tokens >= self.min_tokens:
+            return True
+        elapsed = time.monotonic() - self._last_flush
+        return elapsed >= self.interval_seconds and self._buffer_tokens >= self.min_interval_tokens
+
+    async def _run(self) -> None:
+        """트리거를 기다렸다가 구간을 순서대로 하나씩 요약"""
+        # 강의 중인 사용자가 기다리므로 업로드 처리보다 먼저 LLM 호출
+        llm_priority.set(PRIORITY_LIVE)
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._should_flush():
+                if not await self._flush():
+                    break
+
+            if self._closing:
+                return
+
+    async def _flush(self) -> bool:
+        """버퍼를 구간 노트로 요약 (실패 시 버퍼를 되돌리고 False)"""
+        text = " ".join(self._buffer)
+        tokens = self._buffer_tokens
+        start_at, end_at = self._buffer_start or 0, self._buffer_end
+        self._buffer, self._buffer_tokens, self._buffer_start = [], 0, None
+        self._last_flush = time.monotonic()
+
+        context = self.sections[-1].content if self.sections else ""
+        try:
+            content = await self.summarizer.summarize_window_async(text, context=context)
+            self.llm_calls += 1
+        except Exception as e:
+            self._failures += 1
+            delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+            print(f"❌ 구간 요약 실패 ({delay:.0f}초 후 재시도): {e}")
+            self._buffer.insert(0, text)
+            self._buffer_tokens += tokens
+            self._buffer_start = start_at
+            return False
+
+        self._failures = 0
+        self._retry_at = 0.0
+
+        section = SummarySection(
+            index=len(self.sections), start_at=start_at, end_at=end_at, content=content
+        )
+        self.sections.append(section)
+        self._unfolded.append(content)
+        await self.on_section(section)
+
+        if len(self._unfolded) >= self.fold_fanout:
+            await self._fold()
+        return True
+
+    async def _fold(self) -> None:
+        """쌓인 구간 노트를 챕터 노트 하나로 접음"""
+        try:
+            chapter = await self.summarizer.merge_notes_async(self._unfolded)
+            self.llm_calls += 1
+        except Exception as e:
+            print(f"⚠️ 구간 노트 병합 실패 (나중에 다시 시도): {e}")
+            return
+        self.chapters.append(chapter)
+        self._unfolded = []
+
+    async def finish(self) -> str:
+        """
+        남은 버퍼를 요약하고 최종 보고서 작성
+
+        Returns:
+            보고서 형식 요약 (내용이 없으면 빈 문자열)
+        """
+        llm_priority.set(PRIORITY_LIVE)
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+        if self._buffer:
+            # 루프에서 실패한 마지막 구간 한 번 더 시도
+            await self._flush()
+
+        notes = self.chapters + self._unfolded
+        if self._buffer:
+            # 끝내 요약하지 못한 구간은 버리지 않고 원문 그대로 보고서 입력에 포함
+            notes.append(f"(요약되지 않은 마지막 구간 전사)\n{' '.join(self._buffer)}")
+        if not notes:
+            return ""
+        report = await self.summarizer.reduce_notes_async(notes)
+        self.llm_calls += 1
+        return report
+
+    async def cancel(self) -> None:
+        """요약 루프 중단 (연결이 끊긴 경우)"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        """세션 요약 지표"""
+        return {
+            "sections": len(self.sections),
+            "chapters": len(self.chapters),
+            "buffered_tokens": self._buffer_tokens,
+            "failures": self._failures,
+            "llm_calls": self.llm_calls,
+        }
@@ -0,0 +1,279 @@
+"""
+LLM 호출 스케줄러 (프로세스 공용)
+
+OpenRouter의 분당 요청/토큰 한도 안에서 모든 요약 호출을 한 곳에서 배정한다.
+- 토큰 버킷 두 개 (RPM, TPM)로 한도를 넘기기 전에 기다림
+- 우선순위 대기열: 실시간 세션(PRIORITY_LIVE)이 업로드 처리(PRIORITY_BATCH)보다 먼저
+- 429/5xx/연결 오류는 Retry-After를 따르거나 지터를 섞은 지수 백오프로 재시도하며,
+  429를 받으면 모든 호출이 함께 쉰다
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, Optional, TypeVar
+
+import openai
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# 우선순위 (작을수록 먼저)
+PRIORITY_LIVE = 0
+PRIORITY_BATCH = 1
+
+# 현재 작업의 LLM 우선순위 (실시간 요약 태스크에서 PRIORITY_LIVE로 설정)
+llm_priority: ContextVar[int] = ContextVar("llm_priority", default=PRIORITY_BATCH)
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷 (한도가 0 이하이면 제한 없음)"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: 분당 채워지는 양
+            capacity: 한 번에 몰아 쓸 수 있는 최대량 (기본값은 per_minute)
+        """
+        self.rate = float(per_minute) / 60.0
+        self.capacity = float(per_minute if capacity is None else capacity)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (초)"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        # 한 번에 버킷보다 큰 요청은 가득 찼을 때 허용 (영원히 기다리지 않도록)
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float, now: float) -> None:
+        if self.rate <= 0:
+            return
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """amount를 꺼낼 수 있을 때까지 기다렸다가 꺼냄"""
+        while True:
+            now = time.monotonic()
+            wait = self.wait_time(amount, now)
+            if wait <= 0:
+                self.take(amount, now)
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """버킷을 비워 seconds 동안 아무도 꺼내지 못하게 함 (429 Retry-After 대응)"""
+        if self.rate <= 0:
+            return
+        self._refill(time.monotonic())
+        self.level = min(self.level, -seconds * self.rate)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """응답의 Retry-After 헤더 (초), 없으면 None"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """일시적인 LLM 오류인지 확인 (한도 초과, 서버 오류, 연결 오류)"""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS
+    return False
+
+
+class LLMScheduler:
+    """RPM/TPM 한도와 우선순위를 지키는 LLM 호출 배정기"""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_in_flight: int,
+        max_attempts: int = 6,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 60.0,
+    ):
+        """
+        Args:
+            requests_per_minute: 분당 요청 한도 (0 이하이면 제한 없음)
+            tokens_per_minute: 분당 토큰 한도 (0 이하이면 제한 없음)
+            max_in_flight: 동시에 진행 중인 호출 수 한도
+            max_attempts: 호출당 최대 시도 횟수
+            retry_base_delay: 재시도 백오프 기본 지연 (초)
+            retry_max_delay: 재시도 백오프 최대 지연 (초)
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max_in_flight
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        self._cond = asyncio.Condition()
+        self._waiters: list[tuple[int, int]] = []  # (priority, 순번) 힙
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0  # 429 이후 전체 대기 종료 시각
+
+        # 지표
+        self._completed = 0
+        self._failed = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._granted = 0
+
+    def _ready_in(self, tokens: int) -> float:
+        """대기열 맨 앞 호출이 출발할 수 있을 때까지 남은 시간 (초)"""
+        now = time.monotonic()
+        return max(
+            self._paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(tokens, now),
+        )
+
+    async def _acquire(self, tokens: int, priority: int) -> None:
+        """우선순위 순서대로 한도가 허락할 때까지 대기 후 슬롯 확보"""
+        entry = (priority, next(self._seq))
+        enqueued = time.monotonic()
+        async with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry and self._in_flight < self.max_in_flight:
+                        timeout = self._ready_in(tokens)
+                        if timeout <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+
+            heapq.heappop(self._waiters)
+            now = time.monotonic()
+            self.requests.take(1, now)
+            self.tokens.take(tokens, now)
+            self._in_flight += 1
+            self._cond.notify_all()
+
+        waited = time.monotonic() - enqueued
+        self._granted += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    async def _release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _retry_delay(self, attempt: int, error: BaseException) -> float:
+        """Retry-After가 있으면 따르고, 없으면 full jitter 지수 백오프"""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.retry_base_delay)
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1))
+        return random.uniform(self.retry_base_delay / 2, ceiling)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        tokens: int,
+        priority: Optional[int] = None,
+    ) -> T:
+        """
+        한도 안에서 LLM 호출 실행 (일시적 오류는 재시도)
+
+        Args:
+            call: LLM 호출 (재시도마다 다시 호출됨)
+            tokens: 예상 토큰 수 (프롬프트 + 응답)
+            priority: 우선순위 (기본값은 현재 작업의 llm_priority)
+
+        Returns:
+            call의 결과
+
+        Raises:
+            Exception: 재시도할 수 없는 오류이거나 시도 횟수를 모두 쓴 경우
+        """
+        if priority is None:
+            priority = llm_priority.get()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await self._acquire(tokens, priority)
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_attempts:
+                    self._failed += 1
+                    raise
+                delay = self._retry_delay(attempt, e)
+                self._retries += 1
+                if isinstance(e, openai.RateLimitError):
+                    # 한도 초과는 모든 호출이 함께 쉬어야 연속 429를 피함
+                    self._rate_limited += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                print(f"⏳ LLM 호출 재시도 {attempt}/{self.max_attempts} ({delay:.1f}초 후): {e}")
+            else:
+                self._completed += 1
+                return result
+            finally:
+                await self._release()
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        """스케줄러 지표 (대기열 길이, 대기 시간, 진행 중 호출 수 등)"""
+        return {
+            "queued": len(self._waiters),
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "retries": self._retries,
+            "rate_limited": self._rate_limited,
+            "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "queue_wait_avg": round(self._wait_total / self._granted, 3) if self._granted else 0.0,
+            "queue_wait_max": round(self._wait_max, 3),
+        }
+
+
+# 싱글톤 인스턴스
+llm_scheduler = LLMScheduler(
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    max_in_flight=settings.llm_max_in_flight,
+    max_attempts=settings.llm_max_attempts,
+    retry_base_delay=settings.llm_retry_base_delay,
+    retry_max_delay=settings.llm_retry_max_delay,
+)
@@ -1,41 +1,20 @@
 """
 LLM 기반 강의 내용 요약 서비스
 """
+import asyncio
+import hashlib
+import math
+import re
+from collections.abc import Callable
+from typing import Optional
+
+import httpx
 from langchain_openai import ChatOpenAI
 from app.core.config import settings
+from app.services.llm_scheduler import llm_scheduler
 
-
-class LectureSummarizer:
-    """강의 내용을 요약하는 LLM 서비스"""
-
-    def __init__(self):
-        """OpenRouter를 통한 LLM 초기화"""
-        self.llm = ChatOpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=settings.openrouter_api_key,
-            model="arcee-ai/trinity-large-preview:free",
-            temperature=0.3,  # 일관성 있는 요약을 위해 낮은 temperature
-        )
-
-    def summarize(self, transcript: str) -> str:
-        """
-        강의 내용을 보고서 형식으로 요약
-
-        Args:
-            transcript: STT로 변환된 강의 텍스트
-
-        Returns:
-            보고서 형식으로 정리된 요약 텍스트
-        """
-        prompt = f"""
-당신은 대학 강의를 정리하는 AI 비서입니다.
-
-다음 강의 내용을 보고서 형식으로 정리해주세요:
-
-{transcript}
-
-다음 형식으로 작성해주세요:
-
+# 최종 보고서 형식 (전체 요약과 구간 노트 → 보고서 병합에 공통 사용)
+REPORT_FORMAT = """
 # 강의 요약 보고서
 
 ## 📝 강의 개요
@@ -61,52 +40,385 @@ class LectureSummarizer:
 - 시험이나 과제에 나올 만한 내용
 """
 
-        response = self.llm.invoke(prompt)
-        return response.content
+# 전사 전체 → 보고서 (PROMPT_VERSION과 함께 관리)
+REPORT_PROMPT = """
+당신은 대학 강의를 정리하는 AI 비서입니다.
+
+다음 강의 내용을 보고서 형식으로 정리해주세요:
+
+{transcript}
+
+다음 형식으로 작성해주세요:
+""" + REPORT_FORMAT
+
+# 강의 일부 구간 → 구간 노트
+WINDOW_PROMPT = """
+당신은 대학 강의를 실시간으로 정리하는 AI 비서입니다.
+
+직전까지의 정리 내용 (맥락 참고용, 다시 쓰지 마세요):
+{context}
+
+다음은 이어지는 강의 내용입니다:
+
+{transcript}
+
+이 부분만 다음 형식으로 간결하게 정리해주세요:
+
+### (이 구간의 주제)
+- 핵심 내용
+- 핵심 내용
+"""
+
+# 여러 구간 노트 → 하나의 노트
+MERGE_PROMPT = """
+당신은 대학 강의를 정리하는 AI 비서입니다.
+
+다음은 강의의 연속된 구간별 정리 노트입니다:
+
+{notes}
+
+중복을 없애고 하나의 노트로 합쳐주세요. 형식은 유지합니다:
+
+### (주제)
+- 핵심 내용
+"""
+
+# 구간 노트 → 최종 보고서
+REDUCE_PROMPT = """
+당신은 대학 강의를 정리하는 AI 비서입니다.
+
+다음은 강의 전체를 시간 순서대로 정리한 구간별 노트입니다:
+
+{notes}
+
+이 노트를 바탕으로 강의 전체를 보고서 형식으로 정리해주세요.
+
+다음 형식으로 작성해주세요:
+""" + REPORT_FORMAT
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (토크나이저 없이 빠르게)
+
+    한국어는 대략 1.5자당 1토큰으로 본다.
+    """
+    return math.ceil(len(text) / 1.5)
+
+
+# 문장 끝 또는 줄바꿈 (청크는 문장 경계에서만 자름)
+_SENTENCE_END = re.compile(r"(?<=[.?!。])\s+|\s*\n\s*")
+
+# 내용 기반 청크 경계: 예산의 이 비율을 넘긴 뒤, 해시가 조건을 만족하는 문장에서 자름
+CHUNK_MIN_FILL = 0.75
+CHUNK_BOUNDARY_MODULUS = 4
+
+
+def _is_boundary(sentence: str) -> bool:
+    """이 문장 뒤에서 청크를 자를지 (문장 내용만으로 결정되므로 위치가 바뀌어도 같음)"""
+    digest = hashlib.blake2b(sentence.encode(), digest_size=2).digest()
+    return digest[0] % CHUNK_BOUNDARY_MODULUS == 0
+
+
+def _split_long(text: str, max_tokens: int) -> list[str]:
+    """예산보다 긴 한 문장을 공백 → 글자 수 순으로 나눔"""
+    words = text.split()
+    if len(words) > 1:
+        return chunk_transcript(words, max_tokens)
+    max_chars = int(max_tokens * 1.5)
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def split_sentences(text: str) -> list[str]:
+    """전사 텍스트를 문장(또는 줄) 단위로 나눔 (빈 문장 제외)"""
+    return [s for s in _SENTENCE_END.split(text.strip()) if s]
+
+
+def chunk_transcript(texts: list[str], max_tokens: int) -> list[str]:
+    """
+    발화/문장 경계를 지키며 토큰 예산 단위로 묶기
+
+    경계는 내용으로 정한다. 예산의 3/4을 넘긴 뒤 해시 조건을 만족하는 문장에서 자르고,
+    예산에 닿으면 강제로 자른다. 중간 문장을 고쳐도 뒤쪽 청크 경계가 곧 다시 맞춰지므로
+    바뀌지 않은 청크는 이전 요약을 재사용할 수 있다.
+
+    Args:
+        texts: 시간 순서의 발화 텍스트
+        max_tokens: 청크당 최대 토큰 수 (추정치)
+
+    Returns:
+        청크 텍스트 목록 (문장은 공백으로 이어 붙임)
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        for sentence in split_sentences(text):
+            tokens = estimate_tokens(sentence) + 1
+            if tokens > max_tokens:
+                # 한 문장이 예산보다 길면 단독으로 나눔
+                if current:
+                    chunks.append(" ".join(current))
+                    current, current_tokens = [], 0
+                chunks.extend(_split_long(sentence, max_tokens))
+                continue
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(sentence)
+            current_tokens += tokens
+            if current_tokens >= max_tokens * CHUNK_MIN_FILL and _is_boundary(sentence):
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+async def _passthrough(note: str) -> str:
+    """병합할 짝이 없는 노트는 그대로 다음 단계로"""
+    return note
+
+
+class LectureSummarizer:
+    """강의 내용을 요약하는 LLM 서비스 (프로세스 공용 인스턴스: lecture_summarizer)"""
+
+    # 프롬프트를 바꾸면 올려야 함 (요약 캐시 키에 포함)
+    PROMPT_VERSION = "report-v1"
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+    ):
+        """
+        Args:
+            model: OpenRouter 모델 이름 (기본값은 설정 따름)
+            temperature: 샘플링 온도 (기본값은 설정 따름)
+        """
+        self.model = model or settings.llm_model
+        self.temperature = settings.llm_temperature if temperature is None else temperature
+        self._llm: Optional[ChatOpenAI] = None
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def llm(self) -> ChatOpenAI:
+        """OpenRouter keep-alive 연결을 재사용하는 LLM 클라이언트 (처음 사용할 때 생성)"""
+        if self._llm is None or self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.llm_timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.llm_max_connections,
+                    max_keepalive_connections=settings.llm_max_connections,
+                    keepalive_expiry=300,
+                ),
+            )
+            self._llm = ChatOpenAI(
+                base_url=settings.openrouter_base_url,
+                api_key=settings.openrouter_api_key,
+                model=self.model,
+                temperature=self.temperature,
+                http_async_client=self._http,
+                max_retries=0,  # 재시도는 llm_scheduler가 한도를 보며 담당
+            )
+        return self._llm
 
-    async def summarize_async(self, transcript: str) -> str:
+    async def _complete(
+        self,
+        prompt: str,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        LLM 호출 (on_delta가 있으면 토큰을 스트리밍으로 받아 생성되는 대로 전달)
+
+        호출은 llm_scheduler를 거쳐 요청/토큰 한도 안에서 실행되고 일시적 오류는 재시도된다.
+
+        Args:
+            prompt: 프롬프트
+            on_delta: 새로 생성된 텍스트 조각을 받는 콜백
+
+        Returns:
+            전체 응답 텍스트
+        """
+        tokens = estimate_tokens(prompt) + settings.llm_output_tokens_estimate
+
+        async def invoke() -> str:
+            response = await self.llm.ainvoke(prompt)
+            return response.content
+
+        async def stream() -> str:
+            parts: list[str] = []
+            try:
+                async for chunk in self.llm.astream(prompt):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        on_delta(chunk.content)
+            except Exception as e:
+                if parts:
+                    # 이미 전달한 조각이 있으면 처음부터 다시 보낼 수 없으므로 재시도하지 않음
+                    raise RuntimeError(f"LLM 스트림이 중간에 끊겼습니다: {e}") from e
+                raise
+            return "".join(parts)
+
+        return await llm_scheduler.run(invoke if on_delta is None else stream, tokens)
+
+    async def summarize_async(
+        self,
+        transcript: str,
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> str:
         """
         비동기 방식으로 강의 내용 요약
 
         Args:
             transcript: STT로 변환된 강의 텍스트
+            on_delta: 보고서가 생성되는 대로 텍스트 조각을 받는 콜백 (선택)
 
         Returns:
             보고서 형식으로 정리된 요약 텍스트
         """
-        prompt = f"""
-당신은 대학 강의를 정리하는 AI 비서입니다.
+        return await self._complete(REPORT_PROMPT.format(transcript=transcript), on_delta)
 
-다음 강의 내용을 보고서 형식으로 정리해주세요:
+    def chunk_key(self, chunk: str) -> str:
+        """청크 요약 재사용 키 (프롬프트 버전/모델이 바뀌면 달라짐)"""
+        payload = f"{self.PROMPT_VERSION}\0{self.model}\0{chunk}"
+        return hashlib.sha256(payload.encode()).hexdigest()
 
-{transcript}
+    async def summarize_window_async(self, transcript: str, context: str = "") -> str:
+        """
+        강의 일부 구간을 구간 노트로 요약 (실시간 점진 요약용)
 
-다음 형식으로 작성해주세요:
+        Args:
+            transcript: 새로 들어온 구간의 STT 텍스트
+            context: 직전 구간 노트 (맥락 유지용)
 
-# 강의 요약 보고서
+        Returns:
+            구간 노트 (### 소제목 + 목록)
+        """
+        prompt = WINDOW_PROMPT.format(context=context or "(없음)", transcript=transcript)
+        return await self._complete(prompt)
 
-## 📝 강의 개요
-(3-5문장으로 강의 전체 내용 요약)
+    async def merge_notes_async(self, notes: list[str]) -> str:
+        """
+        연속된 구간 노트를 하나의 노트로 병합
 
-## 🔑 핵심 키워드
-- 키워드1
-- 키워드2
-- 키워드3
-- ...
+        Args:
+            notes: 시간 순서의 구간 노트
 
-## 📚 주요 내용
-### 1. 주제1
-- 세부 내용
-- 세부 내용
+        Returns:
+            병합된 노트
+        """
+        prompt = MERGE_PROMPT.format(notes="\n\n".join(notes))
+        return await self._complete(prompt)
 
-### 2. 주제2
-- 세부 내용
-- 세부 내용
+    async def reduce_notes_async(
+        self,
+        notes: list[str],
+        on_delta: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        구간 노트들로 최종 보고서 작성
+
+        Args:
+            notes: 시간 순서의 구간 노트
+            on_delta: 보고서가 생성되는 대로 텍스트 조각을 받는 콜백 (선택)
+
+        Returns:
+            보고서 형식으로 정리된 요약 텍스트
+        """
+        prompt = REDUCE_PROMPT.format(notes="\n\n".join(notes))
+        return await self._complete(prompt, on_delta)
+
+    async def summarize_chunked_async(
+        self,
+        texts: list[str],
+        chunk_tokens: int,
+        max_concurrency: int = 4,
+        reduce_max_tokens: int = 12000,
+        on_delta: Optional[Callable[[str], None]] = None,
+        chunk_notes: Optional[dict[str, str]] = None,
+    ) -> str:
+        """
+        긴 강의를 map-reduce로 요약
+
+        발화 경계로 나눈 청크를 동시에 구간 노트로 요약(map)한 뒤, 노트를 모아 최종
+        보고서로 합친다(reduce). 노트가 reduce 예산을 넘으면 먼저 묶음별로 병합한다.
+        전체가 한 청크에 들어가면 summarize_async와 같다.
+
+        chunk_notes를 넘기면 해시가 같은 청크는 이전 노트를 재사용하고(전사 일부만 고친
+        경우 바뀐 청크만 다시 요약), 끝나면 이번 청크들의 노트로 채워 돌려준다.
+
+        Args:
+            texts: 시간 순서의 발화 텍스트
+            chunk_tokens: 청크당 최대 토큰 수
+            max_concurrency: 동시 LLM 호출 수
+            reduce_max_tokens: reduce 프롬프트에 넣을 노트의 최대 토큰 수
+            on_delta: 최종 보고서가 생성되는 대로 텍스트 조각을 받는 콜백 (선택)
+            chunk_notes: 청크 해시 → 구간 노트 (선택, 제자리에서 갱신됨)
+
+        Returns:
+            보고서 형식으로 정리된 요약 텍스트
+        """
+        previous = dict(chunk_notes or {})
+        if chunk_notes is not None:
+            chunk_notes.clear()
+
+        chunks = chunk_transcript(texts, chunk_tokens)
+        if len(chunks) <= 1:
+            return await self.summarize_async(chunks[0] if chunks else "", on_delta)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+
+        async def gather(coros) -> list[str]:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(limited(c)) for c in coros]
+            return [t.result() for t in tasks]
+
+        keys = [self.chunk_key(chunk) for chunk in chunks]
+        missing = [i for i, key in enumerate(keys) if key not in previous]
+        print(
+            f"🧩 분할 요약: {len(chunks)}개 청크 중 {len(missing)}개 요약 "
+            f"(동시 {max_concurrency})"
+        )
+        fresh = await gather(self.summarize_window_async(chunks[i]) for i in missing)
+        computed = dict(zip((keys[i] for i in missing), fresh))
+        notes = [previous[key] if key in previous else computed[key] for key in keys]
+        if chunk_notes is not None:
+            chunk_notes.update(zip(keys, notes))
+
+        # 노트가 너무 길면 인접 노트끼리 병합 (한 단계마다 노트 수가 줄어듦)
+        while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > reduce_max_tokens:
+            groups: list[list[str]] = []
+            for note in notes:
+                tokens = estimate_tokens(note)
+                if groups and estimate_tokens("\n\n".join(groups[-1])) + tokens <= reduce_max_tokens:
+                    groups[-1].append(note)
+                else:
+                    groups.append([note])
+            if len(groups) == len(notes):
+                # 노트 하나하나가 예산 수준이면 두 개씩 강제로 묶음
+                groups = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+            notes = await gather(
+                self.merge_notes_async(g) if len(g) > 1 else _passthrough(g[0])
+                for g in groups
+            )
+
+        async with semaphore:
+            return await self.reduce_notes_async(notes, on_delta)
+
+    async def close(self) -> None:
+        """공용 HTTP 클라이언트 정리"""
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._llm = None
 
-## 💡 중요 포인트
-- 꼭 기억해야 할 핵심 개념
-- 시험이나 과제에 나올 만한 내용
-"""
 
-        response = await self.llm.ainvoke(prompt)
-        return response.content
+# 싱글톤 인스턴스
+lecture_summarizer = LectureSummarizer()
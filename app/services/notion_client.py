@@ -1,22 +1,136 @@
-"""Notion API 클라이언트"""
+"""Notion API 클라이언트 (비동기)"""
+import asyncio
+import copy
+import random
 import re
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from typing import Optional, List, Dict, Any
-from notion_client import Client
+
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError
 from app.core.config import settings
+from app.services.llm_scheduler import TokenBucket
+from app.services.notion_markdown import markdown_to_blocks
+
+# Notion API 한도
+MAX_CHILDREN_PER_REQUEST = 100  # 요청 하나에 넣을 수 있는 블록 수
+MAX_TEXT_LENGTH = 2000  # rich_text 항목 하나의 최대 글자 수
+
+# 재시도할 응답 상태 (요청이 반영되지 않은 경우만, 타임아웃은 중복 생성 위험으로 제외)
+RETRYABLE_STATUS = (409, 429, 502, 503, 504)
+
+
+def _split_rich_text(rich_text: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """2000자를 넘는 text 항목을 서식을 유지한 채 여러 항목으로 나눔"""
+    result = []
+    for item in rich_text:
+        content = item.get("text", {}).get("content", "")
+        if item.get("type") != "text" or len(content) <= MAX_TEXT_LENGTH:
+            result.append(item)
+            continue
+        for start in range(0, len(content), MAX_TEXT_LENGTH):
+            piece = copy.deepcopy(item)
+            piece["text"]["content"] = content[start:start + MAX_TEXT_LENGTH]
+            if "plain_text" in piece:
+                piece["plain_text"] = piece["text"]["content"]
+            result.append(piece)
+    return result
+
+
+def fit_blocks(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    블록의 rich_text (하위 블록 포함)를 Notion 글자 수 한도에 맞게 나눔
+
+    Args:
+        blocks: Notion 블록 리스트
+
+    Returns:
+        한도에 맞춘 블록 리스트 (원본은 바뀌지 않음)
+    """
+    fitted = []
+    for block in blocks:
+        body = block.get(block.get("type", ""))
+        if isinstance(body, dict) and ("rich_text" in body or "children" in body):
+            block = {**block, block["type"]: dict(body)}
+            body = block[block["type"]]
+            if "rich_text" in body:
+                body["rich_text"] = _split_rich_text(body["rich_text"])
+            if "children" in body:
+                body["children"] = fit_blocks(body["children"])
+        fitted.append(block)
+    return fitted
 
 
 class NotionService:
     """Notion API 서비스"""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        http: Optional[httpx.AsyncClient] = None,
+        limiter: Optional[TokenBucket] = None,
+    ):
         """
         Notion 클라이언트 초기화
 
         Args:
             token: Notion Integration Token (없으면 환경변수 사용)
+            http: 사용할 HTTP 클라이언트 (없으면 새로 생성, 보통 notion_clients.get() 사용)
+            limiter: 토큰(integration)별 요청 속도 제한 (Notion은 초당 약 3회)
         """
         auth = token or settings.notion_api_key
-        self.client = Client(auth=auth)
+        self.client = AsyncClient(auth=auth, client=http)
+        self.limiter = limiter
+
+    async def _request(self, call: Callable[..., Awaitable[Any]], **kwargs: Any) -> Any:
+        """
+        Notion API 호출 (rate limit/일시적 서버 오류는 Retry-After 또는 지수 백오프로 재시도)
+
+        Args:
+            call: Notion SDK 엔드포인트 메서드 (예: self.client.pages.create)
+            **kwargs: 엔드포인트 인자
+
+        Returns:
+            API 응답
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            try:
+                return await call(**kwargs)
+            except HTTPResponseError as e:
+                if e.status not in RETRYABLE_STATUS or attempt >= settings.notion_max_attempts:
+                    raise
+                retry_after = e.headers.get("retry-after")
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    ceiling = min(
+                        settings.notion_retry_max_delay,
+                        settings.notion_retry_base_delay * 2 ** (attempt - 1),
+                    )
+                    delay = random.uniform(settings.notion_retry_base_delay / 2, ceiling)
+                if e.status == 429 and self.limiter is not None:
+                    # 같은 토큰을 쓰는 다른 호출도 함께 쉼
+                    self.limiter.pause(delay)
+                print(f"⏳ Notion API 재시도 {attempt}/{settings.notion_max_attempts} ({delay:.1f}초 후): {e}")
+                await asyncio.sleep(delay)
+
+    async def verify_token(self) -> Dict[str, Any]:
+        """
+        토큰 유효성 확인 (봇 사용자 조회)
+
+        Returns:
+            봇 사용자 정보
+
+        Raises:
+            notion_client.APIResponseError: 토큰이 유효하지 않은 경우
+        """
+        return await self.client.users.me()
 
     def extract_page_id(self, url: str) -> str:
         """
@@ -44,7 +158,7 @@ class NotionService:
         # 하이픈 제거
         return page_id.replace("-", "")
 
-    def create_page(
+    async def create_page(
         self,
         parent_page_id: str,
         title: str,
@@ -53,6 +167,9 @@ class NotionService:
         """
         Notion 페이지 생성
 
+        블록이 100개를 넘으면 첫 100개로 페이지를 만들고 나머지는 100개씩 이어 붙인다
+        (같은 부모에 순서대로 붙여야 하므로 순차 호출). 2000자가 넘는 텍스트는 나눈다.
+
         Args:
             parent_page_id: 부모 페이지 ID (32자 hex)
             title: 페이지 제목
@@ -61,24 +178,102 @@ class NotionService:
         Returns:
             생성된 페이지 정보
         """
-        response = self.client.pages.create(
+        blocks = fit_blocks(blocks)
+        response = await self._request(
+            self.client.pages.create,
             parent={"page_id": parent_page_id},
             properties={
                 "title": {
-                    "title": [
+                    "title": _split_rich_text([
                         {
                             "type": "text",
                             "text": {"content": title}
                         }
-                    ]
+                    ])
                 }
             },
-            children=blocks
+            children=blocks[:MAX_CHILDREN_PER_REQUEST]
         )
 
+        await self.append_blocks(response["id"], blocks[MAX_CHILDREN_PER_REQUEST:])
         return response
 
-    def create_lecture_page(
+    async def append_blocks(
+        self,
+        block_id: str,
+        blocks: List[Dict[str, Any]],
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        하위 블록 추가 (100개씩 나눠서)
+
+        Args:
+            block_id: 부모 블록/페이지 ID
+            blocks: 추가할 블록 리스트
+            after: 이 블록 바로 뒤에 삽입 (없으면 맨 끝에 추가)
+
+        Returns:
+            생성된 블록 정보 리스트 (순서대로)
+        """
+        blocks = fit_blocks(blocks)
+        created = []
+        for start in range(0, len(blocks), MAX_CHILDREN_PER_REQUEST):
+            kwargs: Dict[str, Any] = {}
+            if after is not None:
+                kwargs["after"] = after
+            response = await self._request(
+                self.client.blocks.children.append,
+                block_id=block_id,
+                children=blocks[start:start + MAX_CHILDREN_PER_REQUEST],
+                **kwargs,
+            )
+            results = response.get("results", [])
+            created.extend(results)
+            if after is not None and results:
+                # 다음 묶음은 방금 넣은 블록 뒤에 이어서
+                after = results[-1]["id"]
+        return created
+
+    async def update_block(self, block_id: str, block: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        블록 내용 제자리 수정 (블록 타입은 바꿀 수 없음)
+
+        Args:
+            block_id: 수정할 블록 ID
+            block: 새 블록 ({"type": ..., <type>: {...}})
+
+        Returns:
+            수정된 블록 정보
+        """
+        block = fit_blocks([block])[0]
+        return await self._request(
+            self.client.blocks.update,
+            block_id=block_id,
+            **{block["type"]: block[block["type"]]},
+        )
+
+    async def delete_block(self, block_id: str) -> None:
+        """
+        블록 삭제 (휴지통으로 이동)
+
+        Args:
+            block_id: 삭제할 블록 ID
+        """
+        await self._request(self.client.blocks.delete, block_id=block_id)
+
+    def summary_to_blocks(self, summary: str) -> List[Dict[str, Any]]:
+        """
+        요약 텍스트(Markdown)를 Notion 블록으로 변환
+
+        Args:
+            summary: LLM 요약 텍스트
+
+        Returns:
+            Notion 블록 리스트
+        """
+        return markdown_to_blocks(summary)
+
+    async def create_lecture_page(
         self,
         title: str,
         summary: str,
@@ -101,85 +296,84 @@ class NotionService:
             parent_page_id = self.extract_page_id(settings.notion_page_url)
 
         # 요약 내용을 Notion 블록으로 변환
-        blocks = self._convert_summary_to_blocks(summary)
+        blocks = markdown_to_blocks(summary)
 
-        return self.create_page(
+        return await self.create_page(
             parent_page_id=parent_page_id,
             title=title,
             blocks=blocks
         )
 
-    def _convert_summary_to_blocks(self, summary: str) -> List[Dict[str, Any]]:
-        """
-        텍스트 요약을 Notion 블록으로 변환
 
+class NotionClientPool:
+    """
+    토큰별 NotionService 재사용 (LRU, 토큰마다 요청 속도 제한 공유)
+
+    Notion 클라이언트는 인증 헤더를 HTTP 클라이언트에 고정하므로 토큰마다 클라이언트가
+    필요하다. 대신 모든 클라이언트가 하나의 연결 풀(transport)을 공유하여
+    요청마다 TCP/TLS 연결을 새로 맺지 않는다.
+    """
+
+    def __init__(self, max_clients: int = 256, max_connections: int = 20):
+        """
         Args:
-            summary: LLM 요약 텍스트
+            max_clients: 기억할 토큰 수 (초과 시 가장 오래 안 쓴 것부터 제거)
+            max_connections: 공유 연결 풀 크기
+        """
+        self.max_clients = max_clients
+        self.max_connections = max_connections
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        self._services: OrderedDict[str, NotionService] = OrderedDict()
 
-        Returns:
-            Notion 블록 리스트
+    def get(self, token: Optional[str] = None) -> NotionService:
+        """
+        토큰에 해당하는 NotionService (없으면 생성)
+
+        Args:
+            token: Notion Integration Token (없으면 환경변수 사용)
         """
-        blocks = []
-        lines = summary.split('\n')
-
-        for line in lines:
-            line = line.strip()
-
-            if not line:
-                continue
-
-            # 제목 형식 감지 (##, ###)
-            if line.startswith('### '):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [{"type": "text", "text": {"content": line[4:]}}]
-                    }
-                })
-            elif line.startswith('## '):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{"type": "text", "text": {"content": line[3:]}}]
-                    }
-                })
-            elif line.startswith('# '):
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_1",
-                    "heading_1": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:]}}]
-                    }
-                })
-            # 리스트 항목 (-, *, 숫자.)
-            elif line.startswith('- ') or line.startswith('* '):
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": line[2:]}}]
-                    }
-                })
-            elif re.match(r'^\d+\.\s', line):
-                # 숫자. 형식
-                content = re.sub(r'^\d+\.\s', '', line)
-                blocks.append({
-                    "object": "block",
-                    "type": "numbered_list_item",
-                    "numbered_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": content}}]
-                    }
-                })
-            else:
-                # 일반 단락
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [{"type": "text", "text": {"content": line}}]
-                    }
-                })
-
-        return blocks
+        auth = token or settings.notion_api_key
+        service = self._services.get(auth)
+        if service is not None:
+            self._services.move_to_end(auth)
+            return service
+
+        if self._transport is None:
+            self._transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=300,
+                ),
+            )
+        # 개별 클라이언트를 닫으면 공유 transport도 닫히므로 제거할 때는 참조만 버림
+        service = NotionService(
+            token=auth,
+            http=httpx.AsyncClient(transport=self._transport),
+            limiter=TokenBucket(
+                per_minute=settings.notion_requests_per_second * 60,
+                capacity=settings.notion_requests_per_second,
+            ),
+        )
+        self._services[auth] = service
+        while len(self._services) > self.max_clients:
+            self._services.popitem(last=False)
+        return service
+
+    def discard(self, token: str) -> None:
+        """토큰의 클라이언트 제거 (유효하지 않은 토큰을 기억하지 않도록)"""
+        self._services.pop(token, None)
+
+    async def close(self) -> None:
+        """공유 연결 풀 정리"""
+        self._services.clear()
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+
+
+# 싱글톤 인스턴스
+notion_clients = NotionClientPool(
+    max_clients=settings.notion_max_clients,
+    max_connections=settings.notion_max_connections,
+)
@@ -0,0 +1,243 @@
+"""
+Markdown → Notion 블록 변환기
+
+LLM 보고서(Markdown)를 한 번의 순회로 Notion 블록으로 바꾼다.
+- 줄 종류는 미리 컴파일한 정규식 하나로 판별 (제목, 목록, 인용, 구분선, 코드 펜스, 문단)
+- 들여쓴 목록은 children으로 중첩 (Notion은 요청 하나에 2단계까지만 허용하므로 그 이상은 평탄화)
+- 코드 펜스는 code 블록 하나로, 이어진 일반 줄은 문단 하나로 합쳐 블록 수(= API 호출 수)를 줄임
+- **굵게**, *기울임*, `코드`, ~~취소선~~, [링크](url)는 rich_text 서식으로 변환
+"""
+
+import re
+from typing import Any, Optional
+
+# 한 줄 판별 (코드 펜스 밖)
+_LINE = re.compile(
+    r"(?P<indent>[ \t]*)(?:"
+    r"(?P<fence>```|~~~)\s*(?P<lang>[\w+#.-]*).*"
+    r"|(?P<heading>#{1,6})\s+(?P<heading_text>.*?)(?:\s+#+)?\s*"
+    r"|(?P<divider>(?:-[ \t]*){3,}|(?:\*[ \t]*){3,}|(?:_[ \t]*){3,})"
+    r"|(?P<bullet>[-*+])\s+(?P<bullet_text>.*)"
+    r"|(?P<number>\d{1,9})[.)]\s+(?P<number_text>.*)"
+    r"|>\s?(?P<quote_text>.*)"
+    r"|(?P<text>.*)"
+    r")"
+)
+
+# 인라인 서식 (앞에 있는 것이 우선)
+_INLINE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)"
+    r"|\*\*\*(?P<bold_italic>\S(?:.*?\S)?)\*\*\*"
+    r"|\*\*(?P<bold>\S(?:.*?\S)?)\*\*"
+    r"|(?<!\w)__(?P<bold_u>\S(?:.*?\S)?)__(?!\w)"
+    r"|~~(?P<strike>\S(?:.*?\S)?)~~"
+    r"|\*(?P<italic>[^*\s](?:[^*]*[^*\s])?)\*"
+    r"|(?<!\w)_(?P<italic_u>[^_\s](?:[^_]*[^_\s])?)_(?!\w)"
+)
+
+# 인라인 서식이 있을 수 있는 줄인지 빠르게 확인
+_MARKUP = re.compile(r"[`*_~\[]")
+
+# 그룹 → Notion annotations
+_ANNOTATIONS = {
+    "code": {"code": True},
+    "bold_italic": {"bold": True, "italic": True},
+    "bold": {"bold": True},
+    "bold_u": {"bold": True},
+    "strike": {"strikethrough": True},
+    "italic": {"italic": True},
+    "italic_u": {"italic": True},
+}
+
+# 요청 하나에 넣을 수 있는 중첩 깊이 (최상위 블록 포함)
+MAX_NESTING_DEPTH = 3
+
+# 코드 블록 언어 (Notion 지원 목록 중 자주 쓰는 것, 나머지는 plain text)
+_CODE_LANGUAGES = {
+    "bash", "c", "c#", "c++", "css", "dart", "diff", "docker", "go", "graphql", "haskell",
+    "html", "java", "javascript", "json", "kotlin", "latex", "lua", "makefile", "markdown",
+    "matlab", "php", "python", "r", "ruby", "rust", "scala", "shell", "sql", "swift",
+    "typescript", "xml", "yaml",
+}
+_CODE_ALIASES = {
+    "py": "python", "js": "javascript", "ts": "typescript", "sh": "shell", "zsh": "shell",
+    "cpp": "c++", "cs": "c#", "csharp": "c#", "yml": "yaml", "md": "markdown", "kt": "kotlin",
+    "rb": "ruby", "rs": "rust", "tex": "latex", "dockerfile": "docker",
+}
+
+
+def _text(content: str, annotations: Optional[dict[str, bool]] = None, url: Optional[str] = None) -> dict[str, Any]:
+    """rich_text 항목 하나"""
+    item: dict[str, Any] = {"type": "text", "text": {"content": content}}
+    if url:
+        item["text"]["link"] = {"url": url}
+    if annotations:
+        item["annotations"] = annotations
+    return item
+
+
+def parse_inline(text: str) -> list[dict[str, Any]]:
+    """
+    인라인 Markdown을 rich_text로 변환
+
+    Args:
+        text: 한 줄 텍스트
+
+    Returns:
+        Notion rich_text 리스트
+    """
+    if not _MARKUP.search(text):
+        return [_text(text)]
+
+    rich_text = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            rich_text.append(_text(text[position:match.start()]))
+        group = match.lastgroup
+        if group == "link_url":
+            rich_text.append(_text(match.group("link_text"), url=match.group("link_url")))
+        else:
+            rich_text.append(_text(match.group(group), _ANNOTATIONS[group]))
+        position = match.end()
+    if position < len(text):
+        rich_text.append(_text(text[position:]))
+    return rich_text
+
+
+def _append_line(rich_text: list[dict[str, Any]], text: str) -> None:
+    """rich_text 뒤에 줄바꿈과 함께 한 줄을 이어 붙임 (서식 없는 항목끼리는 합침)"""
+    line = parse_inline(text)
+    if rich_text and line and "annotations" not in rich_text[-1] and "link" not in rich_text[-1]["text"]:
+        rich_text[-1]["text"]["content"] += "\n"
+        if "annotations" not in line[0] and "link" not in line[0]["text"]:
+            rich_text[-1]["text"]["content"] += line.pop(0)["text"]["content"]
+    elif rich_text:
+        rich_text.append(_text("\n"))
+    rich_text.extend(line)
+
+
+def _block(block_type: str, rich_text: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text}}
+
+
+def _code_language(tag: str) -> str:
+    tag = tag.lower()
+    tag = _CODE_ALIASES.get(tag, tag)
+    return tag if tag in _CODE_LANGUAGES else "plain text"
+
+
+def _indent_width(indent: str) -> int:
+    return len(indent.expandtabs(4))
+
+
+def markdown_to_blocks(markdown: str) -> list[dict[str, Any]]:
+    """
+    Markdown 텍스트를 Notion 블록으로 변환
+
+    Args:
+        markdown: LLM 요약 텍스트
+
+    Returns:
+        Notion 블록 리스트 (중첩 목록은 children 포함, 글자 수 한도는 fit_blocks로 맞춤)
+    """
+    blocks: list[dict[str, Any]] = []
+    lists: list[tuple[int, dict[str, Any]]] = []  # 열려 있는 목록 항목 (들여쓰기, 블록)
+    paragraph: Optional[list[dict[str, Any]]] = None  # 이어 붙이는 중인 문단/인용의 rich_text
+    paragraph_type = ""
+    code: Optional[list[str]] = None  # 코드 펜스 안의 줄
+    fence = ""
+    language = ""
+
+    for raw in markdown.split("\n"):
+        if code is not None:
+            if raw.strip().startswith(fence):
+                content = "\n".join(code)
+                blocks.append({
+                    "object": "block",
+                    "type": "code",
+                    "code": {"rich_text": [_text(content)] if content else [], "language": language},
+                })
+                code = None
+            else:
+                code.append(raw)
+            continue
+
+        if not raw.strip():
+            paragraph = None
+            continue
+
+        match = _LINE.fullmatch(raw.rstrip())
+        kind = match.lastgroup
+
+        if kind == "text":
+            text = raw.strip()
+            indent = _indent_width(match.group("indent"))
+            if lists and indent > lists[0][0]:
+                # 목록 항목 아래 들여쓴 줄은 들여쓰기가 더 얕은 가장 가까운 항목의 이어지는 줄
+                while lists[-1][0] >= indent:
+                    lists.pop()
+                body = lists[-1][1][lists[-1][1]["type"]]
+                _append_line(body["rich_text"], text)
+            elif paragraph is not None and paragraph_type == "paragraph":
+                _append_line(paragraph, text)
+            else:
+                lists.clear()
+                block = _block("paragraph", parse_inline(text))
+                blocks.append(block)
+                paragraph, paragraph_type = block["paragraph"]["rich_text"], "paragraph"
+            continue
+
+        if kind == "quote_text":
+            text = match.group("quote_text").strip()
+            lists.clear()
+            if paragraph is not None and paragraph_type == "quote":
+                _append_line(paragraph, text)
+            else:
+                block = _block("quote", parse_inline(text))
+                blocks.append(block)
+                paragraph, paragraph_type = block["quote"]["rich_text"], "quote"
+            continue
+
+        paragraph = None
+
+        if kind in ("bullet_text", "number_text"):
+            block_type = "bulleted_list_item" if kind == "bullet_text" else "numbered_list_item"
+            block = _block(block_type, parse_inline(match.group(kind).strip()))
+            indent = _indent_width(match.group("indent"))
+            while lists and lists[-1][0] >= indent:
+                lists.pop()
+            if lists and len(lists) >= MAX_NESTING_DEPTH:
+                # 더 깊은 항목은 허용되는 마지막 단계에 형제로 붙임
+                lists.pop()
+            if lists:
+                parent = lists[-1][1][lists[-1][1]["type"]]
+                parent.setdefault("children", []).append(block)
+            else:
+                blocks.append(block)
+            lists.append((indent, block))
+            continue
+
+        lists.clear()
+
+        if kind == "lang":
+            fence = match.group("fence")
+            language = _code_language(match.group("lang"))
+            code = []
+        elif kind == "heading_text":
+            level = min(len(match.group("heading")), 3)
+            blocks.append(_block(f"heading_{level}", parse_inline(match.group("heading_text"))))
+        elif kind == "divider":
+            blocks.append({"object": "block", "type": "divider", "divider": {}})
+
+    if code is not None:
+        # 닫히지 않은 코드 펜스
+        content = "\n".join(code)
+        blocks.append({
+            "object": "block",
+            "type": "code",
+            "code": {"rich_text": [_text(content)] if content else [], "language": language},
+        })
+
+    return blocks
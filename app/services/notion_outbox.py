@@ -0,0 +1,373 @@
+"""
+Notion 쓰기 대기열 (outbox) 워커
+
+/api/notion/save는 쓰기를 notion_outbox 테이블에 기록하고 바로 응답하며,
+이 워커가 리스(lease)를 걸고 하나씩 Notion에 반영한다.
+- 요청 속도는 NotionService의 토큰별 버킷이 제한 (Notion은 integration당 초당 약 3회)
+- 429는 Retry-After를 따르고, 그래도 실패하면 지수 백오프로 다시 예약
+- 페이지 생성과 블록 묶음마다 진행 상황을 커밋하므로 재시작 후 이어서 씀
+- 완료되면 Recording.notion_url을 채우고 진행 이벤트를 발행
+"""
+
+import asyncio
+import hashlib
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from notion_client.errors import HTTPResponseError
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.notion_write import NotionWrite
+from app.models.recording import Recording
+from app.services.notion_client import (
+    MAX_CHILDREN_PER_REQUEST,
+    RETRYABLE_STATUS,
+    fit_blocks,
+    notion_clients,
+)
+from app.services.progress_bus import progress_bus
+
+
+def notion_token_hash(token: str) -> str:
+    """쓰기 소유자 확인용 토큰 해시 (DB에 원본 토큰을 남기지 않기 위해)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def enqueue_notion_write(
+    db: AsyncSession,
+    token: str,
+    parent_page_id: str,
+    title: str,
+    summary: str,
+    recording_id: Optional[str] = None,
+) -> NotionWrite:
+    """
+    Notion 페이지 쓰기를 대기열에 등록 (커밋은 호출자가 수행)
+
+    Args:
+        db: DB 세션
+        token: Notion Integration Token
+        parent_page_id: 부모 페이지 ID
+        title: 페이지 제목
+        summary: 페이지 내용 (Markdown 요약)
+        recording_id: 완료 시 notion_url을 기록할 녹음 ID
+
+    Returns:
+        등록된 쓰기
+    """
+    write = NotionWrite(
+        id=str(uuid.uuid4()),
+        recording_id=recording_id,
+        token=token,
+        token_hash=notion_token_hash(token),
+        parent_page_id=parent_page_id,
+        title=title,
+        summary=summary,
+        status="pending",
+        max_attempts=settings.notion_outbox_max_attempts,
+        available_at=datetime.utcnow(),
+    )
+    db.add(write)
+    return write
+
+
+def _claimable(now: datetime):
+    """가져갈 수 있는 쓰기 조건 (대기 중이거나 리스가 만료된 쓰기)"""
+    return or_(
+        and_(NotionWrite.status == "pending", NotionWrite.available_at <= now),
+        and_(NotionWrite.status == "running", NotionWrite.lease_expires_at < now),
+    )
+
+
+def _retry_delay(attempts: int) -> float:
+    """재시도 대기 시간 (지수 백오프, 초)"""
+    delay = settings.notion_outbox_retry_base_delay * (2 ** max(attempts - 1, 0))
+    return min(delay, settings.notion_outbox_retry_max_delay)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """다시 시도해도 소용없는 오류인지 (잘못된 토큰, 권한 없음, 요청 형식 오류 등)"""
+    return isinstance(error, HTTPResponseError) and error.status not in RETRYABLE_STATUS
+
+
+class NotionOutboxWorker:
+    """리스 기반 Notion 쓰기 워커"""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(settings.notion_outbox_concurrency)
+        self._wakeup = asyncio.Event()
+        self._running: dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self._waiters: dict[str, asyncio.Event] = {}
+
+        # 지표
+        self._written = 0
+        self._failed = 0
+        self._retries = 0
+
+    def start(self) -> None:
+        """폴링 루프 시작"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._poll_loop())
+            print(f"✅ Notion 쓰기 워커 시작: {self.worker_id}")
+
+    async def stop(self) -> None:
+        """폴링 루프 및 진행 중인 쓰기 중지 (리스를 반환하여 즉시 재개 가능하게 함)"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(NotionWrite)
+                .where(
+                    NotionWrite.status == "running",
+                    NotionWrite.lease_owner == self.worker_id,
+                )
+                .values(status="pending", lease_owner=None, lease_expires_at=None)
+            )
+            await db.commit()
+
+    def notify(self) -> None:
+        """새 쓰기 등록 알림 (폴링 대기 없이 즉시 확인)"""
+        self._wakeup.set()
+
+    async def wait(self, write_id: str, timeout: float) -> None:
+        """
+        쓰기가 끝날 때까지 최대 timeout초 대기 (완료 이벤트로 깨어남, DB를 폴링하지 않음)
+
+        이 프로세스의 워커가 처리한 경우만 일찍 깨어나고, 아니면 timeout 후 돌아간다.
+
+        Args:
+            write_id: NotionWrite ID
+            timeout: 최대 대기 시간 (초)
+        """
+        if timeout <= 0:
+            return
+        event = self._waiters.setdefault(write_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters.pop(write_id, None)
+
+    async def _poll_loop(self) -> None:
+        """빈 슬롯이 있으면 쓰기를 가져와 실행"""
+        while True:
+            await self._slots.acquire()
+            try:
+                write_id = await self._claim()
+            except asyncio.CancelledError:
+                self._slots.release()
+                raise
+            except Exception as e:
+                print(f"❌ Notion 쓰기 조회 오류: {e}")
+                write_id = None
+
+            if write_id is None:
+                self._slots.release()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=settings.job_poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run(write_id))
+            self._running[write_id] = task
+
+    async def _claim(self) -> Optional[str]:
+        """
+        쓰기 하나에 리스를 걸고 가져옴 (조건부 UPDATE로 다른 워커와 경합 방지)
+
+        이 프로세스에서 아직 실행 중인 쓰기는 리스가 만료되어 보여도 가져오지 않는다.
+
+        Returns:
+            가져온 쓰기 ID 또는 None
+        """
+        now = datetime.utcnow()
+        not_running = NotionWrite.id.not_in(list(self._running))
+        async with AsyncSessionLocal() as db:
+            write_id = (
+                await db.execute(
+                    select(NotionWrite.id)
+                    .where(_claimable(now), not_running)
+                    .order_by(NotionWrite.available_at)
+                    .limit(1)
+                )
+            ).scalar_one_or_none()
+            if write_id is None:
+                return None
+
+            result = await db.execute(
+                update(NotionWrite)
+                .where(NotionWrite.id == write_id, _claimable(now), not_running)
+                .values(
+                    status="running",
+                    lease_owner=self.worker_id,
+                    lease_expires_at=now + timedelta(seconds=settings.notion_outbox_lease_seconds),
+                    attempts=NotionWrite.attempts + 1,
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+            return write_id if result.rowcount == 1 else None
+
+    async def _write(self, db: AsyncSession, write: NotionWrite) -> None:
+        """페이지 생성 후 남은 블록을 묶음마다 커밋하며 이어 붙임"""
+        service = notion_clients.get(write.token)
+        blocks = fit_blocks(service.summary_to_blocks(write.summary))
+        lease = timedelta(seconds=settings.notion_outbox_lease_seconds)
+
+        if write.page_id is None:
+            first = blocks[:MAX_CHILDREN_PER_REQUEST]
+            page = await service.create_page(
+                parent_page_id=write.parent_page_id, title=write.title, blocks=first
+            )
+            write.page_id = page["id"]
+            write.page_url = page.get("url", "")
+            write.blocks_written = len(first)
+            write.lease_expires_at = datetime.utcnow() + lease
+            await db.commit()
+
+        while write.blocks_written < len(blocks):
+            batch = blocks[write.blocks_written:write.blocks_written + MAX_CHILDREN_PER_REQUEST]
+            await service.append_blocks(write.page_id, batch)
+            write.blocks_written += len(batch)
+            write.lease_expires_at = datetime.utcnow() + lease
+            await db.commit()
+
+    async def _heartbeat(self, write_id: str, write_task: asyncio.Task) -> None:
+        """
+        리스 연장 (리스를 잃으면 쓰기 취소)
+
+        Notion 호출 하나가 Retry-After/백오프로 리스 시간보다 오래 걸려도
+        다른 워커가 같은 쓰기를 가져가 페이지나 블록을 중복으로 만들지 않게 한다.
+        """
+        interval = settings.notion_outbox_lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(NotionWrite)
+                    .where(
+                        NotionWrite.id == write_id,
+                        NotionWrite.lease_owner == self.worker_id,
+                        NotionWrite.status == "running",
+                    )
+                    .values(
+                        lease_expires_at=datetime.utcnow()
+                        + timedelta(seconds=settings.notion_outbox_lease_seconds)
+                    )
+                )
+                await db.commit()
+            if result.rowcount != 1:
+                print(f"⚠️ Notion 쓰기 리스 상실, 중단: {write_id}")
+                write_task.cancel()
+                return
+
+    async def _run(self, write_id: str) -> None:
+        """쓰기 실행 및 결과 기록"""
+        heartbeat = asyncio.create_task(self._heartbeat(write_id, asyncio.current_task()))
+        try:
+            async with AsyncSessionLocal() as db:
+                write = await db.get(NotionWrite, write_id)
+                if not write or write.lease_owner != self.worker_id:
+                    return
+                try:
+                    await self._write(db, write)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"❌ Notion 쓰기 실패 ({write_id}): {e}")
+                    await self._fail(db, write, e)
+                else:
+                    await self._finish(db, write)
+        except asyncio.CancelledError:
+            # 종료 또는 리스 상실: 상태는 stop() 또는 다른 워커가 처리
+            pass
+        except Exception as e:
+            print(f"❌ Notion 쓰기 처리 오류 ({write_id}): {e}")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(write_id, None)
+            self._slots.release()
+
+    async def _finish(self, db: AsyncSession, write: NotionWrite) -> None:
+        """완료 처리 (녹음에 페이지 URL 기록)"""
+        write.status = "done"
+        write.token = None
+        write.lease_owner = None
+        write.lease_expires_at = None
+        write.last_error = None
+        if write.recording_id:
+            recording = await db.get(Recording, write.recording_id)
+            if recording:
+                recording.notion_url = write.page_url
+        await db.commit()
+        self._written += 1
+        print(f"📝 Notion 저장 완료: {write.page_url}")
+
+        self._done(write)
+
+    async def _fail(self, db: AsyncSession, write: NotionWrite, error: Exception) -> None:
+        """실패 처리 (재시도 예약 또는 최종 실패)"""
+        write.last_error = str(error)
+        write.lease_owner = None
+        write.lease_expires_at = None
+
+        if _is_permanent(error) or write.attempts >= write.max_attempts:
+            write.status = "failed"
+            write.token = None
+            await db.commit()
+            self._failed += 1
+            print(f"❌ Notion 쓰기 최종 실패: {write.id}")
+            self._done(write)
+            return
+
+        delay = _retry_delay(write.attempts)
+        write.status = "pending"
+        write.available_at = datetime.utcnow() + timedelta(seconds=delay)
+        await db.commit()
+        self._retries += 1
+        print(f"🔁 {delay:.0f}초 후 Notion 쓰기 재시도 ({write.attempts}/{write.max_attempts}): {write.id}")
+
+    def _done(self, write: NotionWrite) -> None:
+        """대기 중인 요청과 구독자에게 결과 알림"""
+        event = self._waiters.get(write.id)
+        if event is not None:
+            event.set()
+        if write.recording_id:
+            progress_bus.publish(
+                write.recording_id,
+                {"type": "notion", "status": write.status, "url": write.page_url or ""},
+            )
+
+    def stats(self) -> dict[str, Any]:
+        """워커 지표"""
+        return {
+            "running": len(self._running),
+            "written": self._written,
+            "failed": self._failed,
+            "retries": self._retries,
+        }
+
+
+# 싱글톤 인스턴스
+notion_outbox = NotionOutboxWorker()
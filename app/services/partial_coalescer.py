@@ -0,0 +1,133 @@
+"""
+실시간 STT 중간 결과(partial) 전송 병합기
+
+Return Zero는 발화가 길어질수록 중간 가설을 초당 수십 번 보내며, 매번 전체 텍스트를
+담는다. 세션별로 partial 전송 빈도를 제한하고 (대기 중에는 최신 것만 유지),
+선택적으로 같은 seq의 직전 partial 대비 변경분만 보낸다. final은 항상 즉시 전체를 보낸다.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """두 문자열의 공통 접두사 길이"""
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class PartialCoalescer:
+    """partial 속도 제한 + delta 인코딩"""
+
+    def __init__(
+        self,
+        send_text: Callable[[str], Awaitable[None]],
+        max_hz: float = 10.0,
+        delta: bool = False,
+    ):
+        """
+        Args:
+            send_text: 직렬화된 JSON 메시지를 보내는 함수
+            max_hz: 초당 최대 partial 전송 수 (0 이하이면 제한 없음)
+            delta: True면 partial을 {"type": "stt_delta", "keep": N, "append": "..."}로 전송
+        """
+        self.send_text = send_text
+        self.interval = 1.0 / max_hz if max_hz > 0 else 0.0
+        self.delta = delta
+
+        self._lock = asyncio.Lock()
+        self._pending: Optional[dict[str, Any]] = None
+        self._timer: Optional[asyncio.Task] = None
+        self._last_sent_at = 0.0
+        self._last_partial: dict[Any, str] = {}  # seq → 마지막으로 보낸 partial 텍스트
+
+        # 통계
+        self.partials_received = 0
+        self.partials_sent = 0
+        self.finals_sent = 0
+        self.bytes_sent = 0
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        data = json.dumps(message, ensure_ascii=False)
+        self.bytes_sent += len(data.encode())
+        await self.send_text(data)
+
+    async def push(self, message: dict[str, Any]) -> None:
+        """
+        stt_result 메시지 전달
+
+        Args:
+            message: {"type": "stt_result", "seq", "final", "text", ...}
+        """
+        async with self._lock:
+            if message.get("final"):
+                # final은 즉시 전체 전송, 같은 발화의 대기 중 partial은 버림
+                self._pending = None
+                self._last_partial.pop(message.get("seq"), None)
+                await self._send(message)
+                self.finals_sent += 1
+                return
+
+            self.partials_received += 1
+            self._pending = message
+            wait = self._last_sent_at + self.interval - time.monotonic()
+            if wait <= 0:
+                await self._flush_locked()
+            elif self._timer is None or self._timer.done():
+                self._timer = asyncio.create_task(self._flush_later(wait))
+
+    async def _flush_later(self, wait: float) -> None:
+        await asyncio.sleep(wait)
+        async with self._lock:
+            await self._flush_locked()
+
+    async def _flush_locked(self) -> None:
+        """대기 중인 최신 partial 전송 (lock 보유 상태에서 호출)"""
+        message = self._pending
+        if message is None:
+            return
+        self._pending = None
+        if self.delta and self._last_partial.get(message.get("seq")) == message.get("text", ""):
+            # 직전에 보낸 partial과 같으면 보낼 변경분이 없음
+            return
+        self._last_sent_at = time.monotonic()
+        self.partials_sent += 1
+
+        if not self.delta:
+            await self._send(message)
+            return
+
+        seq = message.get("seq")
+        text = message.get("text", "")
+        previous = self._last_partial.get(seq, "")
+        keep = _common_prefix_len(previous, text)
+        self._last_partial = {seq: text}
+        await self._send({
+            "type": "stt_delta",
+            "seq": seq,
+            "keep": keep,
+            "append": text[keep:],
+            "start_at": message.get("start_at", 0),
+        })
+
+    async def close(self) -> None:
+        """대기 중인 partial 폐기 및 타이머 정리"""
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+        self._pending = None
+
+    def stats(self) -> dict[str, Any]:
+        """전송 통계"""
+        return {
+            "partials_received": self.partials_received,
+            "partials_sent": self.partials_sent,
+            "finals_sent": self.finals_sent,
+            "bytes_sent": self.bytes_sent,
+        }
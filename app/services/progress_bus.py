@@ -0,0 +1,86 @@
+"""
+녹음 처리 진행 이벤트 버스 (프로세스 내부)
+
+process_recording이 상태/진행률을 바꿀 때마다 이벤트를 발행하고,
+SSE 구독자는 DB를 읽지 않고 이벤트를 바로 받는다.
+워커가 다른 프로세스에서 돌면 이벤트가 전달되지 않으므로 폴링(/status)은 그대로 유지한다.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+# 처리가 끝난 상태 (이후 이벤트 없음)
+TERMINAL_STATUSES = ("complete", "idle")
+
+
+def is_terminal(event: dict[str, Any]) -> bool:
+    """더 이상 이벤트가 오지 않는 상태 이벤트인지 확인"""
+    return event.get("type") == "status" and event.get("status") in TERMINAL_STATUSES
+
+
+class ProgressBus:
+    """녹음별 진행 이벤트 발행/구독"""
+
+    def __init__(self, queue_size: int = 256, max_tracked: int = 10000):
+        """
+        Args:
+            queue_size: 구독자별 이벤트 큐 크기 (가득 차면 가장 오래된 이벤트 제거)
+            max_tracked: 마지막 상태를 기억할 녹음 수 (LRU)
+        """
+        self.queue_size = queue_size
+        self.max_tracked = max_tracked
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._last_status: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def publish(self, recording_id: str, event: dict[str, Any]) -> None:
+        """
+        이벤트 발행 (블로킹 없음)
+
+        Args:
+            recording_id: 녹음 ID
+            event: {"type": "status", "status": ..., "progress": ...} 등
+        """
+        if event.get("type") == "status":
+            self._last_status[recording_id] = event
+            self._last_status.move_to_end(recording_id)
+            while len(self._last_status) > self.max_tracked:
+                self._last_status.popitem(last=False)
+
+        for queue in self._subscribers.get(recording_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def last_status(self, recording_id: str) -> Optional[dict[str, Any]]:
+        """마지막으로 발행된 상태 이벤트 (없으면 None)"""
+        return self._last_status.get(recording_id)
+
+    @asynccontextmanager
+    async def subscribe(self, recording_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        녹음 이벤트 구독
+
+        Yields:
+            이벤트가 들어오는 큐
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(recording_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(recording_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[recording_id]
+
+    def subscriber_count(self) -> int:
+        """현재 구독자 수"""
+        return sum(len(s) for s in self._subscribers.values())
+
+
+# 싱글톤 인스턴스
+progress_bus = ProgressBus()
@@ -0,0 +1,314 @@
+"""
+녹음 파일 처리 파이프라인 (ffmpeg remux → STT → AI 요약)
+
+ffmpeg 출력은 중간 파일 없이 파이프로 바로 STT 스트림에 전달된다.
+
+각 단계가 끝날 때마다 결과와 ProcessingJob.stage를 같은 트랜잭션으로 커밋하므로,
+워커가 중간에 죽어도 다음 시도는 마지막으로 완료된 단계 다음부터 재개한다.
+"""
+
+import asyncio
+import json
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import ProcessingJob
+from app.models.recording import Recording
+from app.services.audio_segmenter import analyze_audio, plan_segments, segment_stream
+from app.services.audio_stream import FFmpegError, ogg_opus_stream
+from app.services.llm_summarizer import (
+    LectureSummarizer,
+    estimate_tokens,
+    lecture_summarizer,
+    split_sentences,
+)
+from app.services.progress_bus import progress_bus
+from app.services.result_cache import result_cache, stt_cache_key, summary_cache_key
+from app.services.rtzr_client import RTZRClient
+from app.services.transcript_compactor import transcript_compactor
+
+# 처리 단계 (완료 순서)
+STAGES = ("stt", "ai")
+
+# 업로드 파일 STT 파라미터 (캐시 키에 포함)
+STT_SAMPLE_RATE = 48000  # Opus는 보통 48kHz
+STT_ENCODING = "OGG_OPUS"
+STT_USE_ITN = True
+STT_USE_DISFLUENCY_FILTER = False
+
+# 요약 스트리밍 이벤트 최소 간격 (토큰마다 발행하지 않고 묶어서)
+SUMMARY_DELTA_INTERVAL = 0.1
+
+
+class StageLimits:
+    """단계별 동시 실행 수 제한 (ffmpeg 단독 작업 / STT / LLM)"""
+
+    def __init__(self, ffmpeg: int, stt: int, llm: int):
+        self.ffmpeg = asyncio.Semaphore(ffmpeg)
+        self.stt = asyncio.Semaphore(stt)
+        self.llm = asyncio.Semaphore(llm)
+
+
+class SummaryDeltaPublisher:
+    """
+    생성 중인 요약 조각을 모아 summary_delta 이벤트로 발행
+
+    이벤트: {"type": "summary_delta", "offset": N, "text": "..."}
+    offset은 지금까지 보낸 글자 수이며, 재시도로 요약을 처음부터 다시 만들면 0부터 다시 시작한다.
+    """
+
+    def __init__(self, recording_id: str, interval: float = SUMMARY_DELTA_INTERVAL):
+        self.recording_id = recording_id
+        self.interval = interval
+        self.offset = 0
+        self._buffer: list[str] = []
+        self._last_published = 0.0
+
+    def __call__(self, text: str) -> None:
+        self._buffer.append(text)
+        if time.monotonic() - self._last_published >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """모인 조각 발행"""
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        progress_bus.publish(
+            self.recording_id,
+            {"type": "summary_delta", "offset": self.offset, "text": text},
+        )
+        self.offset += len(text)
+        self._last_published = time.monotonic()
+
+
+def _is_done(completed_stage: str | None, stage: str) -> bool:
+    """stage가 이미 완료되었는지 확인"""
+    if completed_stage not in STAGES:
+        return False
+    return STAGES.index(stage) <= STAGES.index(completed_stage)
+
+
+async def _set_status(
+    db: AsyncSession,
+    recording: Recording,
+    status: str,
+    progress: int,
+) -> None:
+    """상태/진행률 커밋 후 구독자에게 발행 (같은 세션의 다른 변경도 함께 커밋됨)"""
+    recording.status = status
+    recording.progress = progress
+    await db.commit()
+    progress_bus.publish(
+        recording.id, {"type": "status", "status": status, "progress": progress}
+    )
+
+
+async def _transcribe(
+    stt_client: RTZRClient,
+    audio_path: Path,
+    limits: StageLimits,
+) -> list[dict[str, Any]]:
+    """
+    오디오 파일 전사
+
+    충분히 긴 파일은 무음 구간 기준으로 분할하여 여러 연결로 병렬 전사하고,
+    짧거나 분석에 실패한 파일은 단일 스트림으로 전사한다.
+    """
+    if settings.stt_segment_enabled:
+        try:
+            async with limits.ffmpeg:
+                analysis = await analyze_audio(
+                    audio_path,
+                    noise_db=settings.stt_silence_threshold_db,
+                    min_silence=settings.stt_silence_min_duration,
+                )
+        except FFmpegError as e:
+            print(f"⚠️ 오디오 분석 실패, 단일 스트림으로 전사: {e}")
+            analysis = None
+
+        if analysis and analysis.duration >= settings.stt_segment_min_duration:
+            segments = plan_segments(analysis, settings.stt_segment_seconds)
+            print(f"✂️ {len(segments)}개 구간으로 분할 전사 ({analysis.duration:.0f}초)")
+            async with limits.stt:
+                return await stt_client.transcribe_segments(
+                    [
+                        (segment.offset_ms, partial(segment_stream, audio_path, segment))
+                        for segment in segments
+                    ],
+                    max_concurrency=settings.stt_segment_concurrency,
+                    sample_rate=STT_SAMPLE_RATE,
+                    encoding=STT_ENCODING,
+                    use_itn=STT_USE_ITN,
+                    use_disfluency_filter=STT_USE_DISFLUENCY_FILTER,
+                )
+
+    async with limits.stt:
+        return await stt_client.transcribe_stream(
+            ogg_opus_stream(audio_path, chunk_size=8192),
+            sample_rate=STT_SAMPLE_RATE,
+            encoding=STT_ENCODING,
+            use_itn=STT_USE_ITN,
+            use_disfluency_filter=STT_USE_DISFLUENCY_FILTER,
+        )
+
+
+async def _stt_segments(
+    db: AsyncSession,
+    recording: Recording,
+    limits: StageLimits,
+) -> list[dict[str, Any]]:
+    """
+    녹음의 final STT 세그먼트 조회 (캐시 우선, 없으면 전사 후 캐시에 저장)
+
+    Returns:
+        [{"seq", "start_at", "duration", "text"}, ...]
+    """
+    cache_key = None
+    if settings.result_cache_enabled and recording.audio_sha256:
+        cache_key = stt_cache_key(
+            recording.audio_sha256,
+            STT_SAMPLE_RATE,
+            STT_ENCODING,
+            STT_USE_ITN,
+            STT_USE_DISFLUENCY_FILTER,
+        )
+        segments = await result_cache.get(db, "stt", cache_key)
+        if segments is not None:
+            print(f"⚡ STT 캐시 적중: {recording.id}")
+            return segments
+
+    stt_client = RTZRClient(
+        client_id=settings.return_zero_client_id,
+        client_secret=settings.return_zero_client_secret,
+    )
+    results = await _transcribe(stt_client, Path(recording.audio_file_path), limits)
+
+    # final 세그먼트만 보관
+    segments = [
+        {
+            "seq": r.get("seq", 0),
+            "start_at": r.get("start_at", 0),
+            "duration": r.get("duration", 0),
+            "text": r.get("alternatives", [{}])[0].get("text", ""),
+        }
+        for r in results
+        if r.get("final")
+    ]
+    if cache_key:
+        await result_cache.put(db, "stt", cache_key, segments)
+    return segments
+
+
+async def _summarize(
+    db: AsyncSession,
+    recording: Recording,
+    limits: StageLimits,
+) -> str:
+    """
+    전사 텍스트 요약 (캐시 우선, 없으면 LLM 호출 후 캐시에 저장)
+
+    첫 처리, 재개, 전사 수정 후 재요약 모두 stt_text를 줄(STT 발화)과 문장 단위로 나눈
+    같은 입력을 쓴다.
+    그래서 전사 일부만 고치면 바뀐 문장이 속한 청크만 다시 요약된다.
+    LLM에는 간투사/반복을 지운 압축 전사가 들어가고, 긴 전사는 문장 경계로 나눠
+    map-reduce로 요약한다.
+    최종 보고서는 생성되는 대로 summary_delta 이벤트로 발행된다.
+
+    Returns:
+        요약 텍스트
+    """
+    texts = split_sentences(recording.stt_text or "")
+    if settings.summary_compaction_enabled:
+        compaction = transcript_compactor.compact(texts)
+        texts = compaction.texts
+        print(
+            f"🗜️ 전사 압축: {compaction.tokens_before} → {compaction.tokens_after} 토큰 "
+            f"(-{compaction.ratio:.0%})"
+        )
+    transcript = " ".join(texts)
+
+    chunked = estimate_tokens(transcript) > settings.summary_chunk_tokens
+    prompt_version = LectureSummarizer.PROMPT_VERSION
+    if chunked:
+        # 청크 크기와 reduce 예산에 따라 병합 단계가 달라지므로 둘 다 키에 포함
+        prompt_version += (
+            f"+map-reduce-{settings.summary_chunk_tokens}-{settings.summary_reduce_max_tokens}"
+        )
+
+    cache_key = None
+    if settings.result_cache_enabled:
+        cache_key = summary_cache_key(transcript, prompt_version, lecture_summarizer.model)
+        summary = await result_cache.get(db, "summary", cache_key)
+        if summary is not None:
+            print(f"⚡ 요약 캐시 적중: {recording.id}")
+            return summary
+
+    on_delta = SummaryDeltaPublisher(recording.id)
+    async with limits.llm:
+        if chunked:
+            # 이전에 요약한 청크는 재사용 (전사를 고친 경우 바뀐 청크만 LLM 호출)
+            chunk_notes = json.loads(recording.summary_chunks or "{}")
+            summary = await lecture_summarizer.summarize_chunked_async(
+                texts,
+                chunk_tokens=settings.summary_chunk_tokens,
+                max_concurrency=settings.summary_chunk_concurrency,
+                reduce_max_tokens=settings.summary_reduce_max_tokens,
+                on_delta=on_delta,
+                chunk_notes=chunk_notes,
+            )
+            recording.summary_chunks = json.dumps(chunk_notes, ensure_ascii=False)
+        else:
+            summary = await lecture_summarizer.summarize_async(transcript, on_delta)
+    on_delta.flush()
+    if cache_key:
+        await result_cache.put(db, "summary", cache_key, summary)
+    return summary
+
+
+async def process_recording(job_id: str, limits: StageLimits) -> None:
+    """
+    녹음 처리 작업 실행 (STT → AI 요약)
+
+    Args:
+        job_id: ProcessingJob ID
+        limits: 단계별 동시 실행 제한
+
+    Raises:
+        Exception: 단계 실패 시 (재시도 여부는 워커가 결정)
+    """
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ProcessingJob, job_id)
+        if not job:
+            return
+        recording = await db.get(Recording, job.recording_id)
+        if not recording:
+            return
+
+        # 1단계: STT (ffmpeg 출력을 그대로 스트리밍, 긴 파일은 분할 병렬 전사)
+        if not _is_done(job.stage, "stt"):
+            await _set_status(db, recording, "stt", 20)
+
+            segments = await _stt_segments(db, recording, limits)
+
+            # STT 결과 텍스트 추출 (발화마다 한 줄: 문장부호가 없는 전사도 발화 경계가 남음)
+            recording.stt_text = "\n".join(s["text"] for s in segments)
+            job.stage = "stt"
+            await _set_status(db, recording, "stt", 50)
+
+        # 2단계: AI 요약
+        if not _is_done(job.stage, "ai"):
+            await _set_status(db, recording, "ai", 60)
+
+            summary = await _summarize(db, recording, limits)
+
+            recording.summary = summary
+            job.stage = "ai"
+            await _set_status(db, recording, "complete", 100)
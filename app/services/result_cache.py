@@ -0,0 +1,150 @@
+"""
+STT/요약 결과 캐시 (내용 주소 기반)
+
+같은 강의 파일이 여러 번 업로드되면 ffmpeg/STT/LLM을 다시 돌리지 않고
+캐시된 결과를 사용한다.
+- STT: 오디오 SHA-256 + STT 파라미터 → final 세그먼트
+- 요약: 전사 텍스트 SHA-256 + 프롬프트 버전 + 모델 → 요약 텍스트
+전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다 (LRU).
+"""
+
+import hashlib
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.cache import CacheEntry
+
+# ON CONFLICT 업서트를 지원하는 방언별 insert
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _hash_key(*parts: Any) -> str:
+    """키 구성 요소를 하나의 SHA-256 키로 변환"""
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+
+
+def stt_cache_key(
+    audio_sha256: str,
+    sample_rate: int,
+    encoding: str,
+    use_itn: bool,
+    use_disfluency_filter: bool,
+) -> str:
+    """STT 결과 캐시 키"""
+    return _hash_key("stt", audio_sha256, sample_rate, encoding, use_itn, use_disfluency_filter)
+
+
+def summary_cache_key(transcript: str, prompt_version: str, model: str) -> str:
+    """요약 결과 캐시 키"""
+    transcript_sha256 = hashlib.sha256(transcript.encode()).hexdigest()
+    return _hash_key("summary", transcript_sha256, prompt_version, model)
+
+
+class ResultCache:
+    """DB 기반 LRU 결과 캐시"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.evictions = 0
+
+    async def get(self, db: AsyncSession, kind: str, key: str) -> Optional[Any]:
+        """
+        캐시 조회 (적중 시 사용 시각 갱신, 커밋은 호출자가 수행)
+
+        Args:
+            db: DB 세션
+            kind: 캐시 종류 (stt, summary)
+            key: 캐시 키
+
+        Returns:
+            캐시된 값 또는 None
+        """
+        entry = await db.get(CacheEntry, key)
+        if entry is None:
+            self.misses[kind] += 1
+            return None
+
+        self.hits[kind] += 1
+        entry.accessed_at = datetime.utcnow()
+        return json.loads(entry.value)
+
+    async def put(self, db: AsyncSession, kind: str, key: str, value: Any) -> None:
+        """
+        캐시 저장 후 크기 한도 초과분 제거 (커밋은 호출자가 수행)
+
+        Args:
+            db: DB 세션
+            kind: 캐시 종류 (stt, summary)
+            key: 캐시 키
+            value: JSON 직렬화 가능한 값
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode())
+        if size > self.max_bytes:
+            return
+
+        now = datetime.utcnow()
+        values = {"key": key, "kind": kind, "value": data, "size": size, "created_at": now, "accessed_at": now}
+        insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if insert is None:
+            await db.merge(CacheEntry(**values))
+            await db.flush()
+        else:
+            # 같은 파일이 동시에 처리되어 두 작업이 같은 키를 넣어도 충돌하지 않도록 업서트
+            statement = insert(CacheEntry).values(**values)
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[CacheEntry.key],
+                    set_={
+                        "kind": statement.excluded.kind,
+                        "value": statement.excluded.value,
+                        "size": statement.excluded.size,
+                        "accessed_at": statement.excluded.accessed_at,
+                    },
+                )
+            )
+        await self._evict(db)
+
+    async def _evict(self, db: AsyncSession) -> None:
+        """전체 크기가 한도 이하가 될 때까지 LRU 순서로 제거"""
+        total = (await db.execute(select(func.coalesce(func.sum(CacheEntry.size), 0)))).scalar_one()
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        rows = await db.execute(
+            select(CacheEntry.key, CacheEntry.size).order_by(CacheEntry.accessed_at)
+        )
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+
+        await db.execute(delete(CacheEntry).where(CacheEntry.key.in_(victims)))
+        self.evictions += len(victims)
+
+    def stats(self) -> dict[str, Any]:
+        """적중/미스 카운터"""
+        kinds = sorted(set(self.hits) | set(self.misses))
+        return {
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "kinds": {
+                kind: {"hits": self.hits[kind], "misses": self.misses[kind]}
+                for kind in kinds
+            },
+        }
+
+
+# 싱글톤 인스턴스
+result_cache = ResultCache(max_bytes=settings.result_cache_max_bytes)
@@ -2,38 +2,112 @@ import httpx
 import websockets
 import json
 import asyncio
-from typing import Dict, Any, Optional, AsyncGenerator
+import time
+from typing import Dict, Any, Optional, AsyncGenerator, Callable
 from datetime import datetime
+from pathlib import Path
 
+from app.core.config import settings
+from app.services.audio_stream import file_stream
 
-class RTZRClient:
-    """Return Zero 스트리밍 STT API 클라이언트"""
+
+class RTZRTokenProvider:
+    """
+    프로세스 전역 Return Zero 토큰 관리자
+
+    모든 RTZRClient가 공유하여 /v1/authenticate 호출과 HTTP 연결 수립을 한 번만 한다.
+    - 동시에 여러 요청이 토큰을 필요로 해도 발급 요청은 하나만 보냄 (single-flight)
+    - 만료 refresh_margin초 전부터는 기존 토큰을 돌려주면서 백그라운드에서 미리 재발급
+    """
 
     AUTH_URL = "https://openapi.vito.ai/v1/authenticate"
-    WEBSOCKET_URL = "wss://openapi.vito.ai/v1/transcribe:streaming"
 
-    def __init__(self, client_id: str, client_secret: str):
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.access_token: Optional[str] = None
-        self.token_expire_at: Optional[datetime] = None
+    def __init__(self, refresh_margin: float = 600.0):
+        """
+        Args:
+            refresh_margin: 만료 몇 초 전부터 미리 재발급할지
+        """
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, tuple[str, float]] = {}  # client_id → (토큰, 만료 epoch초)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self._http: Optional[httpx.AsyncClient] = None
 
-    async def _get_token(self) -> str:
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """keep-alive 연결을 재사용하는 공용 HTTP 클라이언트"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_keepalive_connections=5, keepalive_expiry=300),
+            )
+        return self._http
+
+    async def get_token(self, client_id: str, client_secret: str) -> str:
         """
-        JWT 토큰 발급
-        토큰 유효기간: 6시간
+        유효한 JWT 토큰 조회 (없거나 만료되었으면 발급)
+
+        Args:
+            client_id: Return Zero client ID
+            client_secret: Return Zero client secret
+
+        Returns:
+            액세스 토큰
+        """
+        cached = self._tokens.get(client_id)
+        now = time.time()
+        if cached:
+            token, expire_at = cached
+            if now < expire_at - self.refresh_margin:
+                return token
+            if now < expire_at:
+                # 아직 유효하지만 곧 만료: 기다리지 않고 백그라운드에서 재발급
+                self._schedule_refresh(client_id, client_secret)
+                return token
+
+        return await self._refresh(client_id, client_secret)
+
+    def _schedule_refresh(self, client_id: str, client_secret: str) -> None:
+        """백그라운드 재발급 예약 (이미 진행 중이면 무시)"""
+        task = self._refresh_tasks.get(client_id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(client_id, client_secret))
+            task.add_done_callback(lambda t: self._refresh_done(client_id, t))
+            self._refresh_tasks[client_id] = task
+
+    def _refresh_done(self, client_id: str, task: asyncio.Task) -> None:
+        """
+        백그라운드 재발급 결과 처리
+
+        실패하면 로그를 남기고 곧 만료될 토큰을 버려, 다음 get_token()이 직접 발급하며
+        호출자에게 실제 오류를 전달하게 한다.
         """
-        # 토큰이 유효하면 재사용
-        if self.access_token and self.token_expire_at:
-            if datetime.now() < self.token_expire_at:
-                return self.access_token
+        if self._refresh_tasks.get(client_id) is task:
+            del self._refresh_tasks[client_id]
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            return
+        print(f"⚠️ RTZR 토큰 백그라운드 재발급 실패 (다음 요청에서 다시 발급): {error}")
+        cached = self._tokens.get(client_id)
+        if cached and time.time() >= cached[1] - self.refresh_margin:
+            del self._tokens[client_id]
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+    async def _refresh(self, client_id: str, client_secret: str) -> str:
+        """토큰 발급 (client_id별 single-flight)"""
+        lock = self._locks.setdefault(client_id, asyncio.Lock())
+        async with lock:
+            # 대기하는 동안 다른 요청이 이미 발급했으면 재사용
+            cached = self._tokens.get(client_id)
+            if cached and time.time() < cached[1] - self.refresh_margin:
+                return cached[0]
+
+            response = await self.http.post(
                 self.AUTH_URL,
                 data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
+                    "client_id": client_id,
+                    "client_secret": client_secret,
                 },
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
@@ -41,13 +115,45 @@ class RTZRClient:
 
             data = response.json()
             token: str = data["access_token"]
-            self.access_token = token
-            # expire_at은 타임스탬프 (밀리초)
-            self.token_expire_at = datetime.fromtimestamp(data["expire_at"] / 1000)
+            expire_at = float(data["expire_at"])
+            # expire_at은 epoch 타임스탬프 (초, 밀리초로 오는 경우도 처리)
+            if expire_at > 1e12:
+                expire_at /= 1000
+            self._tokens[client_id] = (token, expire_at)
 
-            print(f"✅ 토큰 발급 완료 (만료: {self.token_expire_at})")
+            print(f"✅ 토큰 발급 완료 (만료: {datetime.fromtimestamp(expire_at)})")
             return token
 
+    async def close(self) -> None:
+        """HTTP 클라이언트 및 백그라운드 재발급 정리"""
+        for task in self._refresh_tasks.values():
+            task.cancel()
+        self._refresh_tasks.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+# 싱글톤 인스턴스
+rtzr_token_provider = RTZRTokenProvider(refresh_margin=settings.rtzr_token_refresh_margin)
+
+
+class RTZRClient:
+    """Return Zero 스트리밍 STT API 클라이언트"""
+
+    WEBSOCKET_URL = "wss://openapi.vito.ai/v1/transcribe:streaming"
+
+    def __init__(self, client_id: str, client_secret: str):
+        self.client_id = client_id
+        self.client_secret = client_secret
+
+    async def _get_token(self) -> str:
+        """
+        JWT 토큰 조회 (프로세스 전역 토큰 관리자 공유)
+        토큰 유효기간: 6시간
+        """
+        return await rtzr_token_provider.get_token(self.client_id, self.client_secret)
+
     async def stream_transcribe(
         self,
         audio_stream: AsyncGenerator[bytes, None],
@@ -98,7 +204,11 @@ class RTZRClient:
                     await websocket.send("EOS")
                     print("✅ 오디오 전송 완료 (EOS)")
                 except Exception as e:
+                    # 입력 스트림 오류 (예: ffmpeg 실패) 시 연결을 닫아 수신 루프를 끝내고,
+                    # 예외는 send_task를 await할 때 호출자에게 전달
                     print(f"❌ 오디오 전송 오류: {e}")
+                    await websocket.close()
+                    raise
 
             # 결과 수신 태스크
             async def receive_results():
@@ -112,44 +222,43 @@ class RTZRClient:
             # 동시 실행
             send_task = asyncio.create_task(send_audio())
 
-            async for result in receive_results():
-                yield result
+            try:
+                async for result in receive_results():
+                    yield result
 
-            await send_task
+                await send_task
+            finally:
+                if not send_task.done():
+                    send_task.cancel()
 
-    async def transcribe_file(
+    async def transcribe_stream(
         self,
-        audio_file_path: str,
-        chunk_size: int = 1024,
+        audio_stream: AsyncGenerator[bytes, None],
         sample_rate: int = 16000,
         encoding: str = "LINEAR16",
+        use_itn: bool = True,
+        use_disfluency_filter: bool = False,
     ) -> list[Dict[str, Any]]:
         """
-        오디오 파일을 스트리밍으로 전사
+        오디오 스트림 전체를 전사하여 결과를 모아서 반환
 
         Args:
-            audio_file_path: 오디오 파일 경로
-            chunk_size: 청크 크기 (바이트)
+            audio_stream: 오디오 데이터 스트림 (비동기 제너레이터)
             sample_rate: 샘플링 레이트
             encoding: 오디오 인코딩
+            use_itn: 역정규화 사용
+            use_disfluency_filter: 불안정 필터
 
         Returns:
             전사 결과 리스트
         """
-        async def file_stream():
-            """파일을 청크로 읽어서 스트림으로 전달"""
-            with open(audio_file_path, "rb") as f:
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-
         results = []
         async for result in self.stream_transcribe(
-            file_stream(),
+            audio_stream,
             sample_rate=sample_rate,
             encoding=encoding,
+            use_itn=use_itn,
+            use_disfluency_filter=use_disfluency_filter,
         ):
             results.append(result)
 
@@ -159,3 +268,89 @@ class RTZRClient:
                 print(f"📝 {text}")
 
         return results
+
+    async def transcribe_segments(
+        self,
+        segments: list[tuple[int, Callable[[], AsyncGenerator[bytes, None]]]],
+        max_concurrency: int = 4,
+        sample_rate: int = 16000,
+        encoding: str = "LINEAR16",
+        use_itn: bool = True,
+        use_disfluency_filter: bool = False,
+    ) -> list[Dict[str, Any]]:
+        """
+        여러 오디오 구간을 별도 WebSocket 연결로 병렬 전사한 뒤 순서대로 이어붙임
+
+        각 구간 결과의 start_at에 구간 시작 오프셋을 더하고, seq는 전체 기준으로
+        다시 매긴다. 한 구간이라도 실패하면 나머지를 취소하고 예외를 전달한다.
+
+        Args:
+            segments: (시작 오프셋 ms, 스트림 생성 함수) 리스트 (시간 순서)
+            max_concurrency: 동시 연결 수
+            sample_rate: 샘플링 레이트
+            encoding: 오디오 인코딩
+            use_itn: 역정규화 사용
+            use_disfluency_filter: 불안정 필터
+
+        Returns:
+            전체 전사 결과 리스트
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_segment(stream_factory: Callable[[], AsyncGenerator[bytes, None]]):
+            # 스트림(ffmpeg 프로세스)은 슬롯을 얻은 뒤에 생성
+            async with semaphore:
+                return await self.transcribe_stream(
+                    stream_factory(),
+                    sample_rate=sample_rate,
+                    encoding=encoding,
+                    use_itn=use_itn,
+                    use_disfluency_filter=use_disfluency_filter,
+                )
+
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(run_segment(factory)) for _, factory in segments
+            ]
+
+        stitched = []
+        next_seq = 0
+        for (offset_ms, _), task in zip(segments, tasks):
+            seq_map: Dict[Any, int] = {}
+            for result in task.result():
+                seq = result.get("seq", 0)
+                if seq not in seq_map:
+                    seq_map[seq] = next_seq
+                    next_seq += 1
+                stitched.append({
+                    **result,
+                    "seq": seq_map[seq],
+                    "start_at": result.get("start_at", 0) + offset_ms,
+                })
+
+        return stitched
+
+    async def transcribe_file(
+        self,
+        audio_file_path: str,
+        chunk_size: int = 1024,
+        sample_rate: int = 16000,
+        encoding: str = "LINEAR16",
+    ) -> list[Dict[str, Any]]:
+        """
+        오디오 파일을 스트리밍으로 전사
+
+        Args:
+            audio_file_path: 오디오 파일 경로
+            chunk_size: 청크 크기 (바이트)
+            sample_rate: 샘플링 레이트
+            encoding: 오디오 인코딩
+
+        Returns:
+            전사 결과 리스트
+        """
+        return await self.transcribe_stream(
+            file_stream(Path(audio_file_path), chunk_size),
+            sample_rate=sample_rate,
+            encoding=encoding,
+        )
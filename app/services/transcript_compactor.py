@@ -0,0 +1,185 @@
+"""
+LLM 입력 전 전사 텍스트 압축
+
+STT 결과에는 disfluency 필터가 놓친 간투사, 말을 다시 시작하며 생긴 중복 발화,
+같은 단어 반복이 남아 있다. 요약 품질에 영향이 없는 이런 부분을 지워
+프롬프트 토큰(= LLM 지연과 비용)을 줄인다. 원본 stt_text는 그대로 저장된다.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any
+
+from app.core.config import settings
+from app.services.llm_summarizer import estimate_tokens
+
+# 기본 간투사 목록 (단독 어절일 때만 제거)
+DEFAULT_FILLERS = (
+    "음", "음음", "으음", "어", "어어", "아", "에", "에이", "그니까", "뭐랄까", "있잖아", "있잖아요",
+)
+
+_WHITESPACE = re.compile(r"\s+")
+# 같은 어절 3번 이상 연속 반복 ("그래서 그래서 그래서" → "그래서")
+# 두 번 반복("아니 아니")은 강조일 수 있고, 숫자가 들어간 어절은 값이므로 그대로 둠
+_REPEATED_WORD = re.compile(r"(?<!\S)([^\s\d]+)(?:\s+\1){2,}(?!\S)")
+# 간투사를 지운 뒤 남는 문장부호 앞 공백/중복 쉼표
+_DANGLING_PUNCT = re.compile(r"\s+([,.?!])|([,])(?:\s*,)+")
+# 말을 다시 시작한 발화로 볼 최소 접두 길이 (짧은 대답 "네"가 "네트워크…"에 합쳐지지 않게)
+_MIN_RESTART_CHARS = 6
+# 숫자 (값이 다른 발화는 비슷해 보여도 병합하지 않음: "3번 문제"/"4번 문제")
+_DIGITS = re.compile(r"\d+")
+# 어절 비교 시 무시할 문장부호
+_PUNCT = re.compile(r"[^\w]")
+
+
+def _same_words(previous: list[str], current: list[str]) -> bool:
+    """두 어절 목록이 띄어쓰기나 조사/어미만 다른지 (어절 자체가 바뀌거나 추가되면 False)"""
+    matcher = SequenceMatcher(None, previous, current, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        a = _PUNCT.sub("", "".join(previous[i1:i2]))
+        b = _PUNCT.sub("", "".join(current[j1:j2]))
+        if a == b:
+            # 띄어쓰기/문장부호만 다름
+            continue
+        if tag != "replace" or i2 - i1 != j2 - j1:
+            return False
+        for x, y in zip(previous[i1:i2], current[j1:j2]):
+            x, y = _PUNCT.sub("", x), _PUNCT.sub("", y)
+            # 두 글자 이상인 앞부분(어간)이 같고 끝만 다른 경우 ("스택은"/"스택이")
+            # "최대"/"최소"처럼 한 글자만 같은 어절은 다른 단어로 봄
+            stem = len(os.path.commonprefix([x, y]))
+            if stem < 2 or stem < min(len(x), len(y)) / 2:
+                return False
+    return True
+
+
+@dataclass
+class CompactionResult:
+    """압축 결과"""
+
+    texts: list[str]  # 압축된 발화 (빈 발화 제외)
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def ratio(self) -> float:
+        """줄어든 토큰 비율 (0.0 ~ 1.0)"""
+        if not self.tokens_before:
+            return 0.0
+        return 1 - self.tokens_after / self.tokens_before
+
+
+class TranscriptCompactor:
+    """공백 정리 → 간투사 제거 → 반복 어절 축약 → 거의 같은 연속 발화 병합"""
+
+    def __init__(
+        self,
+        fillers: tuple[str, ...] | list[str] = DEFAULT_FILLERS,
+        duplicate_similarity: float = 0.9,
+    ):
+        """
+        Args:
+            fillers: 제거할 간투사 (단독 어절, 뒤에 붙은 쉼표/말줄임표 포함)
+            duplicate_similarity: 이 이상 비슷한 연속 발화는 하나만 남김 (1.0 초과면 사용 안 함)
+        """
+        self.duplicate_similarity = duplicate_similarity
+        self._filler = None
+        if fillers:
+            # 긴 것부터 맞춰야 "음음"이 "음"으로 먼저 잘리지 않음
+            alternatives = "|".join(
+                re.escape(f) for f in sorted(set(fillers), key=len, reverse=True)
+            )
+            self._filler = re.compile(rf"(?<!\S)(?:{alternatives})[,.…~]*(?!\S)")
+
+        # 누적 지표
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def compact_text(self, text: str) -> str:
+        """발화 하나 정리"""
+        if self._filler is not None:
+            text = self._filler.sub(" ", text)
+        text = _WHITESPACE.sub(" ", text).strip()
+        text = _REPEATED_WORD.sub(r"\1", text)
+        text = _DANGLING_PUNCT.sub(lambda m: m.group(1) or m.group(2), text)
+        return text.strip(" ,")
+
+    def _is_duplicate(self, previous: str, current: str) -> bool:
+        """
+        current가 previous를 다시 말한 발화인지 확인 (True면 current만 남김)
+
+        - 말을 다시 시작한 경우: previous가 current의 어절 경계까지의 접두사
+        - 거의 같은 반복: 비슷도가 기준 이상이고, 숫자가 같으며, 다른 어절이 띄어쓰기나
+          조사/어미 차이뿐인 경우 ("시간 복잡도"/"공간 복잡도"처럼 어절이 바뀌면 다른 문장)
+        """
+        if self.duplicate_similarity > 1.0:
+            return False
+        if (
+            len(previous) >= _MIN_RESTART_CHARS
+            and len(current) > len(previous)
+            and current.startswith(previous)
+            and not current[len(previous)].isalnum()
+        ):
+            return True
+        if _DIGITS.findall(previous) != _DIGITS.findall(current):
+            return False
+        matcher = SequenceMatcher(None, previous, current, autojunk=False)
+        # ratio()는 비싸므로 상한부터 확인
+        if not (
+            matcher.real_quick_ratio() >= self.duplicate_similarity
+            and matcher.quick_ratio() >= self.duplicate_similarity
+            and matcher.ratio() >= self.duplicate_similarity
+        ):
+            return False
+        return _same_words(previous.split(), current.split())
+
+    def compact(self, texts: list[str]) -> CompactionResult:
+        """
+        발화 목록 압축
+
+        Args:
+            texts: 시간 순서의 발화 텍스트
+
+        Returns:
+            압축된 발화와 전후 토큰 수
+        """
+        tokens_before = sum(estimate_tokens(t) for t in texts)
+        compacted: list[str] = []
+        for text in texts:
+            text = self.compact_text(text)
+            if not text:
+                continue
+            if compacted and self._is_duplicate(compacted[-1], text):
+                # 다시 말한(완성된) 쪽을 남김
+                compacted[-1] = text
+                continue
+            compacted.append(text)
+
+        result = CompactionResult(
+            texts=compacted,
+            tokens_before=tokens_before,
+            tokens_after=sum(estimate_tokens(t) for t in compacted),
+        )
+        self.tokens_before += result.tokens_before
+        self.tokens_after += result.tokens_after
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """누적 압축 지표"""
+        saved = self.tokens_before - self.tokens_after
+        return {
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "saved_ratio": round(saved / self.tokens_before, 4) if self.tokens_before else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+transcript_compactor = TranscriptCompactor(
+    fillers=settings.summary_filler_words,
+    duplicate_similarity=settings.summary_duplicate_similarity,
+)
@@ -0,0 +1,99 @@
+"""
+업로드 파일 스트리밍 저장 서비스
+
+UploadFile 전체를 메모리에 올리지 않고 고정 크기 청크로 디스크에 복사한다.
+복사는 스레드 풀에서 수행하여 이벤트 루프를 막지 않는다.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+
+class UploadTooLargeError(Exception):
+    """업로드 파일이 최대 허용 크기를 초과함"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"업로드 파일이 최대 크기({max_size} bytes)를 초과했습니다")
+        self.max_size = max_size
+
+
+@dataclass
+class StoredUpload:
+    """디스크에 저장된 업로드 파일 정보"""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+def _copy_stream(
+    source: BinaryIO,
+    dest_path: Path,
+    chunk_size: int,
+    max_size: int,
+) -> StoredUpload:
+    """
+    파일 객체를 청크 단위로 디스크에 복사 (동기, 스레드 풀에서 실행)
+
+    Args:
+        source: 읽을 파일 객체
+        dest_path: 저장 경로
+        chunk_size: 청크 크기 (바이트)
+        max_size: 최대 허용 크기 (바이트, 0 이하이면 무제한)
+
+    Returns:
+        저장된 파일 정보
+
+    Raises:
+        UploadTooLargeError: 최대 크기 초과 시 (부분 파일은 삭제됨)
+    """
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size > 0 and size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        dest_path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(path=dest_path, size=size, sha256=digest.hexdigest())
+
+
+async def save_upload_file(
+    upload: UploadFile,
+    dest_path: Path,
+    chunk_size: int,
+    max_size: int,
+) -> StoredUpload:
+    """
+    UploadFile을 디스크에 스트리밍 저장하며 해시와 크기를 계산
+
+    청크 하나만 메모리에 유지하므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+
+    Args:
+        upload: FastAPI UploadFile
+        dest_path: 저장 경로
+        chunk_size: 청크 크기 (바이트)
+        max_size: 최대 허용 크기 (바이트, 0 이하이면 무제한)
+
+    Returns:
+        저장된 파일 정보 (경로, 크기, SHA-256)
+    """
+    await upload.seek(0)
+    return await asyncio.to_thread(
+        _copy_stream, upload.file, dest_path, chunk_size, max_size
+    )
@@ -0,0 +1,181 @@
+"""
+에너지/영교차율 기반 음성 구간 검출 (VAD)
+
+Int16 PCM(LINEAR16)을 짧은 프레임으로 나누어 NumPy로 프레임별 에너지(dBFS)와
+영교차율(ZCR)을 한 번에 계산하고, 무음 프레임은 Return Zero로 보내지 않는다.
+- 에너지가 기준보다 높으면 음성
+- 조금 낮아도 ZCR이 높으면 (ㅅ, ㅊ 같은 마찰음) 음성
+- 음성 직전 프레임(pre-roll)과 직후 프레임(hangover)은 함께 보내 단어 시작/끝을 보존
+- 무음이 길어지면 연결이 끊기지 않도록 주기적으로 무음 프레임(keep-alive)을 보냄
+
+무음을 빼고 보내면 업스트림 타임스탬프가 당겨지므로, 보낸 오디오 시각을
+원본 시각으로 되돌리는 to_source_ms()를 제공한다.
+"""
+
+import bisect
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+
+_INT16_FULL_SCALE = 32768.0
+
+
+class EnergyVAD:
+    """스트리밍 Int16 PCM VAD (세션당 하나)"""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 20,
+        threshold_db: float = -45.0,
+        zcr_threshold: float = 0.25,
+        hangover_ms: int = 300,
+        preroll_ms: int = 200,
+        keepalive_ms: int = 5000,
+    ):
+        """
+        Args:
+            sample_rate: 샘플링 레이트 (Hz)
+            frame_ms: 판정 프레임 길이 (ms)
+            threshold_db: 음성 판단 에너지 기준 (dBFS)
+            zcr_threshold: 기준보다 10dB 이내로 낮을 때 음성으로 볼 ZCR (0~1)
+            hangover_ms: 음성 뒤에 이어서 보낼 길이 (ms)
+            preroll_ms: 음성 앞에 붙여 보낼 길이 (ms)
+            keepalive_ms: 무음이 이 길이를 넘으면 무음 프레임 하나를 보냄 (ms, 0이면 끔)
+        """
+        self.frame_ms = frame_ms
+        self.frame_samples = max(1, sample_rate * frame_ms // 1000)
+        self.frame_bytes = self.frame_samples * 2
+        self.threshold_db = threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.hangover_frames = hangover_ms // frame_ms
+        self.keepalive_frames = keepalive_ms // frame_ms if keepalive_ms > 0 else 0
+
+        self._remainder = b""
+        self._hangover = 0
+        self._preroll: deque[tuple[int, bytes]] = deque(maxlen=preroll_ms // frame_ms)
+        self._silent_run = 0
+
+        # 보낸 오디오 → 원본 시각 매핑 (연속 구간 시작점, 프레임 단위)
+        self._sent_starts: list[int] = []
+        self._source_starts: list[int] = []
+        self._last_source_frame = -2
+
+        # 통계 (프레임 단위)
+        self.total_frames = 0
+        self.forwarded_frames = 0
+        self.keepalive_count = 0
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        """프레임별 음성 여부 (벡터 연산)"""
+        samples = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(samples * samples, axis=1))
+        energy_db = 20.0 * np.log10(rms / _INT16_FULL_SCALE + 1e-10)
+
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_samples - 1)
+
+        return (energy_db > self.threshold_db) | (
+            (energy_db > self.threshold_db - 10.0) & (zcr > self.zcr_threshold)
+        )
+
+    def _forward(self, out: list[bytes], source_frame: int, frame: bytes) -> None:
+        """프레임 전송 기록 (불연속이면 시각 매핑 추가)"""
+        if source_frame != self._last_source_frame + 1:
+            self._sent_starts.append(self.forwarded_frames)
+            self._source_starts.append(source_frame)
+        self._last_source_frame = source_frame
+        self.forwarded_frames += 1
+        out.append(frame)
+
+    def process(self, pcm: bytes) -> bytes:
+        """
+        PCM 청크를 받아 보낼 오디오만 반환
+
+        Args:
+            pcm: Int16 little-endian PCM
+
+        Returns:
+            업스트림으로 보낼 PCM (무음이면 빈 바이트)
+        """
+        data = self._remainder + pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+        if usable == 0:
+            return b""
+
+        frames = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, self.frame_samples)
+        is_speech = self._classify(frames)
+
+        out: list[bytes] = []
+        base = self.total_frames
+        for i, speech in enumerate(is_speech.tolist()):
+            source_frame = base + i
+            frame = data[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+
+            if speech:
+                while self._preroll:
+                    self._forward(out, *self._preroll.popleft())
+                self._forward(out, source_frame, frame)
+                self._hangover = self.hangover_frames
+                self._silent_run = 0
+            elif self._hangover > 0:
+                self._forward(out, source_frame, frame)
+                self._hangover -= 1
+                self._silent_run = 0
+            else:
+                self._silent_run += 1
+                if self.keepalive_frames and self._silent_run >= self.keepalive_frames:
+                    # 무음 프레임 하나로 연결 유지
+                    self._preroll.clear()
+                    self._forward(out, source_frame, bytes(self.frame_bytes))
+                    self.keepalive_count += 1
+                    self._silent_run = 0
+                elif self._preroll.maxlen:
+                    self._preroll.append((source_frame, frame))
+
+        self.total_frames += len(is_speech)
+        return b"".join(out)
+
+    def to_source_ms(self, sent_ms: int) -> int:
+        """
+        업스트림 기준 시각(보낸 오디오 기준)을 원본 오디오 시각으로 변환
+
+        Args:
+            sent_ms: 업스트림 결과의 start_at (ms)
+
+        Returns:
+            원본 오디오 기준 시각 (ms)
+        """
+        sent_frame = sent_ms // self.frame_ms
+        i = bisect.bisect_right(self._sent_starts, sent_frame) - 1
+        if i < 0:
+            return sent_ms
+        source_frame = self._source_starts[i] + (sent_frame - self._sent_starts[i])
+        return source_frame * self.frame_ms + sent_ms % self.frame_ms
+
+    def stats(self) -> dict[str, Any]:
+        """전송/억제 통계"""
+        suppressed = self.total_frames - self.forwarded_frames
+        return {
+            "total_ms": self.total_frames * self.frame_ms,
+            "forwarded_ms": self.forwarded_frames * self.frame_ms,
+            "keepalive_count": self.keepalive_count,
+            "suppressed_ratio": round(suppressed / self.total_frames, 4) if self.total_frames else 0.0,
+        }
+
+
+def create_vad(sample_rate: int) -> EnergyVAD:
+    """설정값으로 VAD 생성"""
+    return EnergyVAD(
+        sample_rate=sample_rate,
+        frame_ms=settings.stt_vad_frame_ms,
+        threshold_db=settings.stt_vad_threshold_db,
+        zcr_threshold=settings.stt_vad_zcr_threshold,
+        hangover_ms=settings.stt_vad_hangover_ms,
+        preroll_ms=settings.stt_vad_preroll_ms,
+        keepalive_ms=settings.stt_vad_keepalive_ms,
+    )
@@ -0,0 +1,65 @@
+"""
+전사 압축 벤치마크
+
+실제 강의 전사로 압축 전후 토큰 수와 처리 시간을 측정한다.
+
+사용법 (프로젝트 루트에서, .env 필요):
+    python -m benchmarks.compaction transcripts/*.txt
+    python -m benchmarks.compaction --repeat 20 lecture.json
+
+입력 형식:
+    - .txt: 한 줄에 발화 하나
+    - .json: 발화 문자열 배열 또는 {"text": ...} 객체 배열 (STT 세그먼트 캐시 형식)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.transcript_compactor import TranscriptCompactor
+
+
+def load_utterances(path: Path) -> list[str]:
+    """전사 파일에서 발화 목록 읽기"""
+    if path.suffix == ".json":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return [item["text"] if isinstance(item, dict) else str(item) for item in data]
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="전사 압축 벤치마크")
+    parser.add_argument("files", nargs="+", type=Path, help="전사 파일 (.txt / .json)")
+    parser.add_argument("--repeat", type=int, default=5, help="파일당 반복 횟수")
+    args = parser.parse_args()
+
+    compactor = TranscriptCompactor(
+        fillers=settings.summary_filler_words,
+        duplicate_similarity=settings.summary_duplicate_similarity,
+    )
+
+    total_before = total_after = 0
+    print(f"{'file':<32} {'utts':>6} {'tokens':>8} {'after':>8} {'saved':>7} {'ms':>8}")
+    for path in args.files:
+        utterances = load_utterances(path)
+        elapsed = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = compactor.compact(utterances)
+            elapsed.append(time.perf_counter() - start)
+        total_before += result.tokens_before
+        total_after += result.tokens_after
+        print(
+            f"{path.name[:32]:<32} {len(utterances):>6} {result.tokens_before:>8} "
+            f"{result.tokens_after:>8} {result.ratio:>6.1%} {min(elapsed) * 1000:>8.2f}"
+        )
+
+    if total_before:
+        print(f"\n전체: {total_before} → {total_after} 토큰 (-{1 - total_after / total_before:.1%})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+SQLite 동시 읽기/쓰기 벤치마크
+
+process_recording처럼 진행률을 자주 커밋하는 쓰기와, 목록/상세 조회 읽기를 동시에
+돌려서 PRAGMA 없는 기본 설정(rollback journal)과 성능 설정(WAL 등)의 처리량을 비교한다.
+
+사용법 (프로젝트 루트에서, .env 필요):
+    python -m benchmarks.database
+    python -m benchmarks.database --seconds 10 --writers 4 --readers 16 --rows 5000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, create_engine, sqlite_pragmas
+from app.models import Recording
+
+
+async def seed(engine: AsyncEngine, rows: int) -> list[str]:
+    """테이블 생성 후 녹음 rows개 삽입"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    ids = [str(uuid.uuid4()) for _ in range(rows)]
+    base = datetime.utcnow() - timedelta(days=365)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        for i, recording_id in enumerate(ids):
+            db.add(Recording(
+                id=recording_id,
+                title=f"강의 {i}",
+                stt_text="전사 " * 4000,
+                summary="요약 " * 500,
+                status=random.choice(("complete", "complete", "complete", "ai", "stt")),
+                created_at=base + timedelta(minutes=i),
+            ))
+        await db.commit()
+    return ids
+
+
+async def writer(sessions: async_sessionmaker, ids: list[str], deadline: float, stats: dict[str, Any]) -> None:
+    """진행률 갱신 커밋 반복"""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with sessions() as db:
+                await db.execute(
+                    update(Recording)
+                    .where(Recording.id == random.choice(ids))
+                    .values(progress=random.randint(0, 100), status="ai")
+                )
+                await db.commit()
+        except OperationalError:
+            stats["errors"] += 1
+            continue
+        stats["writes"] += 1
+        stats["write_latency"].append(time.perf_counter() - start)
+
+
+async def reader(sessions: async_sessionmaker, ids: list[str], deadline: float, stats: dict[str, Any]) -> None:
+    """목록 페이지 + 상세 조회 반복"""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with sessions() as db:
+                await db.execute(
+                    select(
+                        Recording.id,
+                        Recording.title,
+                        func.substr(Recording.summary, 1, 300),
+                        Recording.status,
+                        Recording.created_at,
+                    )
+                    .order_by(Recording.created_at.desc(), Recording.id.desc())
+                    .limit(50)
+                )
+                await db.get(Recording, random.choice(ids))
+        except OperationalError:
+            stats["errors"] += 1
+            continue
+        stats["reads"] += 1
+        stats["read_latency"].append(time.perf_counter() - start)
+
+
+def p95(values: list[float]) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=20)[-1]
+
+
+async def run_profile(name: str, pragmas: dict[str, Any], args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        engine = create_engine(url, pragmas=pragmas)
+        ids = await seed(engine, args.rows)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        stats: dict[str, Any] = {
+            "writes": 0, "reads": 0, "errors": 0, "write_latency": [], "read_latency": [],
+        }
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(writer(sessions, ids, deadline, stats) for _ in range(args.writers)),
+            *(reader(sessions, ids, deadline, stats) for _ in range(args.readers)),
+        )
+        await engine.dispose()
+
+    print(
+        f"{name:<10} {stats['writes'] / args.seconds:>9.1f} {stats['reads'] / args.seconds:>9.1f} "
+        f"{p95(stats['write_latency']) * 1000:>10.1f} {p95(stats['read_latency']) * 1000:>10.1f} "
+        f"{stats['errors']:>7}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 동시 읽기/쓰기 벤치마크")
+    parser.add_argument("--seconds", type=float, default=5.0, help="프로필당 측정 시간")
+    parser.add_argument("--writers", type=int, default=4, help="동시 쓰기 태스크 수")
+    parser.add_argument("--readers", type=int, default=8, help="동시 읽기 태스크 수")
+    parser.add_argument("--rows", type=int, default=2000, help="미리 넣을 녹음 수")
+    args = parser.parse_args()
+
+    # 벤치마크 중 SQL 로그 끄기, .env에서 튜닝을 껐더라도 설정값으로 비교
+    settings.database_echo = False
+    settings.sqlite_tuning_enabled = True
+    tuned = sqlite_pragmas()
+
+    print(f"{'profile':<10} {'writes/s':>9} {'reads/s':>9} {'write p95':>10} {'read p95':>10} {'errors':>7}")
+    await run_profile("baseline", {}, args)
+    await run_profile("tuned", tuned, args)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,129 @@
+"""
+Markdown → Notion 블록 변환 벤치마크
+
+보고서 하나당 블록 수, 필요한 API 호출 수 (100블록 단위), 변환 시간을
+이전 줄 단위 변환기와 비교한다.
+
+사용법 (프로젝트 루트에서, .env 필요):
+    python -m benchmarks.notion_blocks                      # 합성 보고서 (크기별)
+    python -m benchmarks.notion_blocks reports/*.md --repeat 50
+"""
+
+import argparse
+import math
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from app.services.notion_client import MAX_CHILDREN_PER_REQUEST
+from app.services.notion_markdown import markdown_to_blocks
+
+
+def legacy_convert(summary: str) -> list[dict[str, Any]]:
+    """이전 변환기 (줄마다 startswith/re.match, 한 줄 = 블록 하나, 서식 없음)"""
+    blocks = []
+    for line in summary.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("### "):
+            block_type, content = "heading_3", line[4:]
+        elif line.startswith("## "):
+            block_type, content = "heading_2", line[3:]
+        elif line.startswith("# "):
+            block_type, content = "heading_1", line[2:]
+        elif line.startswith("- ") or line.startswith("* "):
+            block_type, content = "bulleted_list_item", line[2:]
+        elif re.match(r"^\d+\.\s", line):
+            block_type, content = "numbered_list_item", re.sub(r"^\d+\.\s", "", line)
+        else:
+            block_type, content = "paragraph", line
+        blocks.append({
+            "object": "block",
+            "type": block_type,
+            block_type: {"rich_text": [{"type": "text", "text": {"content": content}}]},
+        })
+    return blocks
+
+
+def synthetic_report(topics: int) -> str:
+    """LLM 보고서 형식을 흉내 낸 합성 Markdown"""
+    parts = [
+        "# 강의 요약 보고서",
+        "",
+        "## 📝 강의 개요",
+        "이번 강의는 **자료구조**의 기본 개념을 다룬다.",
+        "배열과 연결 리스트의 *시간 복잡도*를 비교하고,",
+        "`HashMap` 구현을 살펴본다.",
+        "",
+        "## 📚 주요 내용",
+    ]
+    for i in range(1, topics + 1):
+        parts += [
+            f"### {i}. 주제 {i}",
+            f"주제 {i}의 배경 설명이 이어진다.",
+            "여러 줄에 걸친 문단은 하나의 블록으로 합쳐져야 한다.",
+            "- 세부 내용 **핵심** 포인트",
+            "  - 하위 항목 `O(n log n)`",
+            "  - 하위 항목 ~~오답~~ 정답",
+            "- 세부 내용",
+            "1. 첫 번째 단계",
+            "2. 두 번째 단계",
+            "```python",
+            "def solve(items):",
+            "    return sorted(items)",
+            "```",
+            "",
+        ]
+    parts += ["## 💡 중요 포인트", "- 꼭 기억해야 할 핵심 개념", "- 시험에 나올 만한 내용"]
+    return "\n".join(parts)
+
+
+def count_blocks(blocks: list[dict[str, Any]]) -> int:
+    """하위 블록까지 포함한 블록 수"""
+    total = 0
+    for block in blocks:
+        total += 1 + count_blocks(block[block["type"]].get("children", []))
+    return total
+
+
+def measure(convert, markdown: str, repeat: int) -> tuple[list[dict[str, Any]], float]:
+    """repeat번 변환 중 가장 빠른 시간 (ms)"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        blocks = convert(markdown)
+        best = min(best, time.perf_counter() - start)
+    return blocks, best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Markdown → Notion 블록 변환 벤치마크")
+    parser.add_argument("files", nargs="*", type=Path, help="Markdown 보고서 (없으면 합성 보고서)")
+    parser.add_argument("--repeat", type=int, default=20, help="입력당 반복 횟수")
+    args = parser.parse_args()
+
+    if args.files:
+        inputs = [(path.name, path.read_text(encoding="utf-8")) for path in args.files]
+    else:
+        inputs = [(f"synthetic-{n}", synthetic_report(n)) for n in (5, 50, 500)]
+
+    print(
+        f"{'input':<24} {'KB':>7} | {'legacy':>7} {'calls':>5} {'ms':>8} | "
+        f"{'top':>5} {'total':>6} {'calls':>5} {'ms':>8}"
+    )
+    for name, markdown in inputs:
+        old, old_ms = measure(legacy_convert, markdown, args.repeat)
+        new, new_ms = measure(markdown_to_blocks, markdown, args.repeat)
+        print(
+            f"{name[:24]:<24} {len(markdown.encode()) / 1024:>7.1f} | "
+            f"{len(old):>7} {math.ceil(len(old) / MAX_CHILDREN_PER_REQUEST):>5} {old_ms:>8.2f} | "
+            f"{len(new):>5} {count_blocks(new):>6} "
+            f"{math.ceil(len(new) / MAX_CHILDREN_PER_REQUEST):>5} {new_ms:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,15 +13,35 @@ import { ModeSelector, type RecordingMode } from "@/components/mode-selector"
 import { DualPanel } from "@/components/dual-panel"
 import { useStreamingSTT } from "@/hooks/use-streaming-stt"
 import { useProgressiveReport } from "@/hooks/use-progressive-report"
-import { recordingsApi, notionApi } from "@/lib/api"
+import { recordingsApi, notionApi, WS_BASE_URL } from "@/lib/api"
 import { Button } from "@/components/ui/button"
 import { ScrollArea } from "@/components/ui/scroll-area"
-import type { Recording } from "@/types"
+import type { NotionWrite, Recording, SaveToNotionResponse } from "@/types"
 
 type AppState = "idle" | "recording" | "processing" | "complete"
 
 const POLL_INTERVAL = 2000
 const REPORT_INTERVAL_SECONDS = 180
+const NOTION_WRITE_TIMEOUT = 5 * 60 * 1000
+
+// Notion 저장은 서버 대기열에서 처리되므로 pending이면 완료될 때까지 상태 확인
+async function waitForNotionWrite(saved: SaveToNotionResponse): Promise<string> {
+  if (saved.status !== "pending" || !saved.id) return saved.url
+
+  const apiBaseUrl = WS_BASE_URL.replace(/^ws/, "http")
+  const deadline = Date.now() + NOTION_WRITE_TIMEOUT
+  while (Date.now() < deadline) {
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL))
+    const response = await fetch(`${apiBaseUrl}/api/notion/writes/${saved.id}`, {
+      credentials: "include",
+    })
+    if (!response.ok) throw new Error("노션 저장 상태를 확인하지 못했습니다")
+    const write: NotionWrite = await response.json()
+    if (write.status === "done") return write.url
+    if (write.status === "failed") throw new Error(write.error ?? "노션 저장에 실패했습니다")
+  }
+  throw new Error("노션 저장이 지연되고 있습니다")
+}
 
 export default function Home() {
   const [appState, setAppState] = useState<AppState>("idle")
@@ -253,11 +273,13 @@ export default function Home() {
       if (isNotionConnected && recording.summary) {
         setProcessingStep("notion")
         try {
-          const { url } = await notionApi.save({
-            recordingId: recording.id,
-            summary: recording.summary,
-            title: recording.title,
-          })
+          const url = await waitForNotionWrite(
+            await notionApi.save({
+              recordingId: recording.id,
+              summary: recording.summary,
+              title: recording.title,
+            })
+          )
           recording.notionUrl = url
           toast.success("노션에 저장되었습니다")
         } catch {
@@ -310,11 +332,13 @@ export default function Home() {
 
     setIsSavingNotion(true)
     try {
-      const { url } = await notionApi.save({
-        recordingId: "realtime",
-        summary: currentReport,
-        title: `강의 녹음 ${new Date().toLocaleDateString("ko-KR")}`,
-      })
+      const url = await waitForNotionWrite(
+        await notionApi.save({
+          recordingId: "realtime",
+          summary: currentReport,
+          title: `강의 녹음 ${new Date().toLocaleDateString("ko-KR")}`,
+        })
+      )
       setNotionUrl(url)
       toast.success("노션에 저장되었습니다")
     } catch {
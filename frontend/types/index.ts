@@ -72,6 +72,22 @@ export interface SaveToNotionRequest {
   title: string
 }
 
+/** Notion 저장 응답 (pending이면 id로 진행 상황 조회) */
+export interface SaveToNotionResponse {
+  url: string
+  status?: "done" | "pending"
+  id?: string | null
+}
+
+/** Notion 쓰기 진행 상황 (GET /api/notion/writes/{id}) */
+export interface NotionWrite {
+  id: string
+  status: "pending" | "running" | "done" | "failed"
+  url: string
+  attempts: number
+  error: string | null
+}
+
 // ========================================
 // API Response Types
 // ========================================
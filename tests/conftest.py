@@ -0,0 +1,13 @@
+"""
+테스트 공통 설정
+
+app.core.config의 Settings는 import 시점에 필수 환경변수를 읽으므로 더미 값을 먼저 넣는다.
+"""
+
+import os
+
+os.environ.setdefault("RETURN_ZERO_CLIENT_ID", "test")
+os.environ.setdefault("RETURN_ZERO_CLIENT_SECRET", "test")
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+os.environ.setdefault("NOTION_API_KEY", "test")
+os.environ.setdefault("DATABASE_ECHO", "false")
@@ -0,0 +1,157 @@
+"""
+녹음 처리 파이프라인 요약 단계 테스트 (LLM은 가짜로 대체)
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.job import ProcessingJob
+from app.models.recording import Recording
+from app.services import recording_pipeline
+from app.services.llm_summarizer import WINDOW_PROMPT, lecture_summarizer
+from app.services.recording_pipeline import StageLimits, process_recording
+
+TOPICS = ["스택", "큐", "해시 테이블", "이진 탐색 트리", "힙", "그래프", "정렬", "동적 계획법"]
+
+
+def lecture_segments() -> list[dict]:
+    """STT 결과를 흉내 낸 발화 목록 (발화 하나에 문장 두 개)"""
+    segments = []
+    for i, topic in enumerate(TOPICS):
+        for j in range(6):
+            segments.append({
+                "text": f"{topic}의 {j}번째 성질을 설명합니다. 이 성질은 예제 {i * 10 + j}에서 확인할 수 있습니다.",
+                "start_at": 0,
+                "duration": 0,
+            })
+    return segments
+
+
+def unpunctuated_segments() -> list[dict]:
+    """문장부호 없는 STT 발화 목록 (말을 다시 시작한 발화 포함)"""
+    segments = []
+    for i, topic in enumerate(TOPICS):
+        segments.append({"text": f"{topic} 이야기를", "start_at": 0, "duration": 0})
+        for j in range(6):
+            segments.append({
+                "text": f"{topic} 이야기를 이어서 {j}번째 성질은 예제 {i * 10 + j}에서 확인합니다",
+                "start_at": 0,
+                "duration": 0,
+            })
+    return segments
+
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(recording_pipeline, "AsyncSessionLocal", factory)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def stt_segments() -> list[dict]:
+    """가짜 STT가 돌려줄 발화 (테스트에서 바꿔 넣음)"""
+    return lecture_segments()
+
+
+@pytest.fixture
+def window_prompts(monkeypatch, stt_segments) -> list[str]:
+    """LLM 호출을 가짜로 바꾸고 구간 요약 프롬프트를 기록"""
+    prompts: list[str] = []
+    window_header = WINDOW_PROMPT.strip().splitlines()[0]
+
+    async def fake_complete(prompt, on_delta=None):
+        if prompt.strip().startswith(window_header):
+            prompts.append(prompt)
+            return f"### 노트 {len(prompts)}"
+        return "# 보고서"
+
+    async def fake_stt_segments(db, recording, limits):
+        return stt_segments
+
+    monkeypatch.setattr(lecture_summarizer, "_complete", fake_complete)
+    monkeypatch.setattr(recording_pipeline, "_stt_segments", fake_stt_segments)
+    monkeypatch.setattr(settings, "result_cache_enabled", False)
+    monkeypatch.setattr(settings, "summary_chunk_tokens", 120)
+    monkeypatch.setattr(settings, "summary_reduce_max_tokens", 100000)
+    return prompts
+
+
+async def run_job(factory, recording_id: str, stage: str | None) -> None:
+    job_id = str(uuid.uuid4())
+    async with factory() as db:
+        db.add(ProcessingJob(id=job_id, recording_id=recording_id, audio_file_path="", stage=stage))
+        await db.commit()
+    await process_recording(job_id, StageLimits(ffmpeg=1, stt=1, llm=1))
+
+
+async def test_edit_resummarizes_only_affected_chunks(session_factory, window_prompts):
+    recording_id = str(uuid.uuid4())
+    async with session_factory() as db:
+        db.add(Recording(id=recording_id, title="자료구조"))
+        await db.commit()
+
+    # 첫 처리: STT 발화 → 전체 청크 요약
+    await run_job(session_factory, recording_id, stage=None)
+    first_run = len(window_prompts)
+    assert first_run >= 5
+
+    # 가운데 문장 하나만 고친 뒤 요약만 다시 실행 (PUT /recordings/{id}와 같은 흐름)
+    async with session_factory() as db:
+        recording = await db.get(Recording, recording_id)
+        original = "그래프의 3번째 성질을 설명합니다."
+        assert original in recording.stt_text
+        recording.stt_text = recording.stt_text.replace(original, "그래프의 3번째 성질은 연결성입니다.")
+        await db.commit()
+    window_prompts.clear()
+
+    await run_job(session_factory, recording_id, stage="stt")
+
+    assert 1 <= len(window_prompts) <= 2
+    assert any("연결성" in prompt for prompt in window_prompts)
+    async with session_factory() as db:
+        recording = await db.get(Recording, recording_id)
+        assert recording.status == "complete"
+        assert recording.summary == "# 보고서"
+
+
+@pytest.mark.parametrize("stt_segments", [unpunctuated_segments()])
+async def test_unpunctuated_segments_keep_utterance_boundaries(
+    session_factory, window_prompts, stt_segments
+):
+    recording_id = str(uuid.uuid4())
+    async with session_factory() as db:
+        db.add(Recording(id=recording_id, title="자료구조"))
+        await db.commit()
+
+    await run_job(session_factory, recording_id, stage=None)
+    first_run = list(window_prompts)
+    assert len(first_run) >= 5
+
+    # 다시 시작한 발화는 완성된 발화 하나로 병합됨 (발화 경계가 남아 있어야 가능)
+    assert not any("그래프 이야기를 그래프 이야기를" in p for p in first_run)
+    # 청크는 발화 중간에서 잘리지 않음
+    full = [s["text"] for s in stt_segments if "이어서" in s["text"]]
+    for text in full:
+        assert sum(text in p for p in first_run) == 1
+
+    async with session_factory() as db:
+        recording = await db.get(Recording, recording_id)
+        original = "그래프 이야기를 이어서 3번째 성질은 예제 53에서 확인합니다"
+        assert original in recording.stt_text.splitlines()
+        recording.stt_text = recording.stt_text.replace(original, "그래프 이야기를 이어서 3번째 성질은 연결성입니다")
+        await db.commit()
+    window_prompts.clear()
+
+    await run_job(session_factory, recording_id, stage="stt")
+
+    assert 1 <= len(window_prompts) <= 2
+    assert any("연결성" in prompt for prompt in window_prompts)
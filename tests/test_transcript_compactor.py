@@ -0,0 +1,59 @@
+"""
+전사 압축 테스트
+"""
+
+import pytest
+
+from app.services.transcript_compactor import TranscriptCompactor
+
+
+@pytest.fixture
+def compactor() -> TranscriptCompactor:
+    return TranscriptCompactor(duplicate_similarity=0.9)
+
+
+@pytest.mark.parametrize(
+    "previous, current",
+    [
+        ("3번 문제는 스택으로 풉니다.", "4번 문제는 스택으로 풉니다."),
+        ("시간 복잡도는 O(n log n)입니다.", "공간 복잡도는 O(n log n)입니다."),
+        ("정답은 12입니다 꼭 기억하세요", "정답은 15입니다 꼭 기억하세요"),
+        ("이 값이 양수이면 오른쪽으로 갑니다", "이 값이 음수이면 오른쪽으로 갑니다"),
+        ("최대 힙에서는 부모가 자식보다 큽니다", "최소 힙에서는 부모가 자식보다 큽니다"),
+        ("네", "네트워크 계층은 패킷을 전달합니다"),
+        ("그래서 이 부분은 중요합니다", "그래서 이 부분은"),
+    ],
+)
+def test_different_utterances_are_kept(compactor, previous, current):
+    assert compactor.compact([previous, current]).texts == [previous, current]
+
+
+@pytest.mark.parametrize(
+    "previous, current",
+    [
+        # 말을 다시 시작한 경우
+        ("그래서 이 부분은", "그래서 이 부분은 시험에 나옵니다"),
+        ("해시 테이블의 충돌은,", "해시 테이블의 충돌은, 체이닝으로 해결합니다"),
+        ("스택에 값을 넣습니다", "스택에 값을 넣습니다 그리고 꺼냅니다"),
+        # 띄어쓰기/문장부호/조사만 다른 반복
+        ("이것이 바로 스택입니다.", "이것이 바로 스택 입니다"),
+        ("연결 리스트는 포인터로 노드를 잇습니다", "연결 리스트가 포인터로 노드를 잇습니다"),
+    ],
+)
+def test_restarts_and_stutters_are_merged(compactor, previous, current):
+    assert compactor.compact([previous, current]).texts == [current]
+
+
+def test_repeated_words(compactor):
+    texts = ["그래서 그래서 그래서 이렇게 됩니다", "아니 아니 그게 아니라", "정답은 1 1 입니다"]
+    assert compactor.compact(texts).texts == [
+        "그래서 이렇게 됩니다",
+        "아니 아니 그게 아니라",
+        "정답은 1 1 입니다",
+    ]
+
+
+def test_fillers_are_removed(compactor):
+    result = compactor.compact(["음, 오늘은 어 정렬을 배웁니다", "음…"])
+    assert result.texts == ["오늘은 정렬을 배웁니다"]
+    assert result.tokens_after < result.tokens_before